@@ -122,6 +122,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'cost_weight.middleware.CoalesceWeightRecalcMiddleware',
     'django_prometheus.middleware.PrometheusAfterMiddleware',
 ]
 
@@ -310,10 +311,53 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes max for any task
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+# Periodic housekeeping; needs a beat process (`celery -A AutomaticRAB beat`,
+# or `worker -B` on a single worker).
+CELERY_BEAT_SCHEDULE = {
+    "purge-stale-row-overrides": {
+        "task": "automatic_price_matching.tasks.purge_stale_overrides_task",
+        "schedule": 60 * 60,
+    },
+    "purge-task-result-pages": {
+        "task": "excel_parser.tasks.purge_task_result_pages_task",
+        "schedule": 60 * 60,
+    },
+}
+
+# Row overrides outlive their session otherwise; purge after this many seconds
+# (default: Django's two-week SESSION_COOKIE_AGE).
+ROW_OVERRIDE_MAX_AGE = int(os.getenv("ROW_OVERRIDE_MAX_AGE", str(14 * 24 * 60 * 60)))
+
+# Excel preview job matching pool (excel_parser/services/match_pool.py).
+# Workers default to a small fixed cap (each thread holds a DB connection);
+# "process" suits CPU-bound scoring.
+EXCEL_MATCH_WORKERS = int(os.getenv("EXCEL_MATCH_WORKERS", "0")) or None
+EXCEL_MATCH_EXECUTOR = os.getenv("EXCEL_MATCH_EXECUTOR", "thread")
+EXCEL_MATCH_TIMEOUT = float(os.getenv("EXCEL_MATCH_TIMEOUT", "30"))
+# Rows per match_excel_chunk_task when process_excel_file_task fans out.
+EXCEL_TASK_CHUNK_SIZE = int(os.getenv("EXCEL_TASK_CHUNK_SIZE", "200"))
+# Seconds before stored parse-task result pages are purged (like result_expires).
+TASK_RESULT_PAGE_MAX_AGE = int(os.getenv("TASK_RESULT_PAGE_MAX_AGE", str(24 * 60 * 60)))
+
+# Content-addressed cache of parsed + matched upload rows (excel_parser/services/parse_cache.py).
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "True") == "True"
+PARSE_CACHE_TIMEOUT = int(os.getenv("PARSE_CACHE_TIMEOUT", str(24 * 60 * 60)))
+PARSE_CACHE_CATALOG_VERSION = os.getenv("PARSE_CACHE_CATALOG_VERSION") or None
+
+# Worker processes for page-parallel PDF extraction (pdf_parser/services/pdfreader.py).
+# Defaults to the host's CPU count; 1 extracts inline.
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "0")) or None
+
 # For tests, use eager mode to run tasks synchronously (no Redis needed)
 if RUNNING_TESTS:
     CELERY_TASK_ALWAYS_EAGER = True
     CELERY_TASK_EAGER_PROPAGATES = True
+    # Pool threads can't see rows written inside a test's transaction.
+    EXCEL_MATCH_WORKERS = 1
+    # Identical stub uploads across tests must not be served from the cache.
+    PARSE_CACHE_ENABLED = False
+    # Spawning extraction processes for every test PDF only slows the suite down.
+    PDF_EXTRACT_WORKERS = 1
 
 import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
@@ -0,0 +1,48 @@
+"""Prometheus metrics for AHSP price lookups.
+
+Registered on the default ``prometheus_client`` registry, so they are served by
+the ``django_prometheus`` ``/metrics`` endpoint alongside the HTTP/DB metrics.
+"""
+
+from __future__ import annotations
+
+from prometheus_client import Counter, Histogram
+
+PRICE_LOOKUP_LATENCY = Histogram(
+    "ahsp_price_lookup_seconds",
+    "Latency of a single AHSP price lookup, per price source.",
+    ["source"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+PRICE_LOOKUP_DB_QUERIES = Histogram(
+    "ahsp_price_lookup_db_queries",
+    "Database queries issued by a single AHSP price lookup, per price source.",
+    ["source"],
+    buckets=(0, 1, 2, 4, 8, 16),
+)
+
+PRICE_RESOLUTIONS = Counter(
+    "ahsp_price_resolutions_total",
+    "Where combined AHSP price lookups were resolved from (db, csv or miss).",
+    ["hit_source"],
+)
+
+PRICE_VARIANT_HITS = Counter(
+    "ahsp_price_variant_hits_total",
+    "Which job-code variant produced the DB price hit.",
+    ["variant"],
+)
+
+
+def record_resolution(hit_source: str) -> None:
+    PRICE_RESOLUTIONS.labels(hit_source=hit_source).inc()
+
+
+def record_variant_hit(variant: str) -> None:
+    PRICE_VARIANT_HITS.labels(variant=variant).inc()
+
+
+def observe_lookup(source: str, seconds: float, db_queries: int) -> None:
+    PRICE_LOOKUP_LATENCY.labels(source=source).observe(seconds)
+    PRICE_LOOKUP_DB_QUERIES.labels(source=source).observe(db_queries)
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RowOverride',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_key', models.CharField(max_length=40)),
+                ('row_key', models.CharField(max_length=128)),
+                ('data', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'rab_row_overrides',
+                'indexes': [models.Index(fields=['updated_at'], name='rab_row_ove_updated_9df7fa_idx')],
+                'constraints': [models.UniqueConstraint(fields=('session_key', 'row_key'), name='uniq_row_override')],
+            },
+        ),
+    ]
@@ -1,3 +1,24 @@
 from django.db import models
 
-# Create your models here.
+
+class RowOverride(models.Model):
+    """
+    A user's manual edit to one preview row (price, volume, analysis code),
+    keyed by session and the preview ``row_key``.
+    """
+    session_key = models.CharField(max_length=40)
+    row_key = models.CharField(max_length=128)  # matches validators._clean_row_key
+    data = models.JSONField(default=dict)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "rab_row_overrides"
+        constraints = [
+            models.UniqueConstraint(fields=["session_key", "row_key"], name="uniq_row_override"),
+        ]
+        indexes = [
+            models.Index(fields=["updated_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.session_key[:8]}… {self.row_key}"
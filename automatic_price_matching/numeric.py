@@ -0,0 +1,80 @@
+"""Shared parsing of Indonesian / international number formats.
+
+Handles the separator conventions found in RAB spreadsheets, PDFs and the AHSP
+CSV (``1.234,56``, ``1,234.56``, ``Rp 5.000``). Plain ints, floats and
+already-clean numeric strings take a fast path that skips separator handling.
+"""
+
+from __future__ import annotations
+
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Optional
+
+_PLAIN_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_EXPRESSION = re.compile(r"\d+\s*[xX]\s*\d+")
+_NON_NUMERIC = re.compile(r"[^0-9.\-]")
+
+
+def normalise_separators(text: str) -> str:
+    """Rewrite thousand/decimal separators so the last separator is the decimal mark.
+
+    * 1.234,56 -> 1234.56
+    * 1,234.56 -> 1234.56
+    * 1,5      -> 1.5
+    * 1.234    -> 1.234 (a lone dot is always decimal)
+    """
+    if "," not in text:
+        return text
+    if "." not in text:
+        return text.replace(",", ".")
+    if text.rfind(",") > text.rfind("."):
+        return text.replace(".", "").replace(",", ".")
+    return text.replace(",", "")
+
+
+def looks_like_expression(text: str) -> bool:
+    """Return True for formula-like cells (``=A1*B1``, ``5 x 6``) that must not be parsed."""
+    return "=" in text or _EXPRESSION.search(text) is not None
+
+
+def parse_decimal(
+    value: Any,
+    default: Optional[Decimal] = Decimal("0"),
+    *,
+    dot_thousands: bool = False,
+    reject_expressions: bool = True,
+) -> Optional[Decimal]:
+    """Convert ``value`` to ``Decimal``, returning ``default`` when it is not a number.
+
+    ``dot_thousands`` treats every dot as a thousand separator and commas as
+    the decimal mark (the AHSP CSV convention, e.g. ``Rp 1.250.000,00``).
+    """
+    if value is None:
+        return default
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return Decimal(value)
+    if isinstance(value, float):
+        return Decimal(str(value))
+
+    text = str(value).strip()
+    if not text:
+        return default
+    if not dot_thousands and _PLAIN_NUMBER.fullmatch(text):
+        return Decimal(text)
+    if not any(ch.isdigit() for ch in text):
+        return default
+    if reject_expressions and looks_like_expression(text):
+        return default
+
+    if dot_thousands:
+        text = text.replace(".", "").replace(",", ".")
+    else:
+        text = normalise_separators(text)
+    text = _NON_NUMERIC.sub("", text)
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        return default
@@ -0,0 +1,70 @@
+"""Per-row override storage, one DB row per (session, row_key).
+
+Replaces the ``rab_overrides`` session dict: an edit upserts a single row and
+preview reads only the keys it renders, so the session blob stays small.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import connections, router
+from django.http import HttpRequest
+from django.utils import timezone
+
+from .models import RowOverride
+
+
+def _session_key(request: HttpRequest, create: bool = False) -> Optional[str]:
+    session = getattr(request, "session", None)
+    if session is None:
+        return None
+    if not session.session_key and create:
+        session.save()
+    return session.session_key
+
+
+def _conflict_target(unique_fields: List[str]) -> Dict[str, List[str]]:
+    """
+    ``unique_fields`` for an upserting ``bulk_create``, if the backend takes one.
+
+    MySQL's ON DUPLICATE KEY UPDATE cannot name a conflict target (it fires on
+    any unique key) and Django rejects ``unique_fields`` there.
+    """
+    connection = connections[router.db_for_write(RowOverride) or "default"]
+    if connection.features.supports_update_conflicts_with_target:
+        return {"unique_fields": unique_fields}
+    return {}
+
+
+def save_override(request: HttpRequest, row_key: str, payload: Dict[str, Any]) -> None:
+    """Insert or replace the override for ``row_key`` in a single upsert."""
+    session_key = _session_key(request, create=True)
+    if not session_key:
+        return
+    RowOverride.objects.bulk_create(
+        [RowOverride(session_key=session_key, row_key=row_key, data=payload, updated_at=timezone.now())],
+        update_conflicts=True,
+        update_fields=["data", "updated_at"],
+        **_conflict_target(["session_key", "row_key"]),
+    )
+
+
+def load_overrides(request: HttpRequest, row_keys: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Return ``{row_key: payload}`` for this session, optionally limited to ``row_keys``."""
+    session_key = _session_key(request)
+    if not session_key:
+        return {}
+    qs = RowOverride.objects.filter(session_key=session_key)
+    if row_keys is not None:
+        keys = [key for key in row_keys if key]
+        if not keys:
+            return {}
+        qs = qs.filter(row_key__in=keys)
+    return dict(qs.values_list("row_key", "data"))
+
+
+def purge_overrides(older_than) -> int:
+    """Delete overrides last touched before ``older_than``; returns the number removed."""
+    deleted, _ = RowOverride.objects.filter(updated_at__lt=older_than).delete()
+    return deleted
@@ -2,11 +2,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Dict, Mapping, Optional, Protocol
+from typing import Dict, Iterable, Mapping, Optional, Protocol
 from pathlib import Path
 import logging
+import threading
+import time
 
+from django.db import connections, router
+
+from . import metrics
 from .normalization import canonicalize_job_code
+from .numeric import parse_decimal
 
 # --- DB model import ---
 from rencanakan_core.models import Ahs
@@ -21,6 +27,22 @@ class AhspSource(Protocol):
         ...
 
 
+def lookup_prices(source: AhspSource, canonical_codes: Iterable[str]) -> Dict[str, Decimal]:
+    """Resolve many codes at once, using ``source.get_prices_by_code`` when available."""
+    codes = list(dict.fromkeys(code for code in canonical_codes if code))
+    if not codes:
+        return {}
+    bulk = getattr(source, "get_prices_by_code", None)
+    if bulk is not None:
+        return bulk(codes)
+    prices: Dict[str, Decimal] = {}
+    for code in codes:
+        price = source.get_price_by_code(code)
+        if price is not None:
+            prices[code] = price
+    return prices
+
+
 class MockAhspSource:
     """In-memory AHSP code -> price mapping for tests and local dev."""
 
@@ -53,32 +75,22 @@ class CsvAhspSource:
         self.csv_path = csv_path or (base / "automatic_job_matching" / "data" / "AHSP_CIPTA_KARYA.csv")
         self._store: Dict[str, Decimal] = {}
         self._loaded = False
+        self._load_lock = threading.Lock()
 
     def _parse_price(self, raw: str) -> Optional[Decimal]:
-        if raw is None:
-            return None
-        s = str(raw).strip()
-        if not s:
-            return None
-        s = s.upper().replace("RP", "")
-        s = s.replace("\u2009", "")
-        s = s.strip()
-        if s == "-" or not any(ch.isdigit() for ch in s):
-            return None
-        s = s.replace(".", "")
-        s = s.replace(",", ".")
-        import re
-        s = re.sub(r"[^0-9\.\-]", "", s)
-        if not s:
-            return None
-        try:
-            return Decimal(s)
-        except Exception:
-            return None
+        return parse_decimal(raw, None, dot_thousands=True, reject_expressions=False)
 
     def _load(self) -> None:
         if self._loaded:
             return
+        # Single-flight: concurrent first lookups wait for one parse instead of racing.
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._load_csv()
+
+    def _load_csv(self) -> None:
+        store: Dict[str, Decimal] = {}
         try:
             import csv
             with open(self.csv_path, mode="r", encoding="utf-8-sig", newline="") as fh:
@@ -105,12 +117,13 @@ class CsvAhspSource:
                         continue
                     price = self._parse_price(raw_price)
                     if price is not None:
-                        self._store[key] = price
-            logger.debug("CsvAhspSource loaded %d entries from %s", len(self._store), self.csv_path)
+                        store[key] = price
+            logger.debug("CsvAhspSource loaded %d entries from %s", len(store), self.csv_path)
         except FileNotFoundError:
             logger.debug("CsvAhspSource CSV file not found: %s", self.csv_path)
         except Exception:
             logger.exception("CsvAhspSource failed to load CSV: %s", self.csv_path)
+        self._store = store
         self._loaded = True
 
     def get_price_by_code(self, canonical_code: str) -> Optional[Decimal]:
@@ -141,25 +154,56 @@ class DatabaseAhspSource:
             logger.exception("DatabaseAhspSource lookup failed for %s", canonical_code)
         return None
 
+    def get_prices_by_code(self, canonical_codes: Iterable[str]) -> Dict[str, Decimal]:
+        """Fetch prices for many codes with a single ``IN`` query."""
+        codes = [code for code in canonical_codes if code]
+        if not codes:
+            return {}
+        prices: Dict[str, Decimal] = {}
+        try:
+            found: Dict[str, Decimal] = {}
+            for code, price in Ahs.objects.filter(code__in=codes).values_list("code", "unit_price"):
+                if code is not None and price is not None:
+                    found.setdefault(code.upper(), Decimal(str(price)))
+            for code in codes:
+                price = found.get(code.upper())
+                if price is not None:
+                    prices[code] = price
+        except Exception:
+            logger.exception("DatabaseAhspSource bulk lookup failed for %d codes", len(codes))
+        return prices
+
 
 class CombinedAhspSource:
     """Try DB then CSV for price lookup; attempt common code variants."""
 
-    def __init__(self, db_source: DatabaseAhspSource | None = None, csv_source: CsvAhspSource | None = None):
+    def __init__(self, db_source: AhspSource | None = None, csv_source: AhspSource | None = None):
         self.db = db_source or DatabaseAhspSource()
         self.csv = csv_source or CsvAhspSource()
 
+    @staticmethod
+    def _code_variants(canonical_code: str) -> list[tuple[str, str]]:
+        """Return ``(label, variant)`` pairs in lookup order, without duplicates."""
+        candidates = [
+            ("exact", canonical_code),
+            ("dash", canonical_code.replace(".", "-")),
+            ("dot", canonical_code.replace("-", ".")),
+            ("compact", canonical_code.replace(".", "").replace("-", "")),
+        ]
+        seen: set[str] = set()
+        variants = []
+        for label, variant in candidates:
+            if variant not in seen:
+                seen.add(variant)
+                variants.append((label, variant))
+        return variants
+
     def _try_variants_in_db(self, canonical_code: str) -> Optional[Decimal]:
-        variants = {
-            canonical_code,
-            canonical_code.replace(".", "-"),
-            canonical_code.replace("-", "."),
-            canonical_code.replace(".", "").replace("-", ""),
-        }
-        for v in variants:
+        for label, v in self._code_variants(canonical_code):
             price = self.db.get_price_by_code(v)
             if price is not None:
                 logger.debug("CombinedAhspSource: DB hit for variant=%s price=%s", v, price)
+                metrics.record_variant_hit(label)
                 return price
         return None
 
@@ -186,10 +230,70 @@ class CombinedAhspSource:
                 )
             elif db_price is None:
                 logger.debug("CombinedAhspSource: CSV hit for code=%s price=%s", canonical_code, csv_price)
+            metrics.record_resolution("csv")
             return csv_price
 
+        metrics.record_resolution("db" if db_price is not None else "miss")
         return db_price
 
+    def get_prices_by_code(self, canonical_codes: Iterable[str]) -> Dict[str, Decimal]:
+        """Bulk variant of :meth:`get_price_by_code` with the same CSV-first precedence."""
+        codes = list(dict.fromkeys(code for code in canonical_codes if code))
+        prices: Dict[str, Decimal] = {}
+        try:
+            prices.update(lookup_prices(self.csv, codes))
+        except Exception:
+            logger.exception("CombinedAhspSource: CSV bulk lookup failed")
+        for _ in prices:
+            metrics.record_resolution("csv")
+
+        missing = [code for code in codes if code not in prices]
+        if missing:
+            variants = {code: self._code_variants(code) for code in missing}
+            db_prices = lookup_prices(self.db, (v for pairs in variants.values() for _, v in pairs))
+            for code in missing:
+                for label, v in variants[code]:
+                    if v in db_prices:
+                        prices[code] = db_prices[v]
+                        metrics.record_variant_hit(label)
+                        break
+                metrics.record_resolution("db" if code in prices else "miss")
+        return prices
+
+
+class InstrumentedAhspSource:
+    """Wrap a price source and export per-lookup latency and DB query counts."""
+
+    def __init__(self, source: AhspSource, name: str):
+        self.source = source
+        self.name = name
+
+    def __getattr__(self, attr: str):
+        # Keep the wrapped source's attributes (e.g. ``csv``/``db``) reachable.
+        return getattr(self.source, attr)
+
+    def _observed(self, lookup, *args):
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        connection = connections[router.db_for_read(Ahs) or "default"]
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(count_query):
+                return lookup(*args)
+        finally:
+            metrics.observe_lookup(self.name, time.perf_counter() - start, queries)
+
+    def get_price_by_code(self, canonical_code: str) -> Optional[Decimal]:
+        return self._observed(self.source.get_price_by_code, canonical_code)
+
+    def get_prices_by_code(self, canonical_codes: Iterable[str]) -> Dict[str, Decimal]:
+        return self._observed(lookup_prices, self.source, canonical_codes)
+
 
 @dataclass
 class AhspPriceRetriever:
@@ -203,4 +307,19 @@ class AhspPriceRetriever:
         canonical = canonicalize_job_code(code)
         if not canonical:
             return None
-        return self.source.get_price_by_code(canonical)
\ No newline at end of file
+        return self.source.get_price_by_code(canonical)
+
+    def get_prices_by_job_codes(self, codes: Iterable[object]) -> Dict[str, Decimal]:
+        """Resolve many job codes in one pass; the result is keyed by the codes as given."""
+        canonical_by_code: Dict[str, str] = {}
+        for code in codes:
+            if isinstance(code, str) and code not in canonical_by_code:
+                canonical = canonicalize_job_code(code)
+                if canonical:
+                    canonical_by_code[code] = canonical
+        found = lookup_prices(self.source, canonical_by_code.values())
+        return {
+            code: found[canonical]
+            for code, canonical in canonical_by_code.items()
+            if canonical in found
+        }
\ No newline at end of file
@@ -9,7 +9,8 @@ from .validators import validate_ahsp_payload
 from .fallback_validator import apply_fallback
 from .total_cost import TotalCostCalculator
 from .ahs_cache import AhsCache
-from .price_retrieval import AhspPriceRetriever, MockAhspSource
+from .price_retrieval import AhspPriceRetriever
+from .source_registry import get_price_retriever
 
 
 class AutomaticPriceMatchingService:
@@ -20,7 +21,7 @@ class AutomaticPriceMatchingService:
         price_retriever: Optional[AhspPriceRetriever] = None,
         cache: Optional[AhsCache] = None,
     ) -> None:
-        self.price_retriever = price_retriever or AhspPriceRetriever(MockAhspSource({}))
+        self.price_retriever = price_retriever or get_price_retriever()
         self.cache = cache or AhsCache()
 
     def match_one(self, payload: Any) -> Dict[str, Any]:
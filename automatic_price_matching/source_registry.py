@@ -0,0 +1,63 @@
+"""Process-wide registry for the shared AHSP price source."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Optional
+
+from .price_retrieval import (
+    AhspPriceRetriever,
+    AhspSource,
+    CombinedAhspSource,
+    CsvAhspSource,
+    DatabaseAhspSource,
+    InstrumentedAhspSource,
+)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_source: Optional[AhspSource] = None
+
+
+def build_instrumented_source() -> AhspSource:
+    """Combined DB+CSV source with latency/query metrics on every layer."""
+    combined = CombinedAhspSource(
+        db_source=InstrumentedAhspSource(DatabaseAhspSource(), "db"),
+        csv_source=InstrumentedAhspSource(CsvAhspSource(), "csv"),
+    )
+    return InstrumentedAhspSource(combined, "combined")
+
+
+_factory: Callable[[], AhspSource] = build_instrumented_source
+
+
+def get_price_source() -> AhspSource:
+    """Return the shared price source, building it on first use."""
+    global _source
+    source = _source
+    if source is not None:
+        return source
+    with _lock:
+        if _source is None:
+            _source = _factory()
+            logger.debug("Initialised shared price source %s", type(_source).__name__)
+        return _source
+
+
+def get_price_retriever() -> AhspPriceRetriever:
+    """Return a retriever bound to the shared price source."""
+    return AhspPriceRetriever(get_price_source())
+
+
+def set_price_source(source: Optional[AhspSource]) -> None:
+    """Replace the shared source (``None`` rebuilds lazily on next access)."""
+    global _source
+    with _lock:
+        _source = source
+
+
+def reset_price_source() -> None:
+    """Drop the shared source so the next lookup reloads it (useful for testing)."""
+    set_price_source(None)
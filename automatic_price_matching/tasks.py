@@ -0,0 +1,21 @@
+"""
+Celery tasks for automatic price matching housekeeping.
+"""
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from .override_store import purge_overrides
+
+
+@shared_task(ignore_result=True)
+def purge_stale_overrides_task():
+    """
+    Delete row overrides untouched for longer than ``ROW_OVERRIDE_MAX_AGE``
+    seconds (defaults to the session cookie age, after which the owning
+    session is gone anyway). Scheduled via ``CELERY_BEAT_SCHEDULE``.
+    """
+    max_age = getattr(settings, "ROW_OVERRIDE_MAX_AGE", settings.SESSION_COOKIE_AGE)
+    return purge_overrides(timezone.now() - timedelta(seconds=max_age))
@@ -0,0 +1,102 @@
+import logging
+import os
+import unittest
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from automatic_job_matching.utils.benchmark_runner import BenchmarkRunner
+from automatic_price_matching.numeric import (
+    looks_like_expression,
+    normalise_separators,
+    parse_decimal,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NormaliseSeparatorsTests(SimpleTestCase):
+    def test_last_separator_is_decimal_mark(self):
+        self.assertEqual(normalise_separators("1.234,56"), "1234.56")
+        self.assertEqual(normalise_separators("1,234.56"), "1234.56")
+        self.assertEqual(normalise_separators("1.2.3,4"), "123.4")
+        self.assertEqual(normalise_separators("1,2,3.4"), "123.4")
+
+    def test_single_separator_forms(self):
+        self.assertEqual(normalise_separators("1,5"), "1.5")
+        self.assertEqual(normalise_separators("1.234"), "1.234")
+        self.assertEqual(normalise_separators("1234"), "1234")
+
+    def test_expression_detection(self):
+        self.assertTrue(looks_like_expression("=A1*B1"))
+        self.assertTrue(looks_like_expression("5 x 6"))
+        self.assertFalse(looks_like_expression("Rp 5.000"))
+
+
+class ParseDecimalTests(SimpleTestCase):
+    def test_fast_paths_for_native_and_plain_values(self):
+        self.assertEqual(parse_decimal(12), Decimal("12"))
+        self.assertEqual(parse_decimal(1.5), Decimal("1.5"))
+        self.assertEqual(parse_decimal(Decimal("2.25")), Decimal("2.25"))
+        self.assertEqual(parse_decimal("-42.10"), Decimal("-42.10"))
+
+    def test_indonesian_and_international_formats(self):
+        self.assertEqual(parse_decimal("1.234,56"), Decimal("1234.56"))
+        self.assertEqual(parse_decimal("1,234.56"), Decimal("1234.56"))
+        self.assertEqual(parse_decimal("Rp 1.234,56"), Decimal("1234.56"))
+
+    def test_blank_and_invalid_values_return_default(self):
+        self.assertEqual(parse_decimal(None), Decimal("0"))
+        self.assertEqual(parse_decimal("   "), Decimal("0"))
+        self.assertEqual(parse_decimal("abc"), Decimal("0"))
+        self.assertEqual(parse_decimal("7 = 5 x 6"), Decimal("0"))
+        self.assertIsNone(parse_decimal("-", None))
+
+    def test_expressions_allowed_when_not_rejected(self):
+        self.assertEqual(parse_decimal("5 x 6", reject_expressions=False), Decimal("56"))
+
+    def test_dot_thousands_mode(self):
+        self.assertEqual(parse_decimal("Rp 1.250.000,00", None, dot_thousands=True), Decimal("1250000.00"))
+        self.assertEqual(parse_decimal("Rp 500.000", None, dot_thousands=True), Decimal("500000"))
+        self.assertIsNone(parse_decimal("invalid", None, dot_thousands=True))
+
+
+@unittest.skipUnless(os.getenv("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to run micro-benchmarks")
+class ParseDecimalBenchmarkTests(SimpleTestCase):
+    """Opt-in micro-benchmarks over a representative mix of spreadsheet cells."""
+
+    CELLS = [
+        12500, 3.75, "1500000", "2.50", "1.234.567,89", "1,234,567.89",
+        "Rp 1.250.000,00", "", None, "-", "7 = 5 x 6", "Ls",
+    ] * 500
+
+    def _run(self, func):
+        result = BenchmarkRunner(func=func, runs=5, warmup=1).run()
+        logger.info("%s: avg=%.2fms min=%.2fms", func.__name__, result["avg_ms"], result["min_ms"])
+        self.assertEqual(len(result["times_ms"]), 5)
+        return result
+
+    def test_benchmark_mixed_cells(self):
+        def parse_mixed_cells():
+            for cell in self.CELLS:
+                parse_decimal(cell)
+
+        self._run(parse_mixed_cells)
+
+    def test_benchmark_plain_numeric_cells(self):
+        plain = [str(i) for i in range(6000)]
+
+        def parse_plain_cells():
+            for cell in plain:
+                parse_decimal(cell)
+
+        self._run(parse_plain_cells)
+
+    def test_benchmark_csv_price_cells(self):
+        prices = [f"Rp {i}.{i % 1000:03d},00" for i in range(1, 6001)]
+
+        def parse_csv_prices():
+            for cell in prices:
+                parse_decimal(cell, None, dot_thousands=True)
+
+        self._run(parse_csv_prices)
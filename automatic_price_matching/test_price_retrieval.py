@@ -218,4 +218,167 @@ class CombinedAhspSourceTests(SimpleTestCase):  # ✅ Changed from TestCase
         price = source.get_price_by_code("5.1.1.1")
 
         # Should fall back to DB
-        self.assertEqual(price, Decimal("1250000"))
\ No newline at end of file
+        self.assertEqual(price, Decimal("1250000"))
+
+class PriceSourceRegistryTests(SimpleTestCase):
+    def setUp(self):
+        from automatic_price_matching import source_registry
+        self.registry = source_registry
+        self.registry.reset_price_source()
+
+    def tearDown(self):
+        self.registry.reset_price_source()
+
+    def test_shared_source_is_built_once(self):
+        """Test registry hands out the same source instance to every caller"""
+        first = self.registry.get_price_source()
+        second = self.registry.get_price_source()
+        self.assertIs(first, second)
+        self.assertIs(self.registry.get_price_retriever().source, first)
+
+    def test_set_and_reset_price_source(self):
+        """Test an injected source is used until the registry is reset"""
+        from automatic_price_matching.price_retrieval import MockAhspSource
+
+        mock_source = MockAhspSource({"5.1.1.1": Decimal("1000")})
+        self.registry.set_price_source(mock_source)
+        self.assertEqual(
+            self.registry.get_price_retriever().get_price_by_job_code("5-1-1-1"),
+            Decimal("1000"),
+        )
+
+        self.registry.reset_price_source()
+        self.assertIsNot(self.registry.get_price_source(), mock_source)
+
+    def test_csv_source_loads_once_under_concurrent_lookups(self):
+        """Test concurrent first lookups share a single CSV parse"""
+        import tempfile
+        import threading
+        from automatic_price_matching.price_retrieval import CsvAhspSource
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write("NO;URAIAN;SATUAN;HARGA SATUAN\n")
+            f.write("5.1.1.1;Pekerjaan A;unit;Rp 1.250.000,00\n")
+            csv_path = Path(f.name)
+
+        try:
+            source = CsvAhspSource(csv_path)
+            original = source._load_csv
+            calls = []
+
+            def counting_load():
+                calls.append(1)
+                original()
+
+            source._load_csv = counting_load
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(source.get_price_by_code("5.1.1.1")))
+                for _ in range(8)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(results, [Decimal("1250000.00")] * 8)
+        finally:
+            csv_path.unlink()
+
+
+class PriceSourceMetricsTests(TestCase):
+    def _sample(self, name, **labels):
+        from prometheus_client import REGISTRY
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    @patch('automatic_price_matching.price_retrieval.Ahs')
+    def test_resolution_and_variant_counters(self, mock_ahs):
+        """Test combined source records csv/db/miss resolutions and variant hits"""
+        from automatic_price_matching.price_retrieval import CombinedAhspSource, MockAhspSource
+
+        def filter_side_effect(*args, **kwargs):
+            result = Mock()
+            code = kwargs.get('code__iexact') or kwargs.get('code')
+            obj = Mock(unit_price=Decimal("500"), code=code)
+            result.first.return_value = obj if code == "5-1-1-1" else None
+            return result
+
+        mock_ahs.objects.filter.side_effect = filter_side_effect
+        source = CombinedAhspSource(csv_source=MockAhspSource({"6.1.1": Decimal("10")}))
+
+        before = {
+            key: self._sample('ahsp_price_resolutions_total', hit_source=key)
+            for key in ("csv", "db", "miss")
+        }
+        dash_before = self._sample('ahsp_price_variant_hits_total', variant="dash")
+
+        self.assertEqual(source.get_price_by_code("6.1.1"), Decimal("10"))
+        self.assertEqual(source.get_price_by_code("5.1.1.1"), Decimal("500"))
+        self.assertIsNone(source.get_price_by_code("9.9.9"))
+
+        for key in ("csv", "db", "miss"):
+            self.assertEqual(self._sample('ahsp_price_resolutions_total', hit_source=key), before[key] + 1)
+        self.assertEqual(self._sample('ahsp_price_variant_hits_total', variant="dash"), dash_before + 1)
+
+    def test_code_variants_are_ordered_and_unique(self):
+        """Test variant order is deterministic and duplicates are dropped"""
+        from automatic_price_matching.price_retrieval import CombinedAhspSource
+
+        self.assertEqual(
+            CombinedAhspSource._code_variants("5.1.1"),
+            [("exact", "5.1.1"), ("dash", "5-1-1"), ("compact", "511")],
+        )
+
+    def test_instrumented_source_observes_latency_and_queries(self):
+        """Test wrapper records one latency sample and counts DB queries per lookup"""
+        from automatic_price_matching.price_retrieval import DatabaseAhspSource, InstrumentedAhspSource
+
+        source = InstrumentedAhspSource(DatabaseAhspSource(), "db-test")
+        count_before = self._sample('ahsp_price_lookup_seconds_count', source="db-test")
+        queries_before = self._sample('ahsp_price_lookup_db_queries_sum', source="db-test")
+
+        self.assertIsNone(source.get_price_by_code("ZZ.99.999"))
+
+        self.assertEqual(self._sample('ahsp_price_lookup_seconds_count', source="db-test"), count_before + 1)
+        self.assertGreater(self._sample('ahsp_price_lookup_db_queries_sum', source="db-test"), queries_before)
+
+    def test_registry_builds_instrumented_source(self):
+        """Test the shared source is instrumented and still exposes its layers"""
+        from automatic_price_matching import source_registry
+        from automatic_price_matching.price_retrieval import InstrumentedAhspSource
+
+        source_registry.reset_price_source()
+        try:
+            source = source_registry.get_price_source()
+            self.assertIsInstance(source, InstrumentedAhspSource)
+            self.assertIsInstance(source.csv, InstrumentedAhspSource)
+            self.assertEqual(source.csv.name, "csv")
+        finally:
+            source_registry.reset_price_source()
+
+
+class BulkPriceLookupTests(SimpleTestCase):
+    @patch('automatic_price_matching.price_retrieval.Ahs')
+    def test_combined_bulk_prefers_csv_and_queries_db_once(self, mock_ahs):
+        """Test bulk lookup keeps CSV precedence and resolves DB misses in one query"""
+        from automatic_price_matching.price_retrieval import CombinedAhspSource, MockAhspSource
+
+        mock_ahs.objects.filter.return_value.values_list.return_value = [
+            ("5-1-1-1", Decimal("700")),
+            ("6.1.1", Decimal("1")),
+        ]
+        source = CombinedAhspSource(csv_source=MockAhspSource({"6.1.1": Decimal("10")}))
+
+        prices = source.get_prices_by_code(["6.1.1", "5.1.1.1", "9.9.9", "6.1.1"])
+
+        self.assertEqual(prices, {"6.1.1": Decimal("10"), "5.1.1.1": Decimal("700")})
+        mock_ahs.objects.filter.assert_called_once()
+        self.assertNotIn("6.1.1", mock_ahs.objects.filter.call_args.kwargs["code__in"])
+
+    def test_retriever_bulk_lookup_keys_by_given_code(self):
+        from automatic_price_matching.price_retrieval import AhspPriceRetriever, MockAhspSource
+
+        retriever = AhspPriceRetriever(MockAhspSource({"AT.01.001": Decimal("5")}))
+        prices = retriever.get_prices_by_job_codes(["AT-01-001", "missing", None, 3])
+        self.assertEqual(prices, {"AT-01-001": Decimal("5")})
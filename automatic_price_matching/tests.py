@@ -596,10 +596,11 @@ class RecomputeTotalCostTDDTests(TestCase):
         response = self.client.post(self.url, json.dumps(payload), content_type="application/json")
         self.assertEqual(response.status_code, 200)
 
-        session = self.client.session
-        overrides = session.get("rab_overrides")
-        self.assertIsNotNone(overrides)
-        stored = overrides.get("row-001")
+        from automatic_price_matching.models import RowOverride
+
+        stored = RowOverride.objects.get(
+            session_key=self.client.session.session_key, row_key="row-001"
+        ).data
         self.assertIsNotNone(stored)
         self.assertEqual(stored.get("unit_price"), "1000.00")
         self.assertEqual(stored.get("total_price"), "2500.00")
@@ -657,3 +658,101 @@ def test_missing_volume_and_price_triggers_fallback(self):
     assert result["unit_price"] is None
     assert result["total_cost"] == Decimal("0")
     assert result["match_status"] == "Needs Manual Input"
+
+
+class RowOverrideStoreTests(TestCase):
+    def setUp(self):
+        from django.contrib.sessions.backends.db import SessionStore
+        from django.test import RequestFactory
+
+        self.request = RequestFactory().post("/")
+        self.request.session = SessionStore()
+
+    def test_save_upserts_single_row_per_key(self):
+        from automatic_price_matching.models import RowOverride
+        from automatic_price_matching.override_store import load_overrides, save_override
+
+        save_override(self.request, "row-1", {"volume": "1.00"})
+        save_override(self.request, "row-1", {"volume": "3.00"})
+        save_override(self.request, "row-2", {"unit_price": "10.00"})
+
+        self.assertEqual(RowOverride.objects.filter(row_key="row-1").count(), 1)
+        self.assertEqual(
+            load_overrides(self.request),
+            {"row-1": {"volume": "3.00"}, "row-2": {"unit_price": "10.00"}},
+        )
+        self.assertNotIn("rab_overrides", self.request.session)
+
+    def test_save_omits_conflict_target_where_backend_cannot_name_one(self):
+        from django.db import connection
+        from automatic_price_matching.models import RowOverride
+        from automatic_price_matching.override_store import save_override
+
+        # Like MySQL: Django raises NotSupportedError if unique_fields is passed.
+        with patch.object(connection.features, "supports_update_conflicts_with_target", False):
+            save_override(self.request, "row-1", {"volume": "1.00"})
+        self.assertEqual(list(RowOverride.objects.values_list("row_key", "data")), [("row-1", {"volume": "1.00"})])
+
+    def test_load_limits_to_requested_rows_and_session(self):
+        from automatic_price_matching.models import RowOverride
+        from automatic_price_matching.override_store import load_overrides, save_override
+        from django.utils import timezone
+
+        save_override(self.request, "row-1", {"volume": "1.00"})
+        save_override(self.request, "row-2", {"volume": "2.00"})
+        RowOverride.objects.create(
+            session_key="other-session", row_key="row-1", data={"volume": "9"}, updated_at=timezone.now()
+        )
+
+        with self.assertNumQueries(1):
+            overrides = load_overrides(self.request, ["row-1", None])
+        self.assertEqual(overrides, {"row-1": {"volume": "1.00"}})
+
+    def test_load_without_session_key_is_empty(self):
+        from automatic_price_matching.override_store import load_overrides
+
+        with self.assertNumQueries(0):
+            self.assertEqual(load_overrides(self.request, ["row-1"]), {})
+
+    def test_purge_removes_stale_overrides(self):
+        from datetime import timedelta
+        from automatic_price_matching.models import RowOverride
+        from automatic_price_matching.override_store import purge_overrides, save_override
+        from django.utils import timezone
+
+        save_override(self.request, "row-1", {"volume": "1.00"})
+        RowOverride.objects.update(updated_at=timezone.now() - timedelta(days=30))
+        save_override(self.request, "row-2", {"volume": "2.00"})
+
+        self.assertEqual(purge_overrides(timezone.now() - timedelta(days=7)), 1)
+        self.assertEqual(list(RowOverride.objects.values_list("row_key", flat=True)), ["row-2"])
+
+    def test_save_accepts_longest_valid_row_key(self):
+        from automatic_price_matching.models import RowOverride
+        from automatic_price_matching.override_store import save_override
+
+        row_key = "k" * 128
+        save_override(self.request, row_key, {"volume": "1.00"})
+
+        self.assertEqual(RowOverride._meta.get_field("row_key").max_length, 128)
+        self.assertTrue(RowOverride.objects.filter(row_key=row_key).exists())
+
+    @override_settings(ROW_OVERRIDE_MAX_AGE=7 * 24 * 60 * 60)
+    def test_periodic_task_purges_overrides_past_max_age(self):
+        from datetime import timedelta
+        from django.conf import settings
+        from django.utils import timezone
+        from automatic_price_matching.models import RowOverride
+        from automatic_price_matching.override_store import save_override
+        from automatic_price_matching.tasks import purge_stale_overrides_task
+
+        save_override(self.request, "row-1", {"volume": "1.00"})
+        RowOverride.objects.update(updated_at=timezone.now() - timedelta(days=8))
+        save_override(self.request, "row-2", {"volume": "2.00"})
+
+        self.assertEqual(purge_stale_overrides_task.apply().get(), 1)
+        self.assertEqual(list(RowOverride.objects.values_list("row_key", flat=True)), ["row-2"])
+        self.assertEqual(
+            settings.CELERY_BEAT_SCHEDULE["purge-stale-row-overrides"]["task"],
+            purge_stale_overrides_task.name,
+        )
@@ -9,15 +9,17 @@ from django.core.exceptions import ValidationError
 
 from automatic_price_matching.total_cost import TotalCostCalculator
 from automatic_price_matching.normalization import canonicalize_job_code
+from automatic_price_matching.numeric import looks_like_expression, normalise_separators
 
 # ---------------------------------------------------------------------------
-# Regex patterns for identifying numeric formatting variants & disallowed
-# expression-like inputs (we explicitly reject multiplication / equations so
-# the service never evaluates user supplied expressions).
+# Regex patterns for numeric fast paths & disallowed characters. Separator
+# handling and expression detection (we explicitly reject multiplication /
+# equations so the service never evaluates user supplied expressions) live in
+# ``automatic_price_matching.numeric``.
 # ---------------------------------------------------------------------------
-_THOUSAND_DOT_DECIMAL_COMMA = re.compile(r"^\d{1,3}(\.\d{3})+,\d+$")
-_THOUSAND_COMMA_DECIMAL_DOT = re.compile(r"^\d{1,3}(,\d{3})+\.\d+$")
-_MULTIPLICATION_PATTERN = re.compile(r"\d+\s*[xX]\s*\d+")
+_PLAIN_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_NON_NUMERIC = re.compile(r"[^0-9.+-]")
+_JOB_CODE_DISALLOWED = re.compile(r"[^A-Za-z0-9.\-_/ ]")
 _ROW_KEY_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
 
 
@@ -90,7 +92,7 @@ def _clean_job_code(
         return ""
 
     upper_text = raw_text.upper()
-    sanitized = re.sub(r"[^A-Za-z0-9.\-_/ ]", "", upper_text)
+    sanitized = _JOB_CODE_DISALLOWED.sub("", upper_text)
     if sanitized != upper_text:
         errors[field].append("Job code contains invalid characters.")
         return ""
@@ -136,32 +138,6 @@ def _append_number_error(
     errors[field].append(f"{prefix}must be numeric.")
 
 
-def _normalise_numeric_string(candidate: str) -> str:
-    """Normalise various thousand/decimal separator conventions to standard.
-
-    Supported cases (examples):
-      * 1.234,56  (European) -> 1234.56
-      * 1,234.56  (US)       -> 1234.56
-      * 1,234     (thousand commas, no decimals) -> 1234
-      * 1,5       (comma as decimal) -> 1.5
-      * Mixed patterns where the last separator indicates decimals.
-    Non digit/plus/minus/dot characters are stripped afterwards.
-    """
-    if _THOUSAND_DOT_DECIMAL_COMMA.match(candidate):
-        return candidate.replace(".", "").replace(",", ".")
-    if _THOUSAND_COMMA_DECIMAL_DOT.match(candidate):
-        return candidate.replace(",", "")
-
-    if "," in candidate and "." not in candidate:
-        return candidate.replace(",", ".")  # simple decimal comma
-    if "," in candidate and "." in candidate:
-        # Determine which separator appears last to infer decimal mark
-        if candidate.rfind(",") > candidate.rfind("."):
-            return candidate.replace(".", "").replace(",", ".")
-        return candidate.replace(",", "")
-    return candidate  # Already simple form
-
-
 def _coerce_decimal(
     errors: MutableMapping[str, List[str]],
     value: Any,
@@ -185,15 +161,18 @@ def _coerce_decimal(
         candidate = value.strip()
         if candidate == "":
             return None
+        if _PLAIN_NUMBER.fullmatch(candidate):  # Fast path
+            return Decimal(candidate)
         if not any(ch.isdigit() for ch in candidate):
             _append_number_error(errors, field, context)
             return None
-        if _MULTIPLICATION_PATTERN.search(candidate) or "=" in candidate:
+        if looks_like_expression(candidate):
             _append_number_error(errors, field, context)
             return None
-        normalised = _normalise_numeric_string(candidate)
+        # 1.234,56 / 1,234.56 / 1,5 -> the last separator marks the decimals
+        normalised = normalise_separators(candidate)
         # Strip any lingering unexpected characters (currency, spaces, etc.)
-        normalised = re.sub(r"[^0-9.+-]", "", normalised)
+        normalised = _NON_NUMERIC.sub("", normalised)
         try:
             return Decimal(normalised)
         except InvalidOperation:
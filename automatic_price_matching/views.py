@@ -10,7 +10,8 @@ from django.http import JsonResponse, HttpRequest
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 
-from .price_retrieval import AhspPriceRetriever, CombinedAhspSource
+from .override_store import save_override
+from .source_registry import get_price_retriever
 from .validators import validate_recompute_payload
 
 logger = logging.getLogger(__name__)
@@ -27,10 +28,7 @@ def _serialize_decimals(obj: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _store_override(request: HttpRequest, row_key: str, payload: Dict[str, Any]) -> None:
-    overrides: Dict[str, Dict[str, Any]] = request.session.get("rab_overrides", {})
-    overrides[row_key] = payload
-    request.session["rab_overrides"] = overrides
-    request.session.modified = True
+    save_override(request, row_key, payload)
 
 
 @csrf_exempt
@@ -63,7 +61,7 @@ def recompute_total_cost(request: HttpRequest):
 
     try:
         if unit_price is None and isinstance(canonical_code, str) and canonical_code.strip():
-            retriever = AhspPriceRetriever(CombinedAhspSource())
+            retriever = get_price_retriever()
             unit_price = retriever.get_price_by_job_code(canonical_code)
             logger.debug("resolved unit_price for code=%s -> %s", canonical_code, unit_price)
 
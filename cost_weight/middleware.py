@@ -0,0 +1,16 @@
+from typing import Callable
+
+from django.http import HttpRequest, HttpResponse
+
+from cost_weight.services.recalc_scheduler import coalesce_recalcs
+
+
+class CoalesceWeightRecalcMiddleware:
+    """Recalculate each touched job's weights once per request instead of once per item save."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with coalesce_recalcs():
+            return self.get_response(request)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from decimal import Decimal
 from django.db import models
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum, Value
 
 
 class TestJob(models.Model):
@@ -13,16 +14,26 @@ class TestJob(models.Model):
         db_table = "cw_jobs"
 
     def calculate_totals(self):
-        """Calculate total cost and auto-assign weight percentages"""
-        total = sum(item.cost for item in self.items.all())
+        """Calculate total cost and auto-assign weight percentages.
+
+        One aggregate, one job UPDATE and one item UPDATE; no per-item saves,
+        so the item post_save weight signal is not re-entered.
+        """
+        total = self.items.aggregate(total=Sum("cost"))["total"] or Decimal("0")
         self.total_cost = total
-        self.save()
-        
+        self.save(update_fields=["total_cost"])
+
         # Auto calculate weight percentages
-        for item in self.items.all():
-            if total > 0:
-                item.weight_pct = (item.cost / total) * 100
-                item.save()
+        if total > 0:
+            # Multiply by a precomputed factor: dividing in SQL would hit
+            # integer division on SQLite for whole-number costs.
+            factor = 100.0 / float(total)
+            self.items.update(
+                weight_pct=ExpressionWrapper(
+                    F("cost") * Value(factor),
+                    output_field=DecimalField(max_digits=8, decimal_places=2),
+                )
+            )
 
 
 class TestItem(models.Model):
@@ -117,28 +117,10 @@ def create_job_from_excel(file_obj: UploadedFile, job_name: Optional[str] = None
     """
     Parse Excel and create TestJob with TestItems
     """
-    from cost_weight.models import TestJob, TestItem
+    from cost_weight.services.job_builder import build_job
     
     # Parse Excel
     parsed = parse_rab_excel(file_obj, job_name)
     
-    # Create Job
-    job = TestJob.objects.create(
-        name=parsed['job_name'],
-        excel_file=file_obj
-    )
-    
-    # Create Items
-    for item_data in parsed['items']:
-        TestItem.objects.create(
-            job=job,
-            name=item_data['name'],
-            quantity=item_data['quantity'],
-            unit_price=item_data['unit_price']
-            # cost will be auto-calculated by model save()
-        )
-    
-    # Calculate totals and weights
-    job.calculate_totals()
-    
-    return job
+    # Create Job and Items in bulk; costs and weights are computed once
+    return build_job(parsed['job_name'], parsed['items'], excel_file=file_obj)
@@ -0,0 +1,90 @@
+"""
+Shared builder for TestJob/TestItem rows created from parsed RAB previews.
+
+Items are written with ``bulk_create`` (no per-item ``save()`` or post_save
+signals), and cost, total and weight percentages are computed once in memory
+before the insert, so building a job costs a handful of queries instead of
+O(n) saves plus O(n) weight recalculations.
+"""
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from django.db import transaction
+
+from cost_weight.models import TestItem, TestJob
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def _to_decimal(value: Any, default: Decimal) -> Decimal:
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError, TypeError):
+        return default
+
+
+def item_fields_from_row(row: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map a preview row to TestItem fields, or None for sections and blank rows."""
+    if row.get("is_section") or row.get("job_match_status") == "skipped":
+        return None
+
+    description = row.get("description", "Unknown Item")
+    if not description or str(description).strip() == "":
+        return None
+
+    quantity = _to_decimal(row.get("volume", 0), Decimal("1"))
+    if quantity <= 0:
+        quantity = Decimal("1")
+
+    unit_price = _to_decimal(row.get("price", 0), Decimal("0"))
+    if unit_price < 0:
+        unit_price = Decimal("0")
+
+    ahsp_code = str(row.get("analysis_code") or "").strip()
+
+    return {
+        "name": description,
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "ahsp_code": ahsp_code or None,
+    }
+
+
+def build_job(
+    name: str,
+    items: Iterable[Mapping[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    **job_fields: Any,
+) -> TestJob:
+    """
+    Create a TestJob and its items in one transaction.
+
+    ``items`` are dicts of TestItem fields. ``cost`` is always recomputed as
+    quantity * unit_price (what ``TestItem.save`` would do), and weight_pct
+    follows ``TestJob.calculate_totals``.
+    """
+    objs: List[TestItem] = []
+    for fields in items:
+        obj = TestItem(**{k: v for k, v in fields.items() if k != "cost"})
+        obj.cost = obj.quantity * obj.unit_price
+        objs.append(obj)
+
+    total = sum((obj.cost for obj in objs), Decimal("0"))
+    if total > 0:
+        for obj in objs:
+            obj.weight_pct = (obj.cost / total) * 100
+
+    with transaction.atomic():
+        job = TestJob.objects.create(name=name, total_cost=total, **job_fields)
+        for obj in objs:
+            obj.job = job
+        TestItem.objects.bulk_create(objs, batch_size=batch_size)
+    return job
+
+
+def build_job_from_rows(rows: Iterable[Mapping[str, Any]], filename: str = "Uploaded File") -> TestJob:
+    """Create the cost-weight TestJob for an uploaded RAB from its preview rows."""
+    items = (fields for fields in map(item_fields_from_row, rows) if fields is not None)
+    return build_job(f"RAB - {filename}", items)
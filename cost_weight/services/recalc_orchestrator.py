@@ -5,6 +5,9 @@ from typing import Dict, Iterable
 
 from django.apps import apps
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, FloatField, Sum, Value
+from django.db.models.functions import Cast, Round
 
 ITEM_MODEL = getattr(settings, "COST_WEIGHT_ITEM_MODEL", "estimator.JobItem")
 JOB_MODEL  = getattr(settings, "COST_WEIGHT_JOB_MODEL",  "estimator.Job")
@@ -18,6 +21,10 @@ ITEM_COST_FALLBACKS = getattr(
     ("total_cost", "cost", "price"),
 )
 
+# Jobs with at least this many items are recalculated in the database.
+SQL_RECALC_MIN_ITEMS = getattr(settings, "COST_WEIGHT_SQL_RECALC_MIN_ITEMS", 500)
+WEIGHT_DECIMAL_PLACES = 1
+
 class _ItemProxy:
     @property
     def objects(self):
@@ -91,8 +98,86 @@ def _items_to_mapping(items: Iterable) -> Dict[str, Decimal]:
         out[str(it.pk)] = dv
     return out
 
+def _concrete_cost_field(ItemModel):
+    for name in (ITEM_COST_FIELD, *ITEM_COST_FALLBACKS):
+        try:
+            field = ItemModel._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if getattr(field, "concrete", False):
+            return name
+    return None
+
+
 def recalc_weights_for_job(job_id) -> int:
     ItemModel = apps.get_model(ITEM_MODEL)
+    cost_field = _concrete_cost_field(ItemModel)
+    if cost_field is not None:
+        stats = (
+            ItemModel.objects
+            .filter(**{f"{ITEM_FK_TO_JOB}_id": job_id})
+            .aggregate(n=Count("pk"), total=Sum(cost_field))
+        )
+        if stats["n"] >= SQL_RECALC_MIN_ITEMS:
+            return recalc_weights_in_db(job_id, cost_field, stats["n"], stats["total"])
+    return _recalc_weights_in_python(job_id)
+
+
+def recalc_weights_in_db(job_id, cost_field: str, count: int, total, decimal_places: int = WEIGHT_DECIMAL_PLACES) -> int:
+    """
+    Set-based variant of the largest-remainder weighting.
+
+    Rounded shares are written with one UPDATE. Python only works out how many
+    ``step`` units are missing from 100%. The items with the largest
+    remainders get them in one more UPDATE. Query count is independent of the
+    number of items.
+    """
+    ItemModel = apps.get_model(ITEM_MODEL)
+    qs = ItemModel.objects.filter(**{f"{ITEM_FK_TO_JOB}_id": job_id})
+    if not count:
+        return 0
+
+    total = Decimal(str(total or "0"))
+    step = Decimal(1).scaleb(-decimal_places)
+    if total == 0:
+        qs.update(**{ITEM_WEIGHT_FIELD: Decimal("0")})
+        return count
+
+    # Float arithmetic keeps SQLite from truncating integral decimals with
+    # integer division; double precision is ample for 0.1% weights.
+    raw = ExpressionWrapper(
+        F(cost_field) * Value(100.0) / Value(float(total)),
+        output_field=FloatField(),
+    )
+    # Two-argument ROUND only accepts numeric on PostgreSQL, so cast first; the
+    # extra scale leaves the actual rounding to ROUND.
+    raw_numeric = Cast(raw, DecimalField(max_digits=20, decimal_places=decimal_places + 6))
+    qs.update(**{ITEM_WEIGHT_FIELD: Round(raw_numeric, decimal_places)})
+
+    rounded_sum = qs.aggregate(s=Sum(ITEM_WEIGHT_FIELD))["s"] or Decimal("0")
+    diff = Decimal("100") - Decimal(str(rounded_sum)).quantize(step, rounding=ROUND_HALF_UP)
+    steps = int((diff / step).to_integral_value())
+    if steps == 0:
+        return count
+
+    sign = 1 if steps > 0 else -1
+    full_rounds, remainder = divmod(abs(steps), count)
+    if full_rounds:
+        qs.update(**{ITEM_WEIGHT_FIELD: F(ITEM_WEIGHT_FIELD) + Value(step * full_rounds * sign)})
+    if remainder:
+        # largest remainder first when adding, smallest when removing
+        order = "-remainder" if sign > 0 else "remainder"
+        pks = list(
+            qs.annotate(remainder=ExpressionWrapper(raw - F(ITEM_WEIGHT_FIELD), output_field=FloatField()))
+            .order_by(order, "pk")
+            .values_list("pk", flat=True)[:remainder]
+        )
+        qs.filter(pk__in=pks).update(**{ITEM_WEIGHT_FIELD: F(ITEM_WEIGHT_FIELD) + Value(step * sign)})
+    return count
+
+
+def _recalc_weights_in_python(job_id) -> int:
+    ItemModel = apps.get_model(ITEM_MODEL)
 
     items = list(
         ItemModel.objects
@@ -0,0 +1,130 @@
+"""
+Coalesced weight recalculation.
+
+Signals call ``schedule_recalc(job_id)`` instead of recalculating inline:
+
+* inside ``coalesce_recalcs()`` job ids are collected and scheduled once when
+  the outermost scope exits;
+* inside a transaction, all ids are recalculated once from a single
+  ``transaction.on_commit`` callback (nothing runs if the transaction rolls
+  back);
+* in autocommit mode ``on_commit`` fires immediately, so behaviour matches the
+  old synchronous recalculation.
+
+Jobs with at least ``COST_WEIGHT_ASYNC_RECALC_MIN_ITEMS`` items are handed to
+the ``recalc_weights_task`` Celery task instead (disabled when unset).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Set
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, router, transaction
+
+from cost_weight.services.recalc_orchestrator import (
+    ITEM_FK_TO_JOB, ITEM_MODEL, recalc_weights_for_job
+)
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def _scopes() -> List[Set]:
+    scopes = getattr(_local, "scopes", None)
+    if scopes is None:
+        scopes = _local.scopes = []
+    return scopes
+
+
+class _PendingRecalc:
+    """on_commit callback holding every job id touched in one transaction."""
+
+    def __init__(self) -> None:
+        self.job_ids: Set = set()
+
+    def __call__(self) -> None:
+        job_ids, self.job_ids = self.job_ids, set()
+        run_recalcs(job_ids)
+
+
+def _db_alias() -> str:
+    try:
+        model = apps.get_model(ITEM_MODEL)
+    except LookupError:
+        return "default"
+    return router.db_for_write(model) or "default"
+
+
+def _pending_for(alias: str) -> Optional[_PendingRecalc]:
+    # A rolled-back transaction discards its callbacks, so only a callback that
+    # is still queued on the connection can accept more job ids.
+    for entry in connections[alias].run_on_commit:
+        if isinstance(entry[1], _PendingRecalc):
+            return entry[1]
+    return None
+
+
+def _enqueue(job_ids: Iterable) -> None:
+    job_ids = set(job_ids)
+    if not job_ids:
+        return
+    alias = _db_alias()
+    if not connections[alias].in_atomic_block:
+        run_recalcs(job_ids)
+        return
+    pending = _pending_for(alias)
+    if pending is None:
+        pending = _PendingRecalc()
+        transaction.on_commit(pending, using=alias)
+    pending.job_ids.update(job_ids)
+
+
+def schedule_recalc(job_id) -> None:
+    """Request a weight recalculation for ``job_id`` (coalesced, see module docs)."""
+    if job_id is None:
+        return
+    scopes = _scopes()
+    if scopes:
+        scopes[-1].add(job_id)
+    else:
+        _enqueue([job_id])
+
+
+@contextmanager
+def coalesce_recalcs() -> Iterator[Set]:
+    """Collect recalculations made in the block and schedule each job once at exit."""
+    scopes = _scopes()
+    scope: Set = set()
+    scopes.append(scope)
+    try:
+        yield scope
+    finally:
+        scopes.pop()
+        if scopes:
+            scopes[-1].update(scope)
+        else:
+            _enqueue(scope)
+
+
+def _should_defer(job_id) -> bool:
+    min_items = getattr(settings, "COST_WEIGHT_ASYNC_RECALC_MIN_ITEMS", None)
+    if not min_items:
+        return False
+    ItemModel = apps.get_model(ITEM_MODEL)
+    count = ItemModel.objects.filter(**{f"{ITEM_FK_TO_JOB}_id": job_id}).count()
+    return count >= min_items
+
+
+def run_recalcs(job_ids: Iterable) -> None:
+    for job_id in job_ids:
+        if _should_defer(job_id):
+            from cost_weight.tasks import recalc_weights_task
+            recalc_weights_task.delay(job_id)
+            logger.debug("Deferred weight recalculation for job %s to Celery", job_id)
+        else:
+            recalc_weights_for_job(job_id)
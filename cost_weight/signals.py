@@ -7,8 +7,9 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from cost_weight.services.recalc_orchestrator import (
-    ITEM_MODEL, JOB_MODEL, ITEM_FK_TO_JOB, recalc_weights_for_job
+    ITEM_MODEL, JOB_MODEL, ITEM_FK_TO_JOB
 )
+from cost_weight.services.recalc_scheduler import schedule_recalc
 
 JOB_FIELDS_THAT_AFFECT_WEIGHTS: Set[str] = set(getattr(
     settings,
@@ -46,7 +47,7 @@ def cw_item_saved(sender, instance, created, update_fields, **kwargs):
         from cost_weight.services.recalc_orchestrator import ITEM_COST_FIELD
         if ITEM_COST_FIELD not in set(update_fields):
             return
-    recalc_weights_for_job(job_id)
+    schedule_recalc(job_id)
 
 
 @receiver(post_delete)
@@ -56,7 +57,7 @@ def cw_item_deleted(sender, instance, **kwargs):
     job_id = _extract_job_id_from_item(instance)
     if job_id is None:
         return
-    recalc_weights_for_job(job_id)
+    schedule_recalc(job_id)
 
 
 @receiver(post_save)
@@ -69,4 +70,4 @@ def cw_job_saved(sender, instance, created, update_fields, **kwargs):
     job_id = getattr(instance, "pk", None)
     if job_id is None:
         return
-    recalc_weights_for_job(job_id)
+    schedule_recalc(job_id)
@@ -0,0 +1,12 @@
+"""
+Celery tasks for cost weight recalculation.
+"""
+from celery import shared_task
+
+from cost_weight.services.recalc_orchestrator import recalc_weights_for_job
+
+
+@shared_task(ignore_result=True)
+def recalc_weights_task(job_id):
+    """Recalculate weight percentages for a (large) job outside the request."""
+    return recalc_weights_for_job(job_id)
@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from cost_weight.models import TestItem, TestJob
+from cost_weight.services.job_builder import build_job, build_job_from_rows, item_fields_from_row
+
+
+class ItemFieldsFromRowTests(TestCase):
+    def test_skips_sections_and_blank_descriptions(self):
+        self.assertIsNone(item_fields_from_row({"is_section": True, "description": "A. PERSIAPAN"}))
+        self.assertIsNone(item_fields_from_row({"job_match_status": "skipped", "description": "x"}))
+        self.assertIsNone(item_fields_from_row({"description": "   "}))
+
+    def test_normalises_quantity_price_and_code(self):
+        fields = item_fields_from_row(
+            {"description": "Galian", "volume": "0", "price": "-5", "analysis_code": " A.1 "}
+        )
+        self.assertEqual(fields["quantity"], Decimal("1"))
+        self.assertEqual(fields["unit_price"], Decimal("0"))
+        self.assertEqual(fields["ahsp_code"], "A.1")
+
+    def test_unparseable_numbers_fall_back_to_defaults(self):
+        fields = item_fields_from_row({"description": "Galian", "volume": "abc", "price": "n/a"})
+        self.assertEqual(fields["quantity"], Decimal("1"))
+        self.assertEqual(fields["unit_price"], Decimal("0"))
+        self.assertIsNone(fields["ahsp_code"])
+
+
+class BuildJobTests(TestCase):
+    def _rows(self, n):
+        rows = [{"is_section": True, "description": "A. PEKERJAAN PERSIAPAN"}]
+        rows += [
+            {"description": f"Item {i}", "volume": "2", "price": str(i * 100), "analysis_code": f"A.{i}"}
+            for i in range(1, n + 1)
+        ]
+        return rows
+
+    def test_builds_job_with_totals_and_weights(self):
+        job = build_job_from_rows(self._rows(3), "rab.xlsx")
+
+        job.refresh_from_db()
+        self.assertEqual(job.name, "RAB - rab.xlsx")
+        self.assertEqual(job.total_cost, Decimal("1200.00"))
+        items = list(job.items.order_by("id"))
+        self.assertEqual([i.cost for i in items], [Decimal("200.00"), Decimal("400.00"), Decimal("600.00")])
+        self.assertEqual([i.weight_pct for i in items], [Decimal("16.67"), Decimal("33.33"), Decimal("50.00")])
+        self.assertEqual(items[0].ahsp_code, "A.1")
+
+    def test_matches_calculate_totals(self):
+        job = build_job_from_rows(self._rows(7), "rab.xlsx")
+        expected = {i.pk: i.weight_pct for i in job.items.all()}
+
+        job.calculate_totals()
+
+        self.assertEqual({i.pk: i.weight_pct for i in job.items.all()}, expected)
+
+    def test_query_count_is_constant(self):
+        # job insert + items bulk insert, inside one transaction (savepoint pair)
+        with self.assertNumQueries(4):
+            build_job_from_rows(self._rows(90), "big.xlsx")
+        self.assertEqual(TestItem.objects.count(), 90)
+
+    def test_empty_rows_create_empty_job(self):
+        job = build_job("Empty", [])
+        self.assertEqual(job.total_cost, Decimal("0"))
+        self.assertFalse(TestJob.objects.get(pk=job.pk).items.exists())
+
+
+class CalculateTotalsTests(TestCase):
+    def test_totals_and_weights_in_constant_queries(self):
+        job = TestJob.objects.create(name="job")
+        TestItem.objects.bulk_create(
+            [TestItem(job=job, name=f"i{i}", cost=Decimal(c)) for i, c in enumerate(["100", "300", "600"] * 700)]
+        )
+
+        # aggregate + job UPDATE + items UPDATE
+        with self.assertNumQueries(3):
+            job.calculate_totals()
+
+        job.refresh_from_db()
+        self.assertEqual(job.total_cost, Decimal("700000.00"))
+        weights = set(job.items.values_list("weight_pct", flat=True))
+        self.assertEqual(weights, {Decimal("0.01"), Decimal("0.04"), Decimal("0.09")})
+
+    def test_matches_exact_decimal_shares(self):
+        job = TestJob.objects.create(name="job")
+        costs = [Decimal("200"), Decimal("400"), Decimal("600.50"), Decimal("0")]
+        TestItem.objects.bulk_create([TestItem(job=job, name="x", cost=c) for c in costs])
+
+        job.calculate_totals()
+
+        total = sum(costs)
+        expected = [(c / total * 100).quantize(Decimal("0.01")) for c in costs]
+        self.assertEqual(list(job.items.order_by("pk").values_list("weight_pct", flat=True)), expected)
+
+    def test_zero_total_leaves_weights_untouched(self):
+        job = TestJob.objects.create(name="job")
+        TestItem.objects.create(job=job, name="free", quantity=Decimal("1"), unit_price=Decimal("0"))
+        with self.assertNumQueries(2):
+            job.calculate_totals()
+        self.assertEqual(job.total_cost, Decimal("0"))
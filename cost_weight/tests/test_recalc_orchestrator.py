@@ -0,0 +1,76 @@
+import random
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from cost_weight.models import TestItem, TestJob
+from cost_weight.services import recalc_orchestrator as orchestrator
+
+
+@patch.object(orchestrator, "ITEM_MODEL", "cost_weight.TestItem")
+@patch.object(orchestrator, "ITEM_COST_FIELD", "cost")
+class RecalcWeightsInDbTests(TestCase):
+    def _job(self, costs):
+        job = TestJob.objects.create(name="job")
+        TestItem.objects.bulk_create(
+            [TestItem(job=job, name=f"i{i}", cost=Decimal(str(c))) for i, c in enumerate(costs)]
+        )
+        return job
+
+    def _weights(self, job):
+        return list(job.items.order_by("pk").values_list("weight_pct", flat=True))
+
+    def test_weights_sum_to_100_and_stay_within_one_step(self):
+        rng = random.Random(7)
+        costs = [rng.randint(1, 1_000_000) for _ in range(600)]
+        job = self._job(costs)
+        total = sum(costs)
+
+        orchestrator.recalc_weights_for_job(job.pk)
+
+        weights = self._weights(job)
+        self.assertEqual(sum(weights), Decimal("100.0"))
+        for cost, weight in zip(costs, weights):
+            raw = Decimal(cost) * 100 / Decimal(total)
+            self.assertLessEqual(abs(weight - raw), Decimal("0.1"))
+
+    def test_residual_goes_to_largest_remainders(self):
+        job = self._job([1, 1, 1])
+
+        orchestrator.recalc_weights_in_db(job.pk, "cost", 3, Decimal("3"))
+
+        self.assertEqual(sorted(self._weights(job)), [Decimal("33.3"), Decimal("33.3"), Decimal("33.4")])
+
+    def test_zero_total_sets_zero_weights(self):
+        job = self._job([0, 0])
+        orchestrator.recalc_weights_in_db(job.pk, "cost", 2, Decimal("0"))
+        self.assertEqual(self._weights(job), [Decimal("0"), Decimal("0")])
+
+    def test_query_count_independent_of_item_count(self):
+        job = self._job([3, 1, 1] * 400)
+        # aggregate, rounded UPDATE, sum, remainder SELECT, residual UPDATE
+        with self.assertNumQueries(5):
+            self.assertEqual(orchestrator.recalc_weights_for_job(job.pk), 1200)
+        self.assertEqual(sum(self._weights(job)), Decimal("100.0"))
+
+    def test_round_is_applied_to_a_numeric_cast(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        job = self._job([1, 2, 7])
+        with CaptureQueriesContext(connection) as ctx:
+            orchestrator.recalc_weights_in_db(job.pk, "cost", 3, Decimal("10"))
+
+        # PostgreSQL has no ROUND(double precision, integer).
+        rounded = [q["sql"] for q in ctx.captured_queries if "ROUND(" in q["sql"]]
+        self.assertEqual(len(rounded), 1)
+        self.assertIn("ROUND(CAST(", rounded[0])
+        self.assertEqual(self._weights(job), [Decimal("10.0"), Decimal("20.0"), Decimal("70.0")])
+
+    def test_small_jobs_use_python_path(self):
+        job = self._job([1, 2, 7])
+        with patch.object(orchestrator, "recalc_weights_in_db") as mock_db:
+            orchestrator.recalc_weights_for_job(job.pk)
+        mock_db.assert_not_called()
+        self.assertEqual(self._weights(job), [Decimal("10.0"), Decimal("20.0"), Decimal("70.0")])
@@ -0,0 +1,88 @@
+from unittest.mock import call, patch
+
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from cost_weight.models import TestItem, TestJob
+from cost_weight.services.recalc_scheduler import coalesce_recalcs, schedule_recalc
+
+@patch("cost_weight.services.recalc_scheduler.recalc_weights_for_job")
+class ScheduleRecalcTests(TestCase):
+    def test_recalcs_are_coalesced_until_commit(self, mock_recalc):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for _ in range(50):
+                schedule_recalc(1)
+            schedule_recalc(2)
+            mock_recalc.assert_not_called()
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertCountEqual(mock_recalc.call_args_list, [call(1), call(2)])
+
+    def test_context_manager_collects_job_ids(self, mock_recalc):
+        with self.captureOnCommitCallbacks(execute=True):
+            with coalesce_recalcs() as scope:
+                schedule_recalc(7)
+                with coalesce_recalcs():
+                    schedule_recalc(7)
+                    schedule_recalc(8)
+                self.assertEqual(scope, {7, 8})
+
+        self.assertCountEqual(mock_recalc.call_args_list, [call(7), call(8)])
+
+    def test_none_job_id_is_ignored(self, mock_recalc):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            schedule_recalc(None)
+        self.assertEqual(callbacks, [])
+
+    @override_settings(COST_WEIGHT_ASYNC_RECALC_MIN_ITEMS=3)
+    @patch("cost_weight.tasks.recalc_weights_task.delay")
+    def test_large_jobs_are_deferred_to_celery(self, mock_delay, mock_recalc):
+        big = TestJob.objects.create(name="big")
+        small = TestJob.objects.create(name="small")
+        TestItem.objects.bulk_create([TestItem(job=big, name=f"i{i}") for i in range(3)])
+        TestItem.objects.create(job=small, name="only")
+
+        with patch("cost_weight.services.recalc_scheduler.ITEM_MODEL", "cost_weight.TestItem"):
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_recalc(big.pk)
+                schedule_recalc(small.pk)
+
+        mock_delay.assert_called_once_with(big.pk)
+        mock_recalc.assert_called_once_with(small.pk)
+
+
+@patch("cost_weight.services.recalc_scheduler.recalc_weights_for_job")
+class ScheduleRecalcTransactionTests(TransactionTestCase):
+    def test_autocommit_recalculates_immediately(self, mock_recalc):
+        schedule_recalc(3)
+        mock_recalc.assert_called_once_with(3)
+
+    def test_rolled_back_transaction_does_not_recalculate(self, mock_recalc):
+        try:
+            with transaction.atomic():
+                schedule_recalc(4)
+                raise RuntimeError("rollback")
+        except RuntimeError:
+            pass
+        mock_recalc.assert_not_called()
+
+        with transaction.atomic():
+            schedule_recalc(4)
+        mock_recalc.assert_called_once_with(4)
+
+
+@patch("cost_weight.services.recalc_scheduler.recalc_weights_for_job")
+class CoalesceMiddlewareTests(TransactionTestCase):
+    def test_request_recalculates_each_job_once(self, mock_recalc):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from cost_weight.middleware import CoalesceWeightRecalcMiddleware
+
+        def view(request):
+            for _ in range(10):
+                schedule_recalc(5)
+            mock_recalc.assert_not_called()
+            return HttpResponse("ok")
+
+        CoalesceWeightRecalcMiddleware(view)(RequestFactory().get("/"))
+        mock_recalc.assert_called_once_with(5)
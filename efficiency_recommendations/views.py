@@ -9,6 +9,7 @@ from efficiency_recommendations.services.price_deviation_detector import (
     detect_price_deviations
 )
 from automatic_job_matching.service.matching_service import MatchingService
+from automatic_price_matching.source_registry import get_price_retriever
 from decimal import Decimal
 
 
@@ -94,21 +95,30 @@ def _get_item_with_reference_price(item):
         return None
 
     try:
-        # Try to find AHSP reference price using MatchingService
-        match_result = MatchingService.perform_best_match(item.name)
-
-        # Extract reference price from match result
+        retriever = get_price_retriever()
         reference_price = None
 
-        if match_result:
+        # Items with a cached AHSP code can be priced without matching
+        if item.ahsp_code and item.ahsp_code.strip():
+            reference_price = retriever.get_price_by_job_code(item.ahsp_code)
+
+        if reference_price is None:
+            # Try to find AHSP reference price using MatchingService
+            match_result = MatchingService.perform_best_match(item.name)
+
             # Handle different response formats
+            first_match = None
             if isinstance(match_result, dict):
-                reference_price = match_result.get('unit_price')
+                first_match = match_result
             elif isinstance(match_result, list) and len(match_result) > 0:
                 # Get first match
-                first_match = match_result[0]
-                if isinstance(first_match, dict):
-                    reference_price = first_match.get('unit_price')
+                if isinstance(match_result[0], dict):
+                    first_match = match_result[0]
+
+            if first_match:
+                reference_price = first_match.get('unit_price')
+                if reference_price is None and first_match.get('code'):
+                    reference_price = retriever.get_price_by_job_code(first_match.get('code'))
 
         # Only add if we found a reference price
         if reference_price and Decimal(str(reference_price)) > 0:
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('excel_parser', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskResultPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.CharField(max_length=255)),
+                ('page', models.PositiveIntegerField()),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('rows', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'rab_task_result_pages',
+                'ordering': ['task_id', 'page'],
+                'indexes': [models.Index(fields=['created_at'], name='rab_task_re_created_2686bb_idx')],
+                'constraints': [models.UniqueConstraint(fields=('task_id', 'page'), name='uniq_task_result_page')],
+            },
+        ),
+    ]
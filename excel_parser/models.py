@@ -57,4 +57,30 @@ class RabEntry(models.Model):
         ordering = ['id']
 
     def __str__(self):
-        return f"({self.get_entry_type_display()}) {self.description[:60]}"
\ No newline at end of file
+        return f"({self.get_entry_type_display()}) {self.description[:60]}"
+
+class TaskResultPage(models.Model):
+    """
+    One page of preview rows produced by an async Excel/PDF parse task.
+
+    Rows live here instead of in the Celery result backend so clients can read
+    finished pages while the rest of the file is still being matched.
+    """
+    task_id = models.CharField(max_length=255)
+    page = models.PositiveIntegerField()
+    row_count = models.PositiveIntegerField(default=0)
+    rows = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "rab_task_result_pages"
+        ordering = ["task_id", "page"]
+        constraints = [
+            models.UniqueConstraint(fields=["task_id", "page"], name="uniq_task_result_page"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} page {self.page}"
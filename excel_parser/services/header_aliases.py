@@ -0,0 +1,72 @@
+"""
+Header recognition shared by the Excel reader and the Excel/PDF header mappers.
+
+Each alias group (canonical name -> spellings) is compiled once, at import, into
+a flat ``normalized alias -> canonical`` dict, so recognising a header cell is a
+single dict lookup instead of rebuilding alias sets for every cell. An optional
+rapidfuzz fallback catches near-misses (typos, stray characters) when enabled.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from rapidfuzz import fuzz, process
+
+
+def simple_normalize(value) -> str:
+    return str(value or "").strip().lower()
+
+
+class HeaderAliasTable:
+    """
+    Flat alias lookup for one set of header alias groups.
+
+    When an alias belongs to several groups the first group wins, matching the
+    order-dependent loops this replaces. ``fuzzy_cutoff`` (0-100) enables a
+    rapidfuzz ``ratio`` fallback for cells with no exact alias.
+    """
+
+    def __init__(
+        self,
+        groups: Mapping[str, Iterable[str]],
+        normalize: Callable[[object], str] = simple_normalize,
+        fuzzy_cutoff: Optional[float] = None,
+    ):
+        self.normalize = normalize
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.canonical: Tuple[str, ...] = tuple(groups)
+        self._lookup: Dict[str, str] = {}
+        for canon, aliases in groups.items():
+            for alias in aliases:
+                key = normalize(alias)
+                if key:
+                    self._lookup.setdefault(key, canon)
+        self._choices: List[str] = list(self._lookup)
+
+    @property
+    def aliases(self) -> List[str]:
+        """Every normalized alias, in group order."""
+        return self._choices
+
+    def lookup_normalized(self, key: str) -> Optional[str]:
+        canon = self._lookup.get(key)
+        if canon is None and self.fuzzy_cutoff is not None and key:
+            best = process.extractOne(key, self._choices, scorer=fuzz.ratio, score_cutoff=self.fuzzy_cutoff)
+            if best is not None:
+                canon = self._lookup[best[0]]
+        return canon
+
+    def lookup(self, cell) -> Optional[str]:
+        """Canonical header name for ``cell``, or None."""
+        if cell is None:
+            return None
+        return self.lookup_normalized(self.normalize(cell))
+
+    def map_row(self, row: Iterable) -> Dict[str, int]:
+        """``{canonical: first column index}`` for the recognised cells of ``row``."""
+        seen: Dict[str, int] = {}
+        for idx, cell in enumerate(row):
+            canon = self.lookup(cell)
+            if canon is not None and canon not in seen:
+                seen[canon] = idx
+        return seen
@@ -2,6 +2,8 @@ import re, unicodedata
 from typing import Dict, List, Tuple
 import logging
 
+from .header_aliases import HeaderAliasTable
+
 logger = logging.getLogger("excel_parser")  
 
 def _normalize(s: str) -> str:
@@ -24,16 +26,12 @@ HEADER_SYNONYMS = {
 }
 REQUIRED = ['no','uraian','satuan','volume']
 
+_HEADER_TABLE = HeaderAliasTable(HEADER_SYNONYMS, normalize=_normalize)
+
 def map_headers(header_row: List[str]) -> Tuple[Dict[str,int], List[str], Dict[str,str]]:
-    normed = [_normalize(h) for h in header_row]
-    mapping, originals = {}, {}
-    for canon, variants in HEADER_SYNONYMS.items():
-        vset = {_normalize(v) for v in variants}
-        for idx, h in enumerate(normed):
-            if h in vset:
-                mapping[canon] = idx
-                originals[canon] = header_row[idx]
-                break
+    found = _HEADER_TABLE.map_row(header_row)
+    mapping = {canon: found[canon] for canon in _HEADER_TABLE.canonical if canon in found}
+    originals = {canon: header_row[idx] for canon, idx in mapping.items()}
 
     missing = [k for k in REQUIRED if k not in mapping]
 
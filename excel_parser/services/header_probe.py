@@ -0,0 +1,82 @@
+"""
+Early-exit header probing, with results cached by file digest.
+
+``detect_headers`` streams rows only until one satisfies the header mapping,
+then remembers where the header is (keyed by the SHA-256 of the upload) so a
+later ``preview_rows`` of the same file can skip header detection.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.core.cache import cache
+
+PROBE_MAX_ROWS = 200
+PROBE_CACHE_TIMEOUT = 60 * 60
+_CACHE_PREFIX = "excel_parser:header_probe:"
+_DIGEST_BLOCK = 1024 * 1024
+
+HeaderMatch = Tuple[Dict[str, int], List[str], Dict[str, str]]
+
+
+def file_digest(file) -> str:
+    """SHA-256 hex digest of an upload or open binary file; the read position is kept."""
+    pos = file.tell()
+    file.seek(0)
+    digest = hashlib.sha256()
+    try:
+        chunks = file.chunks() if hasattr(file, "chunks") else iter(lambda: file.read(_DIGEST_BLOCK), b"")
+        for chunk in chunks:
+            digest.update(chunk)
+    finally:
+        file.seek(pos)
+    return digest.hexdigest()
+
+
+def probe_header_row(
+    rows: Iterable[Iterable[Any]],
+    map_headers: Callable[[List[str]], HeaderMatch],
+    max_rows: int = PROBE_MAX_ROWS,
+) -> Optional[Tuple[int, List[Any], HeaderMatch]]:
+    """
+    Return ``(index, row, map_headers(row))`` for the header row, or None if
+    there are no rows.
+
+    Stops at the first row with no missing required headers; if none qualifies
+    within ``max_rows`` rows, falls back to the row with the most mapped headers
+    (the first row when nothing maps at all).
+    """
+    best = None
+    best_hits = -1
+    for index, row in enumerate(rows):
+        if index >= max_rows:
+            break
+        row = list(row)
+        result = map_headers([str(c or '') for c in row])
+        mapping, missing, _ = result
+        if mapping and not missing:
+            return index, row, result
+        if len(mapping) > best_hits:
+            best, best_hits = (index, row, result), len(mapping)
+    return best
+
+
+def record_rows(rows: Iterable[Iterable[Any]], seen: List[List[Any]]) -> Iterator[List[Any]]:
+    """Yield ``rows`` as lists, appending each one to ``seen`` as it is read."""
+    for row in rows:
+        row = list(row)
+        seen.append(row)
+        yield row
+
+
+def remember_header(digest: str, header_index: int, colmap: Dict[str, int]) -> None:
+    cache.set(_CACHE_PREFIX + digest, {"header_index": header_index, "colmap": dict(colmap)}, PROBE_CACHE_TIMEOUT)
+
+
+def cached_header(digest: str) -> Optional[Tuple[int, Dict[str, int]]]:
+    """``(header_index, colmap)`` remembered for ``digest``, or None."""
+    entry = cache.get(_CACHE_PREFIX + digest)
+    if not entry:
+        return None
+    return entry["header_index"], dict(entry["colmap"])
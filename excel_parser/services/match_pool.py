@@ -0,0 +1,147 @@
+"""
+Parallel job matching for preview rows.
+
+Descriptions are deduplicated and each unique one is matched once on a bounded
+worker pool; callers look results up by description, so row order is whatever
+order they iterate their rows in.
+
+Settings (read at call time):
+
+* ``EXCEL_MATCH_WORKERS`` - pool size, defaults to ``DEFAULT_WORKERS`` (kept
+  small: every thread holds a DB connection, and concurrent uploads each get
+  their own pool); ``1`` matches inline without a pool.
+* ``EXCEL_MATCH_EXECUTOR`` - ``"thread"`` (default; translation and DB lookups
+  release the GIL and share the in-process match cache) or ``"process"`` (for
+  CPU-bound fuzzy scoring; workers are spawned and set Django up themselves).
+* ``EXCEL_MATCH_TIMEOUT`` - seconds to wait for a single description before it
+  is reported as a timed-out error row (``None`` waits indefinitely).
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+from .cache import cache_match_description
+
+logger = logging.getLogger("excel_parser")
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_WORKERS = 4
+_UNSET = object()
+
+TIMEOUT_RESULT = {"status": "error", "match": None, "error": "Matching timed out"}
+
+
+def _error_result(message: str) -> dict:
+    return {"status": "error", "match": None, "error": message}
+
+
+def _drain_in_thread(work: "queue.SimpleQueue[Tuple[Optional[str], Future]]") -> None:
+    """Match queued descriptions until none are left, then close this thread's DB connections once."""
+    try:
+        while True:
+            try:
+                description, future = work.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(cache_match_description(description))
+            except BaseException as exc:
+                future.set_exception(exc)
+    finally:
+        # Pool threads open their own DB connections; don't leak them.
+        connections.close_all()
+
+
+def _submit_to_threads(pool: Executor, descriptions: List[Optional[str]], workers: int) -> Dict[Optional[str], Future]:
+    work: "queue.SimpleQueue[Tuple[Optional[str], Future]]" = queue.SimpleQueue()
+    futures: Dict[Optional[str], Future] = {}
+    for desc in descriptions:
+        futures[desc] = Future()
+        work.put((desc, futures[desc]))
+    for _ in range(workers):
+        pool.submit(_drain_in_thread, work)
+    return futures
+
+
+def _init_process_worker() -> None:
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _match_in_process(description: str) -> dict:
+    from .job_matcher import match_description
+
+    return match_description(description)
+
+
+def _match_inline(description: str) -> dict:
+    try:
+        return cache_match_description(description)
+    except Exception as exc:
+        logger.exception("Matching failed for description=%r", description)
+        return _error_result(str(exc))
+
+
+def _make_executor(kind: str, workers: int) -> Executor:
+    if kind == "process":
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process_worker,
+        )
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="excel-match")
+
+
+def match_descriptions(
+    descriptions: Iterable[Optional[str]],
+    workers: Optional[int] = None,
+    executor: Optional[str] = None,
+    timeout: Optional[float] = _UNSET,
+) -> Dict[Optional[str], dict]:
+    """Return ``{description: match_info}`` with each distinct description matched once."""
+    unique = list(dict.fromkeys(descriptions))
+    if workers is None:
+        workers = getattr(settings, "EXCEL_MATCH_WORKERS", None) or DEFAULT_WORKERS
+    kind = executor or getattr(settings, "EXCEL_MATCH_EXECUTOR", "thread")
+    if timeout is _UNSET:
+        timeout = getattr(settings, "EXCEL_MATCH_TIMEOUT", DEFAULT_TIMEOUT)
+
+    workers = min(workers, len(unique))
+    if workers <= 1:
+        return {desc: _match_inline(desc) for desc in unique}
+
+    logger.debug("Matching %d unique descriptions on %d %s workers", len(unique), workers, kind)
+    pool = _make_executor(kind, workers)
+    results: Dict[Optional[str], dict] = {}
+    try:
+        if kind == "process":
+            futures = {desc: pool.submit(_match_in_process, desc) for desc in unique}
+        else:
+            futures = _submit_to_threads(pool, unique, workers)
+        for desc, future in futures.items():
+            try:
+                results[desc] = future.result(timeout=timeout)
+            except FutureTimeoutError:
+                logger.warning("Matching timed out after %ss for description=%r", timeout, desc)
+                future.cancel()
+                results[desc] = dict(TIMEOUT_RESULT)
+            except Exception as exc:
+                logger.exception("Matching failed for description=%r", desc)
+                results[desc] = _error_result(str(exc))
+    finally:
+        # Don't let one stuck description hold the response hostage.
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
@@ -0,0 +1,133 @@
+"""
+Content-addressed cache of parsed and matched upload rows.
+
+Entries are keyed by the SHA-256 of the uploaded bytes plus ``PARSER_VERSION``
+and the AHSP catalog version, so re-uploading an unchanged RAB returns its rows
+straight from the cache while a parser change or catalog reload invalidates
+them. Rows are pickled and zlib-compressed before they reach the cache backend.
+
+Settings:
+
+* ``PARSE_CACHE_ENABLED`` - turn the cache off entirely (off in tests).
+* ``PARSE_CACHE_TIMEOUT`` - entry lifetime in seconds.
+* ``PARSE_CACHE_CATALOG_VERSION`` - pin the catalog version instead of
+  fingerprinting the ``ahs`` table.
+"""
+from __future__ import annotations
+
+import logging
+import pickle
+import time
+import zlib
+from typing import Any, Callable, Dict, List, MutableMapping, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+
+from .header_probe import file_digest
+
+logger = logging.getLogger("excel_parser")
+
+# Bump whenever parsed/matched row output changes shape or meaning.
+PARSER_VERSION = "1"
+
+DEFAULT_TIMEOUT = 24 * 60 * 60
+CATALOG_VERSION_TTL = 60
+_CACHE_PREFIX = "excel_parser:parse_cache:"
+
+_catalog_version: Dict[str, Any] = {"value": None, "expires": 0.0}
+
+Rows = List[Dict[str, Any]]
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "PARSE_CACHE_ENABLED", True)
+
+
+def catalog_version() -> str:
+    """Fingerprint of the AHSP catalog (count, max id, price sum), memoized briefly."""
+    pinned = getattr(settings, "PARSE_CACHE_CATALOG_VERSION", None)
+    if pinned:
+        return str(pinned)
+    now = time.monotonic()
+    if _catalog_version["value"] is not None and now < _catalog_version["expires"]:
+        return _catalog_version["value"]
+    try:
+        from rencanakan_core.models import Ahs
+
+        stats = Ahs.objects.aggregate(n=Count("id"), last=Max("id"), prices=Sum("unit_price"))
+        value = f"{stats['n']}-{stats['last']}-{stats['prices']}"
+    except Exception:
+        logger.warning("Could not fingerprint the AHSP catalog for the parse cache", exc_info=True)
+        value = "unknown"
+    _catalog_version.update(value=value, expires=now + CATALOG_VERSION_TTL)
+    return value
+
+
+def source_digest(source) -> str:
+    """SHA-256 of an upload, open binary file or file path."""
+    if isinstance(source, str):
+        with open(source, "rb") as fh:
+            return file_digest(fh)
+    return file_digest(source)
+
+
+def cache_key(kind: str, digest: str) -> str:
+    return f"{_CACHE_PREFIX}{kind}:{PARSER_VERSION}:{catalog_version()}:{digest}"
+
+
+def load(kind: str, digest: str) -> Optional[Rows]:
+    blob = cache.get(cache_key(kind, digest))
+    if blob is None:
+        return None
+    return pickle.loads(zlib.decompress(blob))
+
+
+def store(kind: str, digest: str, rows: Rows) -> None:
+    blob = zlib.compress(pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL))
+    cache.set(cache_key(kind, digest), blob, getattr(settings, "PARSE_CACHE_TIMEOUT", DEFAULT_TIMEOUT))
+
+
+def cached_parse(kind: str, source, parse: Callable[[Any], Rows]) -> Rows:
+    """Return ``parse(source)``, served from the cache when the same bytes were parsed before."""
+    if not is_enabled():
+        return parse(source)
+    digest = source_digest(source)
+    rows = load(kind, digest)
+    if rows is not None:
+        logger.info("Parse cache hit kind=%s digest=%s rows=%d", kind, digest[:12], len(rows))
+        return rows
+    rows = parse(source)
+    store(kind, digest, rows)
+    return rows
+
+
+def cached_preview(file, parse: Callable[..., Rows], previous: Optional[MutableMapping[str, str]] = None) -> Rows:
+    """
+    Excel preview through the parse cache, with row-level diffing on a miss.
+
+    ``previous`` maps upload names to the digest of their last preview (kept in
+    the session by the view). When a re-upload misses the cache, the rows of
+    that earlier upload are passed to ``parse`` as ``previous_rows`` so only
+    rows whose description or unit changed are matched again. ``previous`` is
+    updated with this upload's digest, which is also handed to ``parse`` so
+    the file is hashed only once.
+    """
+    if not is_enabled():
+        return parse(file)
+    digest = source_digest(file)
+    rows = load("excel", digest)
+    if rows is None:
+        earlier = previous.get(file.name) if previous is not None else None
+        previous_rows = load("excel", earlier) if earlier and earlier != digest else None
+        if previous_rows:
+            rows = parse(file, previous_rows=previous_rows, digest=digest)
+        else:
+            rows = parse(file, digest=digest)
+        store("excel", digest, rows)
+    else:
+        logger.info("Parse cache hit kind=excel digest=%s rows=%d", digest[:12], len(rows))
+    if previous is not None:
+        previous[file.name] = digest
+    return rows
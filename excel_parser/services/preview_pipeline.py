@@ -0,0 +1,52 @@
+"""Parse each uploaded workbook once, concurrently when several are uploaded together."""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from django.db import connections
+
+from .reader import preview_file
+
+logger = logging.getLogger("excel_parser")
+
+PreviewRows = List[Dict[str, Any]]
+
+
+class PreviewPipeline:
+    """Collect uploaded files under response keys and parse every file exactly once.
+
+    ``parse`` defaults to :func:`preview_file`; views pass their own reference
+    so it can be patched in tests.
+    """
+
+    def __init__(self, parse: Callable[[Any], PreviewRows] = preview_file, max_workers: int = 2):
+        self.parse = parse
+        self.max_workers = max_workers
+        self._files: Dict[str, Any] = {}
+
+    def add(self, key: str, file) -> None:
+        self._files[key] = file
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def _parse_in_thread(self, file) -> PreviewRows:
+        try:
+            return self.parse(file)
+        finally:
+            # Worker threads get their own DB connections; don't leak them.
+            connections.close_all()
+
+    def run(self) -> Dict[str, PreviewRows]:
+        """Return ``{key: rows}`` in insertion order; parse errors propagate."""
+        if len(self._files) <= 1 or self.max_workers <= 1:
+            return {key: self.parse(file) for key, file in self._files.items()}
+
+        workers = min(self.max_workers, len(self._files))
+        logger.debug("Parsing %d uploads with %d workers", len(self._files), workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="excel-preview") as pool:
+            futures = {key: pool.submit(self._parse_in_thread, file) for key, file in self._files.items()}
+            return {key: future.result() for key, future in futures.items()}
@@ -0,0 +1,63 @@
+"""Preview stage that attaches AHSP unit prices to matched rows in one bulk pass."""
+
+from __future__ import annotations
+
+import logging
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, List, Optional
+
+from automatic_price_matching.price_retrieval import AhspPriceRetriever
+
+logger = logging.getLogger("excel_parser")
+
+
+def _row_matches(row: Dict[str, Any]) -> List[Dict[str, Any]]:
+    match = row.get("job_match")
+    if isinstance(match, dict):
+        return [match]
+    if isinstance(match, list):
+        return [m for m in match if isinstance(m, dict)]
+    return []
+
+
+def _format_price(price: Decimal) -> str:
+    return str(price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def attach_unit_prices(
+    rows: Iterable[Dict[str, Any]],
+    retriever: Optional[AhspPriceRetriever] = None,
+) -> None:
+    """Set ``unit_price`` on every coded job match, resolving each distinct code once.
+
+    Match dicts are replaced with copies because they may come straight from
+    the ``cache_match_description`` LRU cache.
+    """
+    rows = [row for row in rows if not row.get("is_section")]
+    codes = set()
+    for row in rows:
+        match = row.get("job_match")
+        if isinstance(match, dict):
+            row["job_match"] = dict(match)
+        elif isinstance(match, list):
+            row["job_match"] = [dict(m) if isinstance(m, dict) else m for m in match]
+        codes.update(m["code"] for m in _row_matches(row) if m.get("code"))
+    if not codes:
+        return
+
+    if retriever is None:
+        from automatic_price_matching.source_registry import get_price_retriever
+        retriever = get_price_retriever()
+
+    try:
+        prices = retriever.get_prices_by_job_codes(codes)
+    except Exception:
+        logger.exception("Bulk price resolution failed for %d codes", len(codes))
+        return
+    logger.debug("Resolved %d/%d preview codes to AHSP prices", len(prices), len(codes))
+
+    for row in rows:
+        for match in _row_matches(row):
+            price = prices.get(match.get("code"))
+            if price is not None:
+                match["unit_price"] = _format_price(price)
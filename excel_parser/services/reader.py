@@ -1,15 +1,24 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from decimal import Decimal, InvalidOperation
+from decimal import ROUND_HALF_UP, Decimal
 import hashlib
+import io
+import itertools
 import re
-from typing import List, Dict, Iterable, Tuple, Optional
+from typing import List, Dict, Iterable, Iterator, Tuple, Optional
 import string
 
 from django.core.files.uploadedfile import UploadedFile
+from django.db import models, transaction
 from excel_parser.models import Project, RabEntry
 from .job_matcher import match_description
+from .header_aliases import HeaderAliasTable
+from .header_probe import cached_header, file_digest, remember_header
+from .match_pool import match_descriptions
+from .row_batch import PreviewRowBatch
+from .pricing import attach_unit_prices
 from excel_parser.services.cache import cache_parse_decimal
+from automatic_price_matching.numeric import parse_decimal as parse_number
 
 import logging
 logger = logging.getLogger("excel_parser")
@@ -33,8 +42,7 @@ HEADER_ALIASES = {
 def _norm(s) -> str:
     return str(s or "").strip().lower()
 
-_THOUSAND_DOT_DECIMAL_COMMA = re.compile(r"^\d{1,3}(\.\d{3})+,\d+$")
-_THOUSAND_COMMA_DECIMAL_DOT = re.compile(r"^\d{1,3}(,\d{3})+\.\d+$")
+_HEADER_TABLE = HeaderAliasTable(HEADER_ALIASES, normalize=_norm)
 
 def classify_index_token(token: str) -> str:
     """Classify a No. cell into 'letter' | 'roman' | 'numeric' | 'none'."""
@@ -55,33 +63,7 @@ def classify_index_token(token: str) -> str:
     return "none"
 
 def parse_decimal(val) -> Decimal:
-    if val is None or str(val).strip() == "":
-        return Decimal("0")
-    if isinstance(val, (int, float, Decimal)):
-        return Decimal(str(val))
-
-    s = str(val).strip()
-    if not any(ch.isdigit() for ch in s):
-        return Decimal("0")
-    if "=" in s or re.search(r"\d+\s*[xX]\s*\d+", s):
-        return Decimal("0")
-    if _THOUSAND_DOT_DECIMAL_COMMA.match(s):
-        s = s.replace(".", "").replace(",", ".")
-    elif _THOUSAND_COMMA_DECIMAL_DOT.match(s):
-        s = s.replace(",", "")
-    else:
-        if "," in s and "." not in s:
-            s = s.replace(",", ".")
-        elif "," in s and "." in s:
-            if s.rfind(",") > s.rfind("."):
-                s = s.replace(".", "").replace(",", ".")
-            else:
-                s = s.replace(",", "")
-    s = re.sub(r"[^\d.-]", "", s)
-    try:
-        return Decimal(s)
-    except InvalidOperation:
-        return Decimal("0")
+    return parse_number(val)
 
 class _BaseReader:
     def iter_rows(self, file: UploadedFile) -> Iterable[List]:
@@ -93,21 +75,43 @@ class _XLSXReader(_BaseReader):
         pos = file.tell()
         file.seek(0)
         wb = load_workbook(filename=file, data_only=True, read_only=True)
-        ws = wb.worksheets[0]
-        for row in ws.iter_rows(values_only=True):
-            yield list(row)
-        file.seek(pos)
+        try:
+            ws = wb.worksheets[0]
+            for row in ws.iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            wb.close()
+            file.seek(pos)
+
+def _disk_path(file) -> Optional[str]:
+    """Path of an upload that already lives on disk (temp upload or opened file), else None."""
+    temporary_file_path = getattr(file, "temporary_file_path", None)
+    if callable(temporary_file_path):
+        return temporary_file_path()
+    if isinstance(file, (io.BufferedReader, io.FileIO)) and isinstance(file.name, str):
+        return file.name
+    return None
 
 class _XLSReader(_BaseReader):
+    """Legacy .xls reader: mmaps on-disk uploads and loads only the first sheet."""
+
     def iter_rows(self, file: UploadedFile) -> Iterable[List]:
         import xlrd
         pos = file.tell()
-        data = file.read()
-        wb = xlrd.open_workbook(file_contents=data)
-        sh = wb.sheet_by_index(0)
-        for r in range(sh.nrows):
-            yield [sh.cell_value(r, c) for c in range(sh.ncols)]
-        file.seek(pos)
+        path = _disk_path(file)
+        if path:
+            # xlrd mmaps the file itself instead of reading it into memory.
+            wb = xlrd.open_workbook(filename=path, on_demand=True)
+        else:
+            file.seek(0)
+            wb = xlrd.open_workbook(file_contents=file.read(), on_demand=True)
+        try:
+            sh = wb.sheet_by_index(0)
+            for r in range(sh.nrows):
+                yield sh.row_values(r)
+        finally:
+            wb.release_resources()
+            file.seek(pos)
 
 def _ext_of(file: UploadedFile) -> str:
     name = (file.name or "").lower()
@@ -125,7 +129,7 @@ def make_reader(file: UploadedFile) -> _BaseReader:
         return _XLSReader()
     raise UnsupportedFileError("Only .xls and .xlsx are supported")
 
-@dataclass
+@dataclass(slots=True)
 class ParsedRow:
     number: str
     description: str
@@ -140,39 +144,35 @@ class ParsedRow:
     section_roman: str | None = None
     section_type: str | None = None  # NEW
 
-def _find_header_map(rows: Iterable[List]) -> Tuple[Dict[str, int], int]:
-    cache = list(rows)
-    limit = min(len(cache), 50)
-    for i in range(limit):
-        row = cache[i]
-        seen = {}
-        for idx, cell in enumerate(row):
-            if cell is None:
-                continue
-            normed = _norm(cell)
-            canon = None
-            for key, aliases in HEADER_ALIASES.items():
-                if normed in {a.lower().strip() for a in aliases}:
-                    canon = key
-                    break
-            if canon and canon not in seen:
-                seen[canon] = idx
-        if {"number", "description", "unit"} <= set(seen.keys()):
-            return seen, i
+HEADER_LOOKAHEAD = 50
+_REQUIRED_HEADERS = {"number", "description", "unit"}
+
+def _header_columns(row: List) -> Dict[str, int]:
+    return _HEADER_TABLE.map_row(row)
+
+def _split_header(rows: Iterable[List]) -> Tuple[Dict[str, int], int, Iterator[List]]:
+    """Find the header in the first HEADER_LOOKAHEAD rows without buffering the sheet.
+
+    Returns (colmap, header_index, body) where ``body`` is the same iterator,
+    positioned on the first row after the header.
+    """
+    it = iter(rows)
+    for i, row in enumerate(itertools.islice(it, HEADER_LOOKAHEAD)):
+        seen = _header_columns(row)
+        if _REQUIRED_HEADERS <= set(seen.keys()):
+            return seen, i, it
     raise ParseError("Required headers not found (need at least No, Uraian Pekerjaan, and Satuan)")
 
+def _find_header_map(rows: Iterable[List]) -> Tuple[Dict[str, int], int]:
+    colmap, header_row, _ = _split_header(rows)
+    return colmap, header_row
+
 def _rows_after(cache: List[List], start_idx: int) -> Iterable[List]:
     for r in range(start_idx + 1, len(cache)):
         yield cache[r]
 def _match_header(cell: str) -> Tuple[str | None, str]:
     """Return (canonical_key, raw) or (None, raw)."""
-    key = None
-    n = _norm(cell)
-    for canon, aliases in HEADER_ALIASES.items():
-        if n in {a.lower().strip() for a in aliases}:
-            key = canon
-            break
-    return key, cell
+    return _HEADER_TABLE.lookup(cell), cell
 
 
 def _is_section_row(number: str, desc: str) -> bool:
@@ -187,11 +187,14 @@ def _is_section_row(number: str, desc: str) -> bool:
     return False
 
 def _parse_rows(cache: List[List], colmap: Dict[str, int]) -> List[ParsedRow]:
-    out: List[ParsedRow] = []
+    return list(_iter_parsed_rows(_rows_after(cache, start_idx=colmap["_header_row"]), colmap))
+
+def _iter_parsed_rows(body: Iterable[List], colmap: Dict[str, int]) -> Iterator[ParsedRow]:
+    """Parse and classify body rows lazily, one sheet row at a time."""
     current_letter: str | None = None
     current_roman: str | None = None
 
-    for idx, row in enumerate(_rows_after(cache, start_idx=colmap["_header_row"])):
+    for row in body:
         def cell(col):
             i = colmap.get(col)
             return row[i] if i is not None and i < len(row) else None
@@ -236,21 +239,73 @@ def _parse_rows(cache: List[List], colmap: Dict[str, int]) -> List[ParsedRow]:
             section_roman=current_roman,
             section_type="CATEGORY" if index_kind == "letter" else ("SECTION" if index_kind == "roman" else None)
         )
-        out.append(parsed_row)
-    return out
+        yield parsed_row
+
+def stream_file(file: UploadedFile, digest: Optional[str] = None) -> Tuple[Dict[str, int], Iterator[ParsedRow]]:
+    """Detect the header eagerly, then return a lazy iterator of parsed rows.
+
+    Only the row being parsed is held in memory, so very large sheets do not
+    have to be materialised before parsing starts. ``digest`` is the SHA-256
+    the caller already has for ``file`` (the parse cache computes one); when
+    given, a header remembered by ``detect_headers`` is reused.
+    """
+    reader = make_reader(file)
+    rows = reader.iter_rows(file)
+    cached = cached_header(digest) if digest else None
+    if cached and cached[0] < HEADER_LOOKAHEAD:
+        # detect_headers already probed this exact file.
+        header_row, colmap = cached
+        body = itertools.islice(rows, header_row + 1, None)
+    else:
+        colmap, header_row, body = _split_header(rows)
+    colmap["_header_row"] = header_row
+    return colmap, _iter_parsed_rows(body, colmap)
+
+def remember_header_row(file, rows: List[List]) -> None:
+    """Cache the header :func:`stream_file` would find among the already-read ``rows`` of ``file``.
+
+    Nothing is cached (and ``file`` is not hashed) unless the header lies
+    within ``rows``.
+    """
+    try:
+        colmap, header_index, _ = _split_header(rows)
+    except ParseError:
+        return
+    remember_header(file_digest(file), header_index, colmap)
 
 class ExcelImporter:
+    """Import the first sheet of an RAB workbook into ``RabEntry`` rows.
+
+    With ``bulk=True`` (the default) rows are validated one by one, so a bad
+    row is skipped and logged as before, and valid rows are written with
+    ``bulk_create`` in batches of ``batch_size`` inside a single transaction.
+    """
+
+    def __init__(self, bulk: bool = True, batch_size: int = 500):
+        self.bulk = bulk
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _build_entry(project: Project, p: ParsedRow, idx: int) -> RabEntry:
+        return RabEntry(
+            project=project,
+            entry_type=RabEntry.EntryType.SECTION if p.is_section else RabEntry.EntryType.ITEM,
+            item_number=p.number,
+            description=p.description,
+            volume=p.volume,
+            unit=p.unit,
+            analysis_code=p.analysis_code,
+            unit_price=p.price,
+            total_price=p.total_price,
+            row_index=idx,
+        )
+
     def import_file(self, file: UploadedFile) -> int:
         logger.info("Starting import: file=%s", getattr(file, "name", "?"))
 
-        reader = make_reader(file)
-        cache = list(reader.iter_rows(file))
-        logger.debug("Read %d rows from file=%s", len(cache), getattr(file, "name", "?"))
-
-        colmap, header_row = _find_header_map(cache)
+        colmap, parsed = stream_file(file)
         logger.debug("Header row detected at index=%d, mapped columns=%s",
-                     header_row, list(colmap.keys()))
-        colmap["_header_row"] = header_row
+                     colmap["_header_row"], list(colmap.keys()))
 
         project, created = Project.objects.get_or_create(
             program="Default Program",
@@ -263,93 +318,175 @@ class ExcelImporter:
         if created:
             logger.info("Created new default Project id=%s for source=%s", project.id, file.name)
 
-        parsed = _parse_rows(cache, colmap)
-        logger.info("Parsed %d rows from %s", len(parsed), file.name)
+        if self.bulk:
+            parsed_count, count = self._insert_bulk(project, parsed, file.name)
+        else:
+            parsed_count, count = self._insert_per_row(project, parsed, file.name)
 
+        logger.info("Import finished: parsed=%d inserted=%d rows from %s", parsed_count, count, file.name)
+        return count
+
+    def _insert_per_row(self, project: Project, parsed: Iterable[ParsedRow], filename: str) -> Tuple[int, int]:
         count = 0
+        idx = 0
         for idx, p in enumerate(parsed, start=1):
             try:
-                RabEntry.objects.create(
-                    project=project,
-                    entry_type=RabEntry.EntryType.SECTION if p.is_section else RabEntry.EntryType.ITEM,
-                    item_number=p.number,
-                    description=p.description,
-                    volume=p.volume,
-                    unit=p.unit,
-                    analysis_code=p.analysis_code,
-                    unit_price=p.price,
-                    total_price=p.total_price,
-                    row_index=idx,
-                )
+                self._build_entry(project, p, idx).save()
                 count += 1
             except Exception:
-                logger.exception("Failed to insert row %d into DB (file=%s)", idx, file.name)
-
-        logger.info("Import finished: inserted=%d rows from %s", count, file.name)
-        return count
-
+                logger.exception("Failed to insert row %d into DB (file=%s)", idx, filename)
+        return idx, count
+
+    @staticmethod
+    def _quantize_decimals(entry: RabEntry) -> None:
+        """
+        Round DecimalFields to their column's decimal places, as ``save()`` does,
+        so ``full_clean`` only rejects values that are genuinely too large.
+        """
+        for field in entry._meta.concrete_fields:
+            if not isinstance(field, models.DecimalField):
+                continue
+            value = getattr(entry, field.attname)
+            if isinstance(value, Decimal) and value.is_finite():
+                exponent = Decimal(1).scaleb(-field.decimal_places)
+                setattr(entry, field.attname, value.quantize(exponent, rounding=ROUND_HALF_UP))
 
-def preview_file(file: UploadedFile):
+    def _insert_bulk(self, project: Project, parsed: Iterable[ParsedRow], filename: str) -> Tuple[int, int]:
+        count = 0
+        idx = 0
+        batch: List[RabEntry] = []
+        with transaction.atomic():
+            for idx, p in enumerate(parsed, start=1):
+                entry = self._build_entry(project, p, idx)
+                self._quantize_decimals(entry)
+                try:
+                    # project/parent are skipped: validating FKs would cost a query per row.
+                    entry.full_clean(exclude=["project", "parent"])
+                except Exception:
+                    logger.exception("Skipping invalid row %d (file=%s)", idx, filename)
+                    continue
+                batch.append(entry)
+                if len(batch) >= self.batch_size:
+                    RabEntry.objects.bulk_create(batch, batch_size=self.batch_size)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                RabEntry.objects.bulk_create(batch, batch_size=self.batch_size)
+                count += len(batch)
+        return idx, count
+
+
+def preview_file(file: UploadedFile, previous_rows: Optional[List[Dict]] = None, digest: Optional[str] = None):
+    """
+    Parse, match and price ``file`` into preview dicts.
+
+    ``previous_rows`` (an earlier preview of the same RAB) enables diff mode:
+    rows whose description and unit are unchanged reuse their earlier match.
+    ``digest`` is passed through to :func:`stream_file`.
+    """
     logger.info("Previewing file=%s", getattr(file, "name", "?"))
 
-    reader = make_reader(file)
-    cache = list(reader.iter_rows(file))
-    logger.debug("Read %d rows during preview for file=%s", len(cache), getattr(file, "name", "?"))
+    batch = parse_preview_batch(file, digest)
+    if previous_rows:
+        reused = reuse_previous_matches(batch, previous_rows)
+        logger.info("Diff preview reused %d matches, re-matching %d rows", reused, len(batch.pending_indices()))
+    match_preview_batch(batch)
+    preview_rows = batch.to_dicts()
+
+    logger.info("Preview parsed %d rows from %s", len(preview_rows), file.name)
+    attach_unit_prices(preview_rows)
+    return preview_rows
 
-    colmap, header_row = _find_header_map(cache)
-    logger.debug("Preview header row index=%d, columns=%s", header_row, list(colmap.keys()))
-    colmap["_header_row"] = header_row
 
-    parsed = _parse_rows(cache, colmap)
-    logger.info("Preview parsed %d rows from %s", len(parsed), file.name)
+def parse_preview_batch(file, digest: Optional[str] = None) -> PreviewRowBatch:
+    """
+    Parse ``file`` into a columnar :class:`PreviewRowBatch` without matching.
 
-    from decimal import ROUND_HALF_UP
+    Sections and rows with a numeric analysis code are resolved here; rows that
+    still need description matching get ``job_match_status=None``.
+    """
+    colmap, parsed = stream_file(file, digest)
+    logger.debug("Preview header row index=%d, columns=%s", colmap["_header_row"], list(colmap.keys()))
 
-    preview_rows = []
+    batch = PreviewRowBatch()
     for idx, row in enumerate(parsed):
         if row.is_section:
             match_info = {"status": "skipped", "match": None}
-        elif row.analysis_code:
-            code = row.analysis_code.strip()
-            if code and any(ch.isdigit() for ch in code):
-                match_info = {
-                    "status": "found",
-                    "match": {"code": code, "confidence": 1.0}
-                }
-            else:
-                from excel_parser.services.cache import cache_match_description
-                match_info = cache_match_description(row.description)
-
+        elif _needs_matching(row):
+            match_info = {"status": None, "match": None}
         else:
-            from excel_parser.services.cache import cache_match_description
-            match_info = cache_match_description(row.description)
-
-            if not isinstance(match_info, dict):  # defensive guard for unexpected returns
-                match_info = {"status": "error", "match": None, "error": "Unexpected match result"}
-
-        row_key = _build_preview_row_key(row.description, row.number, idx)
-        preview_rows.append(
-            {
-                "row_key": row_key,
-                "number": row.number,
-                "description": row.description,
-                "volume": str(row.volume.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
-                "unit": row.unit,
-                "analysis_code": row.analysis_code,
-                "price": str(row.price.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
-                "total_price": str(row.total_price.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
-                "is_section": row.is_section,
-                "index_kind": row.index_kind,
-                "section_letter": row.section_letter,
-                "section_roman": row.section_roman,
-                "section_type": row.section_type,
-                "job_match_status": match_info.get("status"),
-                "job_match": match_info.get("match"),
-                "job_match_error": match_info.get("error"),
+            match_info = {
+                "status": "found",
+                "match": {"code": row.analysis_code.strip(), "confidence": 1.0}
             }
-        )
+        batch.append(_build_preview_row_key(row.description, row.number, idx), row, match_info)
+    return batch
 
-    return preview_rows
+
+def parse_preview_rows(file, digest: Optional[str] = None) -> List[Dict]:
+    """Preview dicts for ``file`` with matching still pending (see :func:`parse_preview_batch`)."""
+    return parse_preview_batch(file, digest).to_dicts()
+
+
+def _checked_match(match_info) -> Dict:
+    if not isinstance(match_info, dict):  # defensive guard for unexpected returns
+        return {"status": "error", "match": None, "error": "Unexpected match result"}
+    return match_info
+
+
+def _diff_key(description, unit) -> Tuple[str, str]:
+    return (str(description or "").strip().lower(), str(unit or "").strip().lower())
+
+
+def reuse_previous_matches(batch: PreviewRowBatch, previous_rows: Iterable[Dict]) -> int:
+    """Copy matches from ``previous_rows`` onto pending rows with the same description and unit."""
+    known = {}
+    for row in previous_rows:
+        if row.get("job_match_status") is not None:
+            known.setdefault(_diff_key(row.get("description"), row.get("unit")), row)
+
+    reused = 0
+    for i in batch.pending_indices():
+        earlier = known.get(_diff_key(batch.description[i], batch.unit[i]))
+        if earlier is None:
+            continue
+        batch.set_match(i, {
+            "status": earlier.get("job_match_status"),
+            "match": earlier.get("job_match"),
+            "error": earlier.get("job_match_error"),
+        })
+        reused += 1
+    return reused
+
+
+def match_preview_batch(batch: PreviewRowBatch) -> PreviewRowBatch:
+    """Resolve the pending job matches of ``batch`` in place."""
+    pending = batch.pending_indices()
+    descriptions = batch.description
+    matches = match_descriptions(descriptions[i] for i in pending)
+    for i in pending:
+        batch.set_match(i, _checked_match(matches.get(descriptions[i])))
+    return batch
+
+
+def match_preview_rows(rows: List[Dict]) -> List[Dict]:
+    """Fill the job match fields of pending preview dicts in place."""
+    pending = [row for row in rows if row.get("job_match_status") is None]
+    matches = match_descriptions(row["description"] for row in pending)
+    for row in pending:
+        match_info = _checked_match(matches.get(row["description"]))
+        row["job_match_status"] = match_info.get("status")
+        row["job_match"] = match_info.get("match")
+        row["job_match_error"] = match_info.get("error")
+    return rows
+
+
+def _needs_matching(row: ParsedRow) -> bool:
+    """Sections and rows with a numeric analysis code skip description matching."""
+    if row.is_section:
+        return False
+    code = (row.analysis_code or "").strip()
+    return not (code and any(ch.isdigit() for ch in code))
 
 
 def _build_preview_row_key(description: Optional[str], number: Optional[str], index: int) -> str:
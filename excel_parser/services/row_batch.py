@@ -0,0 +1,88 @@
+"""
+Columnar storage for Excel preview rows.
+
+``PreviewRowBatch`` keeps one list per preview column instead of one dict per
+row. The reader appends parsed rows to it, matching fills the job-match columns
+in place, and rows only become dicts in :meth:`PreviewRowBatch.to_dicts` at the
+response/serialization boundary. Big RABs therefore hold a fixed number of
+lists rather than a ParsedRow plus a 17-key dict for every row.
+"""
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterator, List, Optional
+
+PREVIEW_COLUMNS = (
+    "row_key",
+    "number",
+    "description",
+    "volume",
+    "unit",
+    "analysis_code",
+    "price",
+    "total_price",
+    "is_section",
+    "index_kind",
+    "section_letter",
+    "section_roman",
+    "section_type",
+    "job_match_status",
+    "job_match",
+    "job_match_error",
+)
+
+_CENT = Decimal("0.01")
+
+
+def _money(value: Decimal) -> str:
+    return str(value.quantize(_CENT, rounding=ROUND_HALF_UP))
+
+
+class PreviewRowBatch:
+    """Parallel per-column lists for a sequence of preview rows."""
+
+    __slots__ = PREVIEW_COLUMNS
+
+    def __init__(self) -> None:
+        for column in PREVIEW_COLUMNS:
+            setattr(self, column, [])
+
+    def __len__(self) -> int:
+        return len(self.row_key)
+
+    def append(self, row_key: str, row, match_info: Dict[str, Any]) -> None:
+        """Add a reader ``ParsedRow`` with its (possibly pending) match info."""
+        self.row_key.append(row_key)
+        self.number.append(row.number)
+        self.description.append(row.description)
+        self.volume.append(_money(row.volume))
+        self.unit.append(row.unit)
+        self.analysis_code.append(row.analysis_code)
+        self.price.append(_money(row.price))
+        self.total_price.append(_money(row.total_price))
+        self.is_section.append(row.is_section)
+        self.index_kind.append(row.index_kind)
+        self.section_letter.append(row.section_letter)
+        self.section_roman.append(row.section_roman)
+        self.section_type.append(row.section_type)
+        self.job_match_status.append(match_info.get("status"))
+        self.job_match.append(match_info.get("match"))
+        self.job_match_error.append(match_info.get("error"))
+
+    def pending_indices(self) -> List[int]:
+        """Indices of rows whose job match has not been resolved yet."""
+        return [i for i, status in enumerate(self.job_match_status) if status is None]
+
+    def set_match(self, index: int, match_info: Dict[str, Any]) -> None:
+        self.job_match_status[index] = match_info.get("status")
+        self.job_match[index] = match_info.get("match")
+        self.job_match_error[index] = match_info.get("error")
+
+    def iter_dicts(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        columns = [getattr(self, column)[start:stop] for column in PREVIEW_COLUMNS]
+        for values in zip(*columns):
+            yield dict(zip(PREVIEW_COLUMNS, values))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize the preview dicts returned to views and tasks."""
+        return list(self.iter_dicts())
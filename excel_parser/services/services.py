@@ -1,25 +1,20 @@
 import os
 from django.core.exceptions import ValidationError
-from openpyxl import load_workbook
 
-try:
-    import xlrd
-except ImportError:
-    xlrd = None
+from .sniffer import SniffError, sniff_excel
+
 
 class ExcelSniffer:
+    """Validate an Excel file's structure without loading the workbook."""
+
     def is_valid(self, file_path):
         _, ext = os.path.splitext(file_path)
         ext = ext.lower()
 
+        if ext not in (".xlsx", ".xls"):
+            raise ValidationError("Unsupported file extension. Only .xls or .xlsx allowed.")
         try:
-            if ext == ".xlsx":
-                load_workbook(filename=file_path)
-            elif ext == ".xls":
-                if not xlrd:
-                    raise ValidationError("Support for .xls requires xlrd==1.2.0")
-                xlrd.open_workbook(file_path)
-            else:
-                raise ValidationError("Unsupported file extension. Only .xls or .xlsx allowed.")
-        except Exception:
+            with open(file_path, "rb") as fh:
+                sniff_excel(fh, ext)
+        except (SniffError, OSError):
             raise ValidationError("Invalid Excel file or corrupted file.")
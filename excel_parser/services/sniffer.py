@@ -0,0 +1,175 @@
+"""
+Structural checks for Excel files that never build a workbook.
+
+* ``.xlsx``: the ZIP central directory must parse, and ``[Content_Types].xml``
+  must declare a SpreadsheetML workbook part that exists in the archive.
+* ``.xls``: the OLE2 compound-document header must be valid, the directory
+  (followed sector by sector through the FAT) must hold a ``Workbook``/``Book``
+  stream, and that stream must start with a BIFF BOF record.
+
+Only the archive directory, one small XML part, or a few header, FAT and
+directory sectors are read, so memory use does not grow with the workbook.
+"""
+from __future__ import annotations
+
+import struct
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+from typing import BinaryIO, List, Optional
+
+OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+BIFF_BOF_RECORDS = {0x0009, 0x0209, 0x0409, 0x0809}
+WORKBOOK_STREAMS = {"workbook", "book"}
+_MINI_STREAM_CUTOFF = 4096
+_DIR_ENTRY_SIZE = 128
+_MAX_CONTENT_TYPES_SIZE = 1024 * 1024
+_CONTENT_TYPES_NS = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+WORKBOOK_CONTENT_TYPES = {
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml",
+    "application/vnd.ms-excel.sheet.macroEnabled.main+xml",
+}
+# OLE2 sector numbers above this are markers (FREESECT, ENDOFCHAIN, ...).
+_MAX_REGULAR_SECTOR = 0xFFFFFFFA
+_END_OF_CHAIN = 0xFFFFFFFE
+_HEADER_DIFAT_ENTRIES = 109
+
+
+class SniffError(ValueError):
+    """The file is not structurally a workbook of the expected format."""
+
+
+def sniff_xlsx(fh: BinaryIO) -> None:
+    try:
+        zf = zipfile.ZipFile(fh)
+    except (zipfile.BadZipFile, OSError, ValueError) as exc:
+        raise SniffError(f"not a ZIP archive: {exc}") from exc
+    with zf:
+        try:
+            info = zf.getinfo("[Content_Types].xml")
+        except KeyError:
+            raise SniffError("missing [Content_Types].xml")
+        if info.file_size > _MAX_CONTENT_TYPES_SIZE:
+            raise SniffError("[Content_Types].xml is implausibly large")
+        try:
+            content_types = zf.read(info)
+        except (zipfile.BadZipFile, OSError, zlib.error) as exc:
+            raise SniffError(f"corrupt [Content_Types].xml: {exc}") from exc
+        part = _workbook_part(content_types)
+        if part is None:
+            raise SniffError("no SpreadsheetML workbook part declared")
+        if part not in zf.NameToInfo:
+            raise SniffError(f"declared workbook part {part} is missing")
+
+
+def _workbook_part(content_types: bytes) -> Optional[str]:
+    """Archive name of the workbook part declared in ``[Content_Types].xml``, or None."""
+    try:
+        root = ET.fromstring(content_types)
+    except ET.ParseError as exc:
+        raise SniffError(f"malformed [Content_Types].xml: {exc}") from exc
+    for override in root.iter(_CONTENT_TYPES_NS + "Override"):
+        if override.get("ContentType") in WORKBOOK_CONTENT_TYPES:
+            return override.get("PartName", "").lstrip("/")
+    return None
+
+
+def _read_at(fh: BinaryIO, offset: int, size: int) -> bytes:
+    fh.seek(offset)
+    data = fh.read(size)
+    if len(data) != size:
+        raise SniffError("truncated compound document")
+    return data
+
+
+def _workbook_entry(directory: bytes) -> Optional[tuple]:
+    for pos in range(0, len(directory), _DIR_ENTRY_SIZE):
+        entry = directory[pos:pos + _DIR_ENTRY_SIZE]
+        name_len = struct.unpack_from("<H", entry, 0x40)[0]
+        if not 2 <= name_len <= 64:
+            continue
+        name = entry[:name_len - 2].decode("utf-16-le", "ignore").lower()
+        if name in WORKBOOK_STREAMS and entry[0x42] == 2:  # 2 = stream object
+            start, size = struct.unpack_from("<iI", entry, 0x74)
+            return start, size
+    return None
+
+
+def _fat_sectors(fh: BinaryIO, header: bytes, sector_size: int) -> List[int]:
+    """Sector numbers holding the FAT, from the header DIFAT and any DIFAT sectors."""
+    num_fat = struct.unpack_from("<I", header, 0x2C)[0]
+    next_difat, num_difat = struct.unpack_from("<II", header, 0x44)
+    sectors = list(struct.unpack_from(f"<{_HEADER_DIFAT_ENTRIES}I", header, 0x4C))
+    per_sector = sector_size // 4
+    for _ in range(num_difat):
+        if len(sectors) >= num_fat or next_difat > _MAX_REGULAR_SECTOR:
+            break
+        block = struct.unpack(f"<{per_sector}I", _read_at(fh, (next_difat + 1) * sector_size, sector_size))
+        sectors.extend(block[:-1])
+        next_difat = block[-1]
+    return sectors[:num_fat]
+
+
+def _directory_sectors(fh: BinaryIO, header: bytes, sector_size: int, first: int):
+    """Yield the directory's sector numbers by following its chain through the FAT."""
+    fat_sectors = None
+    per_sector = sector_size // 4
+    seen = set()
+    sector = first
+    while sector != _END_OF_CHAIN:
+        if sector > _MAX_REGULAR_SECTOR or sector in seen:
+            raise SniffError("corrupt directory sector chain")
+        seen.add(sector)
+        yield sector
+        if fat_sectors is None:
+            fat_sectors = _fat_sectors(fh, header, sector_size)
+        fat_index, slot = divmod(sector, per_sector)
+        if fat_index >= len(fat_sectors) or fat_sectors[fat_index] > _MAX_REGULAR_SECTOR:
+            raise SniffError("directory sector is not covered by the FAT")
+        offset = (fat_sectors[fat_index] + 1) * sector_size + slot * 4
+        sector = struct.unpack("<I", _read_at(fh, offset, 4))[0]
+
+
+def sniff_xls(fh: BinaryIO) -> None:
+    header = _read_at(fh, 0, 512)
+    if header[:8] != OLE2_SIGNATURE:
+        raise SniffError("missing OLE2 signature")
+    byte_order, sector_shift = struct.unpack_from("<HH", header, 0x1C)
+    if byte_order != 0xFFFE or sector_shift not in (9, 12):
+        raise SniffError("invalid OLE2 header")
+    sector_size = 1 << sector_shift
+    first_dir_sector = struct.unpack_from("<I", header, 0x30)[0]
+    if first_dir_sector > _MAX_REGULAR_SECTOR:
+        raise SniffError("compound document has no directory")
+
+    # The FAT is only consulted when the Workbook entry is not in the first
+    # directory sector.
+    for sector in _directory_sectors(fh, header, sector_size, first_dir_sector):
+        entry = _workbook_entry(_read_at(fh, (sector + 1) * sector_size, sector_size))
+        if entry is not None:
+            break
+    else:
+        raise SniffError("no Workbook stream")
+    start, size = entry
+    if size < 4:
+        raise SniffError("empty Workbook stream")
+    if size < _MINI_STREAM_CUTOFF or start < 0:
+        # Tiny streams live in the mini stream; the directory entry is enough.
+        return
+    record_id = struct.unpack("<H", _read_at(fh, (start + 1) * sector_size, 2))[0]
+    if record_id not in BIFF_BOF_RECORDS:
+        raise SniffError("Workbook stream does not start with a BIFF BOF record")
+
+
+def sniff_excel(fh: BinaryIO, ext: str) -> None:
+    """Raise :class:`SniffError` unless ``fh`` looks like a valid ``ext`` workbook."""
+    pos = fh.tell()
+    try:
+        if ext == ".xlsx":
+            sniff_xlsx(fh)
+        elif ext == ".xls":
+            sniff_xls(fh)
+        else:
+            raise SniffError(f"unsupported extension {ext!r}")
+    finally:
+        fh.seek(pos)
@@ -0,0 +1,151 @@
+"""
+Paged results and progress for the async Excel/PDF parse tasks.
+
+Tasks write their rows to :class:`~excel_parser.models.TaskResultPage` a page
+at a time and keep only a small summary in the Celery result backend. The
+``task_status`` views read progress (rows done, rows per second, ETA) from the
+pages written so far and serve the rows themselves, optionally one page at a
+time via ``?page=N``.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.db import connections, router
+from django.db.models import Count, Sum
+
+from excel_parser.models import TaskResultPage
+
+DEFAULT_PAGE_SIZE = 200
+
+
+def paginate(rows: Sequence[Dict[str, Any]], page_size: int = DEFAULT_PAGE_SIZE) -> List[Sequence[Dict[str, Any]]]:
+    return [rows[start:start + page_size] for start in range(0, len(rows), page_size)]
+
+
+def _conflict_target(unique_fields: List[str]) -> Dict[str, List[str]]:
+    """
+    ``unique_fields`` for an upserting ``bulk_create``, if the backend takes one.
+
+    MySQL's ON DUPLICATE KEY UPDATE cannot name a conflict target (it fires on
+    any unique key) and Django rejects ``unique_fields`` there.
+    """
+    connection = connections[router.db_for_write(TaskResultPage) or "default"]
+    if connection.features.supports_update_conflicts_with_target:
+        return {"unique_fields": unique_fields}
+    return {}
+
+
+def save_page(task_id: str, page: int, rows: Sequence[Dict[str, Any]]) -> None:
+    """Insert or replace page ``page`` of ``task_id``'s rows."""
+    TaskResultPage.objects.bulk_create(
+        [TaskResultPage(task_id=task_id, page=page, row_count=len(rows), rows=list(rows))],
+        update_conflicts=True,
+        update_fields=["row_count", "rows"],
+        **_conflict_target(["task_id", "page"]),
+    )
+
+
+def save_pages(task_id: str, rows: Sequence[Dict[str, Any]], page_size: int = DEFAULT_PAGE_SIZE) -> int:
+    """Store ``rows`` as consecutive pages; returns the number of pages written."""
+    pages = paginate(rows, page_size)
+    for page, chunk in enumerate(pages):
+        save_page(task_id, page, chunk)
+    return len(pages)
+
+
+def load_rows(task_id: str, page: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Return every stored row of ``task_id`` in order, or only page ``page``."""
+    qs = TaskResultPage.objects.filter(task_id=task_id)
+    if page is not None:
+        qs = qs.filter(page=page)
+    rows: List[Dict[str, Any]] = []
+    for chunk in qs.order_by("page").values_list("rows", flat=True):
+        rows.extend(chunk)
+    return rows
+
+
+def purge_pages(older_than) -> int:
+    """Delete pages written before ``older_than``; returns the number removed."""
+    deleted, _ = TaskResultPage.objects.filter(created_at__lt=older_than).delete()
+    return deleted
+
+
+def progress_meta(
+    status: str, rows_total: Optional[int], pages_total: Optional[int], started_at: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Task ``meta`` for a PROCESSING state that :func:`progress` can expand.
+
+    Streaming tasks pass ``None`` totals while they do not know them yet; rows
+    done and throughput are still reported, without an ETA.
+    """
+    return {
+        "status": status,
+        "rows_total": rows_total,
+        "pages_total": pages_total,
+        "started_at": started_at if started_at is not None else time.time(),
+    }
+
+
+def progress(task_id: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Rows done/total, throughput and ETA for a task using :func:`progress_meta`."""
+    if "rows_total" not in (meta or {}):
+        return {}
+    rows_total = meta["rows_total"]
+    stored = TaskResultPage.objects.filter(task_id=task_id).aggregate(rows=Sum("row_count"), pages=Count("id"))
+    rows_done = stored["rows"] or 0
+    elapsed = time.time() - meta.get("started_at", time.time())
+    rate = rows_done / elapsed if rows_done and elapsed > 0 else None
+    eta = (rows_total - rows_done) / rate if rate and rows_total is not None else None
+    return {
+        "rows_done": rows_done,
+        "rows_total": rows_total,
+        "pages_done": stored["pages"],
+        "pages_total": meta.get("pages_total"),
+        "rows_per_second": round(rate, 1) if rate is not None else None,
+        "eta_seconds": round(eta, 1) if eta is not None else None,
+    }
+
+
+def task_status_payload(task, page: Optional[int] = None) -> Dict[str, Any]:
+    """Build the ``task_status`` response body for a Celery ``AsyncResult``."""
+    if task.state == 'PENDING':
+        return {
+            'state': task.state,
+            'status': 'Task is waiting to be processed...'
+        }
+    if task.state == 'PROCESSING':
+        info = task.info or {}
+        response = {
+            'state': task.state,
+            'status': info.get('status', 'Processing...'),
+        }
+        response.update(progress(task.id, info))
+        if page is not None:
+            response['page'] = page
+            response['rows'] = load_rows(task.id, page)
+        return response
+    if task.state == 'SUCCESS':
+        result = dict(task.result or {})
+        if 'rows' not in result:
+            result['rows'] = load_rows(task.id, page)
+        response = {
+            'state': task.state,
+            'result': result,
+            'status': 'completed'
+        }
+        if page is not None:
+            response['page'] = page
+        return response
+    if task.state == 'FAILURE':
+        return {
+            'state': task.state,
+            'status': str(task.info),
+            'error': str(task.info)
+        }
+    return {
+        'state': task.state,
+        'status': str(task.info)
+    }
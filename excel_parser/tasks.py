@@ -1,114 +1,140 @@
 """
 Celery tasks for Excel parsing.
+
+Large workbooks are processed as a map-reduce graph so no single task has to
+match every row:
+
+    process_excel_file_task     parse the workbook and split rows into chunks
+      -> chord(match_excel_chunk_task x N)   match and price chunks in parallel
+      -> assemble_excel_rows_task            build the TestJob
+
+The chord replaces ``process_excel_file_task``, so its final result is stored
+under the original task id and clients keep polling the id they were given.
+Each chunk is saved as a TaskResultPage of that task id as soon as it is
+matched (see ``services/task_results.py``), so progress and partial rows are
+available while other chunks are still running and the result backend only
+ever holds small summaries.
 """
-from celery import shared_task
-from decimal import Decimal
-from django.core.files.uploadedfile import InMemoryUploadedFile
-from openpyxl import load_workbook
-import tempfile
 import os
+from datetime import timedelta
+
+from celery import chord, shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from .services import parse_cache
+from .services.pricing import attach_unit_prices
+from .services.reader import match_preview_rows, parse_preview_rows
+from .services.task_results import (
+    DEFAULT_PAGE_SIZE, load_rows, paginate, progress_meta, purge_pages, save_page, save_pages
+)
+from cost_weight.services.job_builder import build_job_from_rows
+
+# Celery's default result_expires: pages live as long as results used to.
+DEFAULT_PAGE_MAX_AGE = 24 * 60 * 60
+
+DEFAULT_CHUNK_SIZE = DEFAULT_PAGE_SIZE
+
 
-from .services.reader import preview_file
-from cost_weight.models import TestJob, TestItem
+def _chunk_size() -> int:
+    return max(1, int(getattr(settings, "EXCEL_TASK_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)))
+
+
+def _remove_temp_file(file_path):
+    if os.path.exists(file_path):
+        try:
+            os.unlink(file_path)
+        except OSError:
+            pass
+
+
+def _finish_page(task_id, page, rows):
+    """Match and price one page of rows, then make it readable by task_status."""
+    match_preview_rows(rows)
+    attach_unit_prices(rows)
+    save_page(task_id, page, rows)
+    return len(rows)
+
+
+def _build_result(task_id, filename, file_type, rows_total, pages_total, digest=None):
+    rows = load_rows(task_id)
+    if digest:
+        parse_cache.store("excel", digest, rows)
+    job = build_job_from_rows(rows, filename)
+    return {
+        'job_id': job.id,
+        'filename': filename,
+        'file_type': file_type,
+        'rows_total': rows_total,
+        'pages_total': pages_total,
+        'status': 'completed'
+    }
 
 
 @shared_task(bind=True, time_limit=600, soft_time_limit=570)
 def process_excel_file_task(self, file_path, filename, file_type='standard'):
     """
     Process an Excel file asynchronously.
-    
+
     Args:
         file_path: Temporary file path to the uploaded Excel file
         filename: Original filename
         file_type: Type of file ('standard', 'apendo', or 'legacy')
-    
+
     Returns:
-        dict: Contains 'rows', 'job_id', 'filename', 'file_type'
+        dict: Contains 'job_id', 'filename', 'file_type', 'rows_total' and
+        'pages_total'; the rows themselves are stored as TaskResultPage rows.
     """
+    task_id = self.request.id
     try:
         # Update task state
         self.update_state(state='PROCESSING', meta={'status': 'Reading Excel file...'})
-        
-        # Process the file using existing preview_file logic
-        # We need to create a file-like object from the path
-        with open(file_path, 'rb') as f:
-            rows = preview_file(f)
-        
-        # Update task state
+
+        digest = parse_cache.source_digest(file_path) if parse_cache.is_enabled() else None
+        cached_rows = parse_cache.load("excel", digest) if digest else None
+        if cached_rows is None:
+            with open(file_path, 'rb') as f:
+                rows = parse_preview_rows(f, digest)
+    finally:
+        _remove_temp_file(file_path)
+
+    if cached_rows is not None:
+        # Same bytes were parsed and matched before: just page the stored rows.
+        pages_total = save_pages(task_id, cached_rows, _chunk_size())
+        return _build_result(task_id, filename, file_type, len(cached_rows), pages_total)
+
+    pages = paginate(rows, _chunk_size())
+    self.update_state(state='PROCESSING', meta=progress_meta('Matching rows...', len(rows), len(pages)))
+
+    if len(pages) <= 1:
+        for page, chunk in enumerate(pages):
+            _finish_page(task_id, page, chunk)
         self.update_state(state='PROCESSING', meta={'status': 'Creating test job...'})
-        
-        # Create TestJob from rows
-        job = _create_test_job_from_rows(rows, filename)
-        
-        # Cleanup temp file
-        if os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-            except OSError:
-                pass
-        
-        return {
-            'rows': rows,
-            'job_id': job.id,
-            'filename': filename,
-            'file_type': file_type,
-            'status': 'completed'
-        }
-        
-    except Exception as e:
-        # Cleanup temp file on error
-        if os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-            except OSError:
-                pass
-        
-        # Re-raise the exception so Celery can handle it
-        raise
-
-
-def _create_test_job_from_rows(rows, filename="Uploaded File"):
+        return _build_result(task_id, filename, file_type, len(rows), len(pages), digest)
+
+    header = [match_excel_chunk_task.s(task_id, page, chunk) for page, chunk in enumerate(pages)]
+    body = assemble_excel_rows_task.s(task_id, filename, file_type, digest)
+    return self.replace(chord(header, body))
+
+
+@shared_task(time_limit=600, soft_time_limit=570)
+def match_excel_chunk_task(task_id, page, rows):
+    """Match and price one chunk of preview rows and store it as page ``page``."""
+    return _finish_page(task_id, page, rows)
+
+
+@shared_task(time_limit=600, soft_time_limit=570)
+def assemble_excel_rows_task(row_counts, task_id, filename, file_type='standard', digest=None):
+    """Build the TestJob from every stored page once all chunks are matched."""
+    return _build_result(task_id, filename, file_type, sum(row_counts), len(row_counts), digest)
+
+
+@shared_task(ignore_result=True)
+def purge_task_result_pages_task():
     """
-    Create TestJob and TestItems from parsed rows.
-    Returns the created TestJob instance.
+    Delete result pages older than ``TASK_RESULT_PAGE_MAX_AGE`` seconds, the
+    way the result backend expires task results. Scheduled via
+    ``CELERY_BEAT_SCHEDULE``; serves both Excel and PDF tasks.
     """
-    # Create job
-    job = TestJob.objects.create(name=f"RAB - {filename}")
-    
-    # Create items from rows (skip section headers)
-    for row in rows:
-        # Skip section/category rows
-        if row.get("is_section") or row.get("job_match_status") == "skipped":
-            continue
-            
-        description = row.get("description", "Unknown Item")
-        if not description or description.strip() == "":
-            continue
-            
-        # Parse quantity and price
-        try:
-            quantity = Decimal(str(row.get("volume", 0)))
-            if quantity <= 0:
-                quantity = Decimal("1")
-        except (ValueError, TypeError, KeyError):
-            quantity = Decimal("1")
-            
-        try:
-            unit_price = Decimal(str(row.get("price", 0)))
-            if unit_price < 0:
-                unit_price = Decimal("0")
-        except (ValueError, TypeError, KeyError):
-            unit_price = Decimal("0")
-        
-        # Create item
-        TestItem.objects.create(
-            job=job,
-            name=description,
-            quantity=quantity,
-            unit_price=unit_price
-        )
-    
-    # Calculate totals and weights
-    job.calculate_totals()
-    
-    return job
+    max_age = getattr(settings, "TASK_RESULT_PAGE_MAX_AGE", DEFAULT_PAGE_MAX_AGE)
+    return purge_pages(timezone.now() - timedelta(seconds=max_age))
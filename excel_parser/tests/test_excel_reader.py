@@ -96,6 +96,82 @@ class ExcelReaderTests(TestCase):
         with self.assertRaises(UnsupportedFileError):
             ExcelImporter().import_file(bad)
 
+    def _large_xlsx_file(self, rows, bad_rows=()):
+        bio = BytesIO()
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["No", "Uraian Pekerjaan", "Volume", "Satuan"])
+        for i in range(1, rows + 1):
+            unit = "x" * 60 if i in bad_rows else "m3"  # exceeds RabEntry.unit max_length
+            ws.append([i, f"Pekerjaan {i}", i, unit])
+        wb.save(bio)
+        return SimpleUploadedFile(
+            "big.xlsx",
+            bio.getvalue(),
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
+    def test_bulk_import_uses_batched_inserts(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        f = self._large_xlsx_file(250)
+        with CaptureQueriesContext(connection) as ctx:
+            count = ExcelImporter(batch_size=50).import_file(f)
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "excel_parser_rabentry"')]
+        self.assertEqual(len(inserts), 5)
+        self.assertEqual(count, 250)
+        self.assertEqual(RabEntry.objects.count(), 250)
+        last = RabEntry.objects.order_by("row_index").last()
+        self.assertEqual(last.row_index, 250)
+        self.assertEqual(last.description, "Pekerjaan 250")
+
+    def test_bulk_import_skips_invalid_rows(self):
+        f = self._large_xlsx_file(10, bad_rows={3, 7})
+        count = ExcelImporter(batch_size=4).import_file(f)
+        self.assertEqual(count, 8)
+        self.assertFalse(RabEntry.objects.filter(row_index__in=[3, 7]).exists())
+
+    def test_per_row_mode_matches_bulk_mode(self):
+        count = ExcelImporter(bulk=False).import_file(self._large_xlsx_file(5))
+        self.assertEqual(count, 5)
+        self.assertEqual(
+            list(RabEntry.objects.order_by("row_index").values_list("row_index", flat=True)),
+            [1, 2, 3, 4, 5],
+        )
+
+    def _fractional_xlsx_file(self):
+        bio = BytesIO()
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["No", "Uraian Pekerjaan", "Volume", "Satuan", "Harga Satuan"])
+        ws.append([1, "Pekerjaan 1", 1 / 3, "m3", 12345.678])
+        ws.append([2, "Pekerjaan 2", 2, "m3", 1000])
+        wb.save(bio)
+        return SimpleUploadedFile(
+            "fractions.xlsx",
+            bio.getvalue(),
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
+    def _stored_rows(self):
+        return list(
+            RabEntry.objects.order_by("row_index").values_list("row_index", "volume", "unit_price", "total_price")
+        )
+
+    def test_bulk_mode_quantizes_excess_decimal_places_like_per_row_mode(self):
+        per_row_count = ExcelImporter(bulk=False).import_file(self._fractional_xlsx_file())
+        per_row = self._stored_rows()
+        RabEntry.objects.all().delete()
+
+        bulk_count = ExcelImporter().import_file(self._fractional_xlsx_file())
+
+        self.assertEqual((bulk_count, per_row_count), (2, 2))
+        self.assertEqual(self._stored_rows(), per_row)
+        first = RabEntry.objects.get(row_index=1)
+        self.assertEqual(first.volume, Decimal("0.3333"))
+        self.assertEqual(first.unit_price, Decimal("12345.68"))
+
 
 class HeaderMapperTests(TestCase):
     def test_maps_clean_headers(self):
@@ -129,3 +205,40 @@ class HeaderMapperTests(TestCase):
         ]
         idx = find_header_row(rows, scan_first=10)
         self.assertEqual(idx, 2)
+
+
+class XLSReaderTests(TestCase):
+    def _xls_bytes(self):
+        if not XlsWorkbook:
+            self.skipTest("xlwt not installed")
+        bio = BytesIO()
+        wb = XlsWorkbook()
+        ws = wb.add_sheet("Sheet1")
+        for r, row in enumerate([["No", "Uraian Pekerjaan", "Volume"], [1, "Pondasi", 3.25]]):
+            for c, val in enumerate(row):
+                ws.write(r, c, val)
+        wb.save(bio)
+        return bio.getvalue()
+
+    def _read(self, file):
+        from excel_parser.services.reader import _XLSReader
+        return list(_XLSReader().iter_rows(file))
+
+    def test_reads_rows_from_memory_upload(self):
+        rows = self._read(SimpleUploadedFile("rab.xls", self._xls_bytes()))
+        self.assertEqual(rows, [["No", "Uraian Pekerjaan", "Volume"], [1.0, "Pondasi", 3.25]])
+
+    def test_on_disk_upload_is_opened_by_path(self):
+        from unittest.mock import patch
+        import xlrd
+        from django.core.files.uploadedfile import TemporaryUploadedFile
+
+        upload = TemporaryUploadedFile("rab.xls", "application/vnd.ms-excel", 0, None)
+        upload.write(self._xls_bytes())
+        upload.seek(0)
+        with patch("xlrd.open_workbook", wraps=xlrd.open_workbook) as opener:
+            rows = self._read(upload)
+        upload.close()
+        self.assertEqual(opener.call_args.kwargs["filename"], upload.temporary_file_path())
+        self.assertTrue(opener.call_args.kwargs["on_demand"])
+        self.assertEqual(rows[1], [1.0, "Pondasi", 3.25])
@@ -0,0 +1,46 @@
+from django.test import SimpleTestCase
+
+from excel_parser.services.header_aliases import HeaderAliasTable
+from excel_parser.services.reader import HEADER_ALIASES, _header_columns, _match_header
+
+GROUPS = {
+    "number": ["No", "Kode"],
+    "description": ["Uraian Pekerjaan", "Uraian"],
+    "analysis_code": ["Kode Analisa", "kode"],
+}
+
+
+class HeaderAliasTableTests(SimpleTestCase):
+    def test_exact_lookup_is_normalized(self):
+        table = HeaderAliasTable(GROUPS)
+        self.assertEqual(table.lookup("  URAIAN pekerjaan "), "description")
+        self.assertIsNone(table.lookup("Volume"))
+        self.assertIsNone(table.lookup(None))
+
+    def test_first_group_wins_for_shared_alias(self):
+        table = HeaderAliasTable(GROUPS)
+        self.assertEqual(table.lookup("kode"), "number")
+        self.assertEqual(table.aliases.count("kode"), 1)
+
+    def test_map_row_keeps_first_column_per_header(self):
+        table = HeaderAliasTable(GROUPS)
+        row = [None, "No", "Uraian", "Kode Analisa", "Uraian Pekerjaan"]
+        self.assertEqual(table.map_row(row), {"number": 1, "description": 2, "analysis_code": 3})
+
+    def test_fuzzy_fallback_is_opt_in(self):
+        self.assertIsNone(HeaderAliasTable(GROUPS).lookup("Uraian Pekerjan"))
+        fuzzy = HeaderAliasTable(GROUPS, fuzzy_cutoff=90)
+        self.assertEqual(fuzzy.lookup("Uraian Pekerjan"), "description")
+        self.assertIsNone(fuzzy.lookup("Harga Satuan"))
+
+
+class ReaderHeaderTableTests(SimpleTestCase):
+    def test_reader_helpers_use_compiled_aliases(self):
+        row = ["NO", "Uraian Pekerjaan", "Vol.", "Satuan", "Kode Analisa", "Harga Satuan", "Jumlah Harga"]
+        self.assertEqual(
+            _header_columns(row),
+            {"number": 0, "description": 1, "volume": 2, "unit": 3,
+             "analysis_code": 4, "price": 5, "total_price": 6},
+        )
+        self.assertEqual(_match_header("kode"), ("number", "kode"))
+        self.assertIn("number", HEADER_ALIASES)
@@ -0,0 +1,98 @@
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+from openpyxl import Workbook
+
+from excel_parser.services import reader
+from excel_parser.services.header_mapper import map_headers
+from excel_parser.services.header_probe import cached_header, file_digest, probe_header_row
+
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class ProbeHeaderRowTests(SimpleTestCase):
+    def test_stops_at_first_complete_header(self):
+        def rows():
+            yield ["PEKERJAAN", ":", "GEDUNG"]
+            yield ["No", "Uraian Pekerjaan", "Volume", "Satuan"]
+            raise AssertionError("probe read past the header row")
+
+        index, row, (mapping, missing, _) = probe_header_row(rows(), map_headers=map_headers)
+        self.assertEqual(index, 1)
+        self.assertEqual(row[1], "Uraian Pekerjaan")
+        self.assertEqual(missing, [])
+
+    def test_falls_back_to_best_partial_row(self):
+        rows = [["Judul"], ["No", "Uraian"], ["x"]]
+        index, _, (mapping, missing, _) = probe_header_row(rows, map_headers=map_headers)
+        self.assertEqual(index, 1)
+        self.assertIn("satuan", missing)
+
+    def test_no_header_like_row_falls_back_to_first_row(self):
+        index, row, (mapping, _, _) = probe_header_row([["a"], ["b"]], map_headers=map_headers)
+        self.assertEqual((index, row, mapping), (0, ["a"], {}))
+
+    def test_no_rows(self):
+        self.assertIsNone(probe_header_row([], map_headers=map_headers))
+
+    def test_file_digest_keeps_position(self):
+        upload = SimpleUploadedFile("a.xlsx", b"abcdef")
+        upload.seek(3)
+        self.assertEqual(file_digest(upload), file_digest(BytesIO(b"abcdef")))
+        self.assertEqual(upload.tell(), 3)
+
+
+class DetectHeadersCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _xlsx_bytes(self, *rows):
+        wb = Workbook()
+        ws = wb.active
+        for row in rows or (["RAB GEDUNG"], ["No", "Uraian Pekerjaan", "Volume", "Satuan"], [1, "Pondasi", 10, "m3"]):
+            ws.append(row)
+        bio = BytesIO()
+        wb.save(bio)
+        return bio.getvalue()
+
+    @patch("excel_parser.views.validate_excel_file")
+    def test_preview_reuses_header_detected_by_detect_headers(self, _):
+        data = self._xlsx_bytes()
+        resp = self.client.post("/excel_parser/detect_headers", {"file": SimpleUploadedFile("rab.xlsx", data, XLSX)})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["header_row_index"], 2)
+        self.assertEqual(cached_header(file_digest(BytesIO(data)))[0], 1)
+
+        with patch.object(reader, "_split_header") as split:
+            colmap, rows = reader.stream_file(SimpleUploadedFile("rab.xlsx", data, XLSX), file_digest(BytesIO(data)))
+            parsed = list(rows)
+        split.assert_not_called()
+        self.assertEqual(colmap["_header_row"], 1)
+        self.assertEqual([r.description for r in parsed], ["Pondasi"])
+
+    @patch("excel_parser.services.reader.file_digest")
+    def test_stream_file_without_digest_does_not_hash(self, digest):
+        colmap, rows = reader.stream_file(SimpleUploadedFile("rab.xlsx", self._xlsx_bytes(), XLSX))
+        self.assertEqual([r.description for r in rows], ["Pondasi"])
+        digest.assert_not_called()
+
+    @patch("excel_parser.views.validate_excel_file")
+    def test_header_past_lookahead_is_not_cached(self, _):
+        rows = [["filler"]] * reader.HEADER_LOOKAHEAD + [["No", "Uraian Pekerjaan", "Volume", "Satuan"], [1, "Pondasi", 10, "m3"]]
+        data = self._xlsx_bytes(*rows)
+        resp = self.client.post("/excel_parser/detect_headers", {"file": SimpleUploadedFile("rab.xlsx", data, XLSX)})
+        self.assertEqual(resp.data["header_row_index"], reader.HEADER_LOOKAHEAD + 1)
+        self.assertIsNone(cached_header(file_digest(BytesIO(data))))
+        with self.assertRaises(reader.ParseError):
+            reader.stream_file(SimpleUploadedFile("rab.xlsx", data, XLSX), file_digest(BytesIO(data)))
+
+    @patch("excel_parser.views.validate_excel_file")
+    def test_sheet_without_headers_falls_back_to_first_row(self, _):
+        data = self._xlsx_bytes(["a"], ["b"])
+        resp = self.client.post("/excel_parser/detect_headers", {"file": SimpleUploadedFile("rab.xlsx", data, XLSX)})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["header_row_index"], 1)
+        self.assertIn("satuan", resp.data["missing"])
@@ -0,0 +1,153 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+
+from excel_parser.services import match_pool
+from excel_parser.services.match_pool import match_descriptions
+
+
+def _echo(desc):
+    return {"status": "found", "match": {"description": desc}}
+
+
+class MatchDescriptionsTests(SimpleTestCase):
+    @patch("excel_parser.services.match_pool.cache_match_description", side_effect=_echo)
+    def test_deduplicates_descriptions(self, mock_match):
+        result = match_descriptions(["Beton", "Galian", "Beton", "Beton"], workers=1)
+        self.assertEqual(list(result), ["Beton", "Galian"])
+        self.assertEqual(mock_match.call_count, 2)
+
+    @patch("excel_parser.services.match_pool.connections")
+    @patch("excel_parser.services.match_pool.cache_match_description", side_effect=_echo)
+    def test_thread_pool_matches_on_worker_threads(self, mock_match, mock_connections):
+        seen = set()
+
+        def record(desc):
+            seen.add(threading.current_thread().name)
+            return _echo(desc)
+
+        mock_match.side_effect = record
+        descriptions = [f"Item {i}" for i in range(20)]
+        result = match_descriptions(descriptions, workers=4, executor="thread")
+
+        self.assertEqual(list(result), descriptions)
+        self.assertEqual(result["Item 7"]["match"], {"description": "Item 7"})
+        self.assertTrue(all(name.startswith("excel-match") for name in seen))
+
+    @patch("excel_parser.services.match_pool.connections")
+    @patch("excel_parser.services.match_pool.cache_match_description", side_effect=_echo)
+    def test_workers_close_connections_once_not_per_description(self, mock_match, mock_connections):
+        closed_by = []
+        mock_connections.close_all.side_effect = lambda: closed_by.append(threading.current_thread().name)
+        make_executor = match_pool._make_executor
+        pools = []
+
+        def tracked_executor(kind, workers):
+            pools.append(make_executor(kind, workers))
+            return pools[-1]
+
+        with patch("excel_parser.services.match_pool._make_executor", side_effect=tracked_executor):
+            result = match_descriptions([f"Item {i}" for i in range(20)], workers=4, executor="thread")
+        pools[0].shutdown(wait=True)
+
+        self.assertEqual(len(result), 20)
+        # One close per drain loop that actually ran, never one per description.
+        self.assertTrue(1 <= len(closed_by) <= 4, closed_by)
+        self.assertTrue(all(name.startswith("excel-match") for name in closed_by), closed_by)
+
+    @patch("excel_parser.services.match_pool._make_executor")
+    @patch("excel_parser.services.match_pool.cache_match_description", side_effect=_echo)
+    def test_default_pool_size_is_a_small_fixed_cap(self, mock_match, mock_executor):
+        mock_executor.side_effect = lambda kind, workers: match_pool.ThreadPoolExecutor(max_workers=workers)
+        with override_settings(EXCEL_MATCH_WORKERS=None), patch("os.cpu_count", return_value=64):
+            match_descriptions([f"Item {i}" for i in range(50)], executor="thread")
+        self.assertEqual(mock_executor.call_args.args, ("thread", match_pool.DEFAULT_WORKERS))
+
+    @patch("excel_parser.services.match_pool.connections")
+    @patch("excel_parser.services.match_pool.cache_match_description")
+    def test_slow_description_times_out_without_blocking_others(self, mock_match, _):
+        release = threading.Event()
+
+        def slow(desc):
+            if desc == "slow":
+                release.wait(5)
+            return _echo(desc)
+
+        mock_match.side_effect = slow
+        started = time.monotonic()
+        try:
+            result = match_descriptions(["fast", "slow", "other"], workers=2, timeout=0.2)
+        finally:
+            release.set()
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(result["slow"], match_pool.TIMEOUT_RESULT)
+        self.assertEqual(result["fast"]["status"], "found")
+        self.assertEqual(result["other"]["status"], "found")
+
+    @patch("excel_parser.services.match_pool.connections")
+    @patch("excel_parser.services.match_pool.cache_match_description")
+    def test_worker_exception_becomes_error_row(self, mock_match, _):
+        def flaky(desc):
+            if desc == "bad":
+                raise RuntimeError("boom")
+            return _echo(desc)
+
+        mock_match.side_effect = flaky
+        result = match_descriptions(["bad", "good"], workers=2)
+        self.assertEqual(result["bad"], {"status": "error", "match": None, "error": "boom"})
+        self.assertEqual(result["good"]["status"], "found")
+
+    @override_settings(EXCEL_MATCH_WORKERS=1)
+    @patch("excel_parser.services.match_pool._make_executor")
+    @patch("excel_parser.services.match_pool.cache_match_description", side_effect=_echo)
+    def test_single_worker_setting_matches_inline(self, mock_match, mock_executor):
+        match_descriptions(["a", "b", "c"])
+        mock_executor.assert_not_called()
+        self.assertEqual(mock_match.call_count, 3)
+
+
+class PreviewFileMatchingTests(SimpleTestCase):
+    def _row(self, description, code="", is_section=False):
+        from decimal import Decimal
+        from excel_parser.services.reader import ParsedRow
+
+        one = Decimal("1")
+        return ParsedRow("1", description, one, "m3", code, one, one, is_section=is_section)
+
+    @patch("excel_parser.services.reader.attach_unit_prices")
+    @patch("excel_parser.services.reader.match_descriptions")
+    @patch("excel_parser.services.reader.stream_file")
+    def test_preview_matches_once_and_keeps_row_order(self, mock_stream, mock_match, _):
+        from excel_parser.services.reader import preview_file
+
+        rows = [
+            self._row("PEKERJAAN PERSIAPAN", is_section=True),
+            self._row("Galian tanah"),
+            self._row("Beton K-225", code="A.4.1.1"),
+            self._row("Galian tanah"),
+            self._row("Urugan pasir", code="lihat gambar"),
+        ]
+        mock_stream.return_value = ({"_header_row": 0}, iter(rows))
+        requested = []
+
+        def fake_match(descriptions):
+            requested.extend(descriptions)
+            return {d: _echo(d) for d in requested}
+
+        mock_match.side_effect = fake_match
+
+        preview = preview_file(SimpleUploadedFile("rab.xlsx", b""))
+
+        self.assertEqual(mock_match.call_count, 1)
+        self.assertEqual(requested, ["Galian tanah", "Galian tanah", "Urugan pasir"])
+        self.assertEqual([r["description"] for r in preview], [r.description for r in rows])
+        self.assertEqual(
+            [r["job_match_status"] for r in preview],
+            ["skipped", "found", "found", "found", "found"],
+        )
+        self.assertEqual(preview[2]["job_match"], {"code": "A.4.1.1", "confidence": 1.0})
+        self.assertEqual(preview[3]["job_match"], {"description": "Galian tanah"})
@@ -0,0 +1,105 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from excel_parser.services import parse_cache
+from excel_parser.services.reader import ParsedRow, reuse_previous_matches
+from excel_parser.services.row_batch import PreviewRowBatch
+
+ENABLED = override_settings(PARSE_CACHE_ENABLED=True, PARSE_CACHE_CATALOG_VERSION="v1")
+
+
+def _upload(data, name="rab.xlsx"):
+    return SimpleUploadedFile(name, data, content_type="application/vnd.ms-excel")
+
+
+@ENABLED
+class CachedParseTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_identical_bytes_are_parsed_once(self):
+        parse = MagicMock(return_value=[{"description": "Galian", "price": Decimal("1.50")}])
+        first = parse_cache.cached_parse("pdf", _upload(b"same"), parse)
+        second = parse_cache.cached_parse("pdf", _upload(b"same"), parse)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(second[0]["price"], Decimal("1.50"))
+
+    def test_catalog_version_is_part_of_the_key(self):
+        parse = MagicMock(return_value=[])
+        parse_cache.cached_parse("pdf", _upload(b"same"), parse)
+        with override_settings(PARSE_CACHE_CATALOG_VERSION="v2"):
+            parse_cache.cached_parse("pdf", _upload(b"same"), parse)
+        self.assertEqual(parse.call_count, 2)
+
+    def test_disabled_cache_always_parses(self):
+        parse = MagicMock(return_value=[])
+        with override_settings(PARSE_CACHE_ENABLED=False):
+            parse_cache.cached_parse("pdf", _upload(b"same"), parse)
+            parse_cache.cached_parse("pdf", _upload(b"same"), parse)
+        self.assertEqual(parse.call_count, 2)
+
+    def test_entries_are_compressed(self):
+        rows = [{"description": "Pekerjaan beton"}] * 200
+        parse_cache.store("excel", "d1", rows)
+        blob = cache.get(parse_cache.cache_key("excel", "d1"))
+        self.assertLess(len(blob), len(repr(rows)) / 10)
+        self.assertEqual(parse_cache.load("excel", "d1"), rows)
+
+    def test_edited_reupload_passes_previous_rows(self):
+        previous = {}
+        old_rows = [{"description": "Galian", "unit": "m3", "job_match_status": "found"}]
+        parse = MagicMock(side_effect=[old_rows, []])
+
+        parse_cache.cached_preview(_upload(b"v1"), parse, previous)
+        parse_cache.cached_preview(_upload(b"v2"), parse, previous)
+
+        v1, v2 = parse_cache.source_digest(_upload(b"v1")), parse_cache.source_digest(_upload(b"v2"))
+        self.assertEqual(parse.call_args_list[0].kwargs, {"digest": v1})
+        self.assertEqual(parse.call_args_list[1].kwargs, {"previous_rows": old_rows, "digest": v2})
+        self.assertEqual(previous["rab.xlsx"], v2)
+
+
+class CatalogVersionTests(TestCase):
+    def test_falls_back_when_catalog_is_unavailable(self):
+        parse_cache._catalog_version.update(value=None, expires=0.0)
+        with patch("rencanakan_core.models.Ahs.objects") as objects:
+            objects.aggregate.side_effect = Exception("no such table: ahs")
+            self.assertEqual(parse_cache.catalog_version(), "unknown")
+        parse_cache._catalog_version.update(value=None, expires=0.0)
+
+
+class ReusePreviousMatchesTests(SimpleTestCase):
+    def test_only_changed_rows_stay_pending(self):
+        one = Decimal("1")
+        batch = PreviewRowBatch()
+        for desc, unit in (("Galian tanah", "m3"), ("Galian tanah", "m2"), ("Urugan", "m3")):
+            batch.append("k", ParsedRow("1", desc, one, unit, "", one, one), {"status": None, "match": None})
+        previous = [
+            {"description": " galian TANAH", "unit": "M3", "job_match_status": "found", "job_match": {"code": "A.1"}},
+            {"description": "Urugan", "unit": "m2", "job_match_status": "found", "job_match": {"code": "B.1"}},
+        ]
+        self.assertEqual(reuse_previous_matches(batch, previous), 1)
+        self.assertEqual(batch.pending_indices(), [1, 2])
+        self.assertEqual(batch.job_match[0], {"code": "A.1"})
+
+
+@ENABLED
+class PreviewRowsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @patch("excel_parser.views.preview_file", return_value=[{"row_key": "r1", "description": "Galian"}])
+    @patch("excel_parser.views.validate_excel_file")
+    def test_reupload_is_served_from_cache(self, _, mock_preview):
+        for _ in range(2):
+            resp = self.client.post("/excel_parser/preview_rows", {"file": _upload(b"rab-bytes")})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json()["rows"][0]["description"], "Galian")
+        self.assertEqual(mock_preview.call_count, 1)
+        self.assertIn("rab.xlsx", self.client.session["preview_digests"])
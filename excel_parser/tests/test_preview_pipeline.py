@@ -0,0 +1,50 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from excel_parser.services.preview_pipeline import PreviewPipeline
+
+
+class PreviewPipelineTests(SimpleTestCase):
+    def test_single_file_parsed_inline_once(self):
+        calls = []
+
+        def parse(file):
+            calls.append((file, threading.current_thread().name))
+            return [{"row_key": file}]
+
+        pipeline = PreviewPipeline(parse=parse)
+        pipeline.add("rows", "legacy.xlsx")
+
+        self.assertEqual(pipeline.run(), {"rows": [{"row_key": "legacy.xlsx"}]})
+        self.assertEqual(calls, [("legacy.xlsx", threading.current_thread().name)])
+
+    def test_multiple_files_parsed_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def parse(file):
+            # Both parses must be in flight at once to pass the barrier.
+            barrier.wait()
+            return [{"file": file}]
+
+        pipeline = PreviewPipeline(parse=parse)
+        pipeline.add("excel_standard", "std.xlsx")
+        pipeline.add("excel_apendo", "apn.xlsx")
+
+        result = pipeline.run()
+
+        self.assertEqual(list(result), ["excel_standard", "excel_apendo"])
+        self.assertEqual(result["excel_apendo"], [{"file": "apn.xlsx"}])
+
+    def test_parse_errors_propagate(self):
+        def parse(file):
+            if file == "bad.xlsx":
+                raise ValueError("broken sheet")
+            return []
+
+        pipeline = PreviewPipeline(parse=parse)
+        pipeline.add("excel_standard", "ok.xlsx")
+        pipeline.add("excel_apendo", "bad.xlsx")
+
+        with self.assertRaisesMessage(ValueError, "broken sheet"):
+            pipeline.run()
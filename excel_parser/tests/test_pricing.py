@@ -0,0 +1,57 @@
+from decimal import Decimal
+from unittest.mock import Mock
+
+from django.test import SimpleTestCase
+
+from automatic_price_matching.price_retrieval import AhspPriceRetriever, MockAhspSource
+from excel_parser.services.pricing import attach_unit_prices
+
+
+class AttachUnitPricesTests(SimpleTestCase):
+    def setUp(self):
+        self.retriever = AhspPriceRetriever(
+            MockAhspSource({"A.1.1": Decimal("1500"), "B.2.2": Decimal("99.999")})
+        )
+
+    def test_prices_single_and_multiple_matches(self):
+        rows = [
+            {"is_section": False, "job_match": {"code": "A.1.1", "confidence": 1.0}},
+            {"is_section": False, "job_match": [{"code": "B-2-2"}, {"code": "Z.9.9"}]},
+            {"is_section": True, "job_match": None},
+        ]
+
+        attach_unit_prices(rows, self.retriever)
+
+        self.assertEqual(rows[0]["job_match"]["unit_price"], "1500.00")
+        self.assertEqual(rows[1]["job_match"][0]["unit_price"], "100.00")
+        self.assertNotIn("unit_price", rows[1]["job_match"][1])
+
+    def test_each_code_resolved_once_in_bulk(self):
+        """Test duplicated codes trigger a single bulk lookup instead of per-row calls"""
+        retriever = Mock()
+        retriever.get_prices_by_job_codes.return_value = {"A.1.1": Decimal("10")}
+        rows = [{"job_match": {"code": "A.1.1"}} for _ in range(50)]
+
+        attach_unit_prices(rows, retriever)
+
+        retriever.get_prices_by_job_codes.assert_called_once_with({"A.1.1"})
+        retriever.get_price_by_job_code.assert_not_called()
+        self.assertTrue(all(r["job_match"]["unit_price"] == "10.00" for r in rows))
+
+    def test_cached_match_dicts_are_not_mutated(self):
+        shared = {"code": "A.1.1"}
+        rows = [{"job_match": shared}]
+
+        attach_unit_prices(rows, self.retriever)
+
+        self.assertNotIn("unit_price", shared)
+        self.assertEqual(rows[0]["job_match"]["unit_price"], "1500.00")
+
+    def test_lookup_failure_leaves_rows_unpriced(self):
+        retriever = Mock()
+        retriever.get_prices_by_job_codes.side_effect = RuntimeError("db down")
+        rows = [{"job_match": {"code": "A.1.1"}}]
+
+        attach_unit_prices(rows, retriever)
+
+        self.assertNotIn("unit_price", rows[0]["job_match"])
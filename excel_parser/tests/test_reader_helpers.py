@@ -96,3 +96,34 @@ class ReaderHeaderAndRowParsingTests(TestCase):
         self.assertEqual(parsed[0].volume, Decimal("1000.50"))
         self.assertEqual(parsed[0].unit, "m3")
         self.assertEqual(parsed[1].volume, Decimal("2.5"))
+
+    def test__split_header_consumes_only_up_to_header(self):
+        consumed = []
+
+        def rows():
+            yield ["Judul RAB"]
+            yield ["No", "Uraian", "Volume", "Satuan"]
+            for i in range(1, 10000):
+                consumed.append(i)
+                yield [str(i), f"Item {i}", "1", "m3"]
+
+        colmap, hdr, body = reader_mod._split_header(rows())
+        self.assertEqual(hdr, 1)
+        self.assertEqual(colmap["unit"], 3)
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(body)[1], "Item 1")
+
+    def test__split_header_limited_to_lookahead(self):
+        rows = [["filler"]] * reader_mod.HEADER_LOOKAHEAD + [["No", "Uraian", "Satuan"]]
+        with self.assertRaises(reader_mod.ParseError):
+            reader_mod._split_header(iter(rows))
+
+    def test__iter_parsed_rows_is_lazy(self):
+        colmap = {"number": 0, "description": 1, "volume": 2, "unit": 3}
+
+        def body():
+            yield ["1", "Item A", "1", "m3"]
+            raise AssertionError("second row should not be read yet")
+
+        parsed = reader_mod._iter_parsed_rows(body(), colmap)
+        self.assertEqual(next(parsed).description, "Item A")
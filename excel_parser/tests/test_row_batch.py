@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from excel_parser.services.reader import ParsedRow
+from excel_parser.services.row_batch import PREVIEW_COLUMNS, PreviewRowBatch
+
+
+def _row(description, volume="1", is_section=False):
+    return ParsedRow("1", description, Decimal(volume), "m3", "", Decimal("1500.255"), Decimal("0"),
+                     is_section=is_section)
+
+
+class PreviewRowBatchTests(SimpleTestCase):
+    def _batch(self):
+        batch = PreviewRowBatch()
+        batch.append("0000-a", _row("PEKERJAAN TANAH", is_section=True), {"status": "skipped", "match": None})
+        batch.append("0001-b", _row("Galian", volume="2.345"), {"status": None, "match": None})
+        batch.append("0002-c", _row("Urugan"), {"status": None, "match": None})
+        return batch
+
+    def test_rows_are_stored_per_column(self):
+        batch = self._batch()
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.description, ["PEKERJAAN TANAH", "Galian", "Urugan"])
+        self.assertEqual(batch.volume[1], "2.35")
+        self.assertEqual(batch.price[0], "1500.26")
+        self.assertFalse(hasattr(batch, "__dict__"))
+
+    def test_pending_matches_are_filled_in_place(self):
+        batch = self._batch()
+        self.assertEqual(batch.pending_indices(), [1, 2])
+        batch.set_match(2, {"status": "error", "match": None, "error": "timeout"})
+        self.assertEqual(batch.pending_indices(), [1])
+        self.assertEqual(batch.job_match_error, [None, None, "timeout"])
+
+    def test_to_dicts_has_preview_shape(self):
+        rows = self._batch().to_dicts()
+        self.assertEqual([list(r) for r in rows], [list(PREVIEW_COLUMNS)] * 3)
+        self.assertEqual(rows[0]["row_key"], "0000-a")
+        self.assertTrue(rows[0]["is_section"])
+        self.assertEqual(rows[1]["job_match_status"], None)
+        self.assertEqual([r["description"] for r in self._batch().iter_dicts(1, 2)], ["Galian"])
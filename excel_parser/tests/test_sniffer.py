@@ -69,3 +69,136 @@ class ExcelSnifferTests(TestCase):
         sniffer = ExcelSniffer()
         with self.assertRaises(ValidationError):
             sniffer.is_valid(file_path)
+
+
+class SnifferStructureTests(TestCase):
+    def _xlsx_bytes(self):
+        from io import BytesIO
+        bio = BytesIO()
+        Workbook().save(bio)
+        return bio.getvalue()
+
+    def _rezip(self, data, drop=None, replace=None):
+        import zipfile
+        from io import BytesIO
+        src = zipfile.ZipFile(BytesIO(data))
+        out = BytesIO()
+        with zipfile.ZipFile(out, "w") as dst:
+            for info in src.infolist():
+                if info.filename == drop:
+                    continue
+                body = src.read(info)
+                if replace and info.filename in replace:
+                    body = replace[info.filename]
+                dst.writestr(info.filename, body)
+        return BytesIO(out.getvalue())
+
+    def test_xlsx_checks_content_types_without_loading_workbook(self):
+        from io import BytesIO
+        from unittest.mock import patch
+        from excel_parser.services.sniffer import sniff_excel
+
+        with patch("openpyxl.load_workbook") as loader:
+            sniff_excel(BytesIO(self._xlsx_bytes()), ".xlsx")
+        loader.assert_not_called()
+
+    def test_xlsx_without_content_types_is_rejected(self):
+        from excel_parser.services.sniffer import SniffError, sniff_xlsx
+
+        with self.assertRaises(SniffError):
+            sniff_xlsx(self._rezip(self._xlsx_bytes(), drop="[Content_Types].xml"))
+
+    def test_xlsx_missing_workbook_part_is_rejected(self):
+        from excel_parser.services.sniffer import SniffError, sniff_xlsx
+
+        with self.assertRaises(SniffError):
+            sniff_xlsx(self._rezip(self._xlsx_bytes(), drop="xl/workbook.xml"))
+
+    def test_zip_that_is_not_a_workbook_is_rejected(self):
+        from excel_parser.services.sniffer import SniffError, sniff_xlsx
+
+        data = self._xlsx_bytes()
+        with self.assertRaises(SniffError):
+            sniff_xlsx(self._rezip(data, replace={"[Content_Types].xml": b"<Types/>"}))
+
+    def test_xls_with_bad_biff_record_is_rejected(self):
+        if not XlsWorkbook:
+            self.skipTest("xlwt not installed")
+        from io import BytesIO
+        from excel_parser.services.sniffer import SniffError, sniff_xls
+
+        wb = XlsWorkbook()
+        wb.add_sheet("Sheet1").write(0, 0, "x")
+        bio = BytesIO()
+        wb.save(bio)
+        data = bytearray(bio.getvalue())
+        sniff_xls(BytesIO(bytes(data)))
+
+        data[512:514] = b"\xff\xff"  # first sector of the Workbook stream
+        with self.assertRaises(SniffError):
+            sniff_xls(BytesIO(bytes(data)))
+
+    def test_xlsx_content_types_with_reordered_single_quoted_attributes(self):
+        from excel_parser.services.sniffer import sniff_xlsx
+
+        content_types = (
+            b"<?xml version='1.0' encoding='UTF-8'?>"
+            b"<Types xmlns='http://schemas.openxmlformats.org/package/2006/content-types'>"
+            b"<Override ContentType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml'"
+            b"  PartName='/xl/workbook.xml'/>"
+            b"</Types>"
+        )
+        sniff_xlsx(self._rezip(self._xlsx_bytes(), replace={"[Content_Types].xml": content_types}))
+
+    def test_xlsx_with_malformed_content_types_is_rejected(self):
+        from excel_parser.services.sniffer import SniffError, sniff_xlsx
+
+        with self.assertRaises(SniffError):
+            sniff_xlsx(self._rezip(self._xlsx_bytes(), replace={"[Content_Types].xml": b"<Types"}))
+
+    def _compound_document(self, dir_chain):
+        """A v3 compound document whose Workbook entry is in the second directory sector.
+
+        Sector 0 is the FAT, sectors 1 and 2 the directory, sectors 3-10 the
+        Workbook stream; ``dir_chain`` is the FAT entry for sector 1.
+        """
+        import struct
+
+        free, end = 0xFFFFFFFF, 0xFFFFFFFE
+        header = bytearray(512)
+        header[:8] = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+        struct.pack_into("<HHHHH", header, 0x18, 0x3E, 3, 0xFFFE, 9, 6)
+        struct.pack_into("<IIIIIIII", header, 0x2C, 1, 1, 0, 4096, end, 0, end, 0)
+        struct.pack_into("<109I", header, 0x4C, 0, *[free] * 108)
+
+        fat = [0xFFFFFFFD, dir_chain, end] + list(range(4, 11)) + [end]
+        fat_sector = struct.pack("<128I", *fat, *[free] * (128 - len(fat)))
+
+        def entry(name, kind, start=end, size=0):
+            raw = bytearray(128)
+            encoded = (name + "\0").encode("utf-16-le") if name else b""
+            raw[:len(encoded)] = encoded
+            struct.pack_into("<HB", raw, 0x40, len(encoded), kind)
+            struct.pack_into("<III", raw, 0x44, free, free, free)
+            struct.pack_into("<II", raw, 0x74, start, size)
+            return bytes(raw)
+
+        dir_a = entry("Root Entry", 5) + entry("", 0) * 3
+        dir_b = entry("Workbook", 2, start=3, size=4096) + entry("", 0) * 3
+        stream = struct.pack("<HH", 0x0809, 16) + bytes(4092)
+        return bytes(header) + fat_sector + dir_a + dir_b + stream
+
+    def test_xls_workbook_entry_in_later_directory_sector(self):
+        from io import BytesIO
+        from excel_parser.services.sniffer import sniff_xls
+
+        sniff_xls(BytesIO(self._compound_document(dir_chain=2)))
+
+    def test_xls_directory_chain_is_followed_through_the_fat(self):
+        from io import BytesIO
+        from excel_parser.services.sniffer import SniffError, sniff_xls
+
+        with self.assertRaises(SniffError):
+            sniff_xls(BytesIO(self._compound_document(dir_chain=0xFFFFFFFE)))
+        with self.assertRaises(SniffError):
+            sniff_xls(BytesIO(self._compound_document(dir_chain=1)))  # loops on itself
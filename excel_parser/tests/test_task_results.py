@@ -0,0 +1,129 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from excel_parser.models import TaskResultPage
+from excel_parser.services.task_results import (
+    load_rows, progress, progress_meta, purge_pages, save_page, save_pages, task_status_payload
+)
+
+
+def _rows(n, start=0):
+    return [{"description": f"Item {i}"} for i in range(start, start + n)]
+
+
+class TaskResultPageStoreTests(TestCase):
+    def test_pages_round_trip_in_order(self):
+        save_pages("t1", _rows(5), page_size=2)
+        self.assertEqual(TaskResultPage.objects.filter(task_id="t1").count(), 3)
+        self.assertEqual(load_rows("t1"), _rows(5))
+        self.assertEqual(load_rows("t1", page=1), _rows(2, start=2))
+        self.assertEqual(load_rows("t1", page=9), [])
+
+    def test_save_page_replaces_existing_page(self):
+        save_page("t1", 0, _rows(3))
+        save_page("t1", 0, _rows(1, start=7))
+        page = TaskResultPage.objects.get(task_id="t1")
+        self.assertEqual((page.row_count, page.rows), (1, _rows(1, start=7)))
+
+    def test_save_page_omits_conflict_target_where_backend_cannot_name_one(self):
+        from django.db import connection
+
+        # Like MySQL: Django raises NotSupportedError if unique_fields is passed.
+        with patch.object(connection.features, "supports_update_conflicts_with_target", False):
+            save_pages("t1", _rows(3), page_size=2)
+        self.assertEqual(load_rows("t1"), _rows(3))
+
+    def test_purge_pages_removes_old_pages(self):
+        save_pages("old", _rows(2))
+        TaskResultPage.objects.update(created_at=timezone.now() - timedelta(days=2))
+        save_pages("new", _rows(2))
+        self.assertEqual(purge_pages(timezone.now() - timedelta(days=1)), 1)
+        self.assertEqual(list(TaskResultPage.objects.values_list("task_id", flat=True)), ["new"])
+
+    @override_settings(TASK_RESULT_PAGE_MAX_AGE=60 * 60)
+    def test_periodic_task_purges_pages_past_max_age(self):
+        from django.conf import settings
+        from excel_parser.tasks import purge_task_result_pages_task
+
+        save_pages("old", _rows(2))
+        TaskResultPage.objects.update(created_at=timezone.now() - timedelta(hours=2))
+        save_pages("new", _rows(2))
+
+        self.assertEqual(purge_task_result_pages_task.apply().get(), 1)
+        self.assertEqual(list(TaskResultPage.objects.values_list("task_id", flat=True)), ["new"])
+        self.assertEqual(
+            settings.CELERY_BEAT_SCHEDULE["purge-task-result-pages"]["task"],
+            purge_task_result_pages_task.name,
+        )
+
+
+class ProgressTests(TestCase):
+    def test_reports_rows_rate_and_eta(self):
+        save_page("t1", 0, _rows(100))
+        save_page("t1", 2, _rows(100))
+        meta = progress_meta("Matching rows...", rows_total=400, pages_total=4, started_at=time.time() - 10)
+        result = progress("t1", meta)
+        self.assertEqual(result["rows_done"], 200)
+        self.assertEqual((result["pages_done"], result["pages_total"]), (2, 4))
+        self.assertAlmostEqual(result["rows_per_second"], 20, delta=1)
+        self.assertAlmostEqual(result["eta_seconds"], 10, delta=1)
+
+    def test_no_rows_yet_has_no_eta(self):
+        result = progress("t1", progress_meta("Matching rows...", 50, 1))
+        self.assertEqual(result["rows_done"], 0)
+        self.assertIsNone(result["rows_per_second"])
+        self.assertIsNone(result["eta_seconds"])
+
+    def test_unknown_totals_report_rows_without_eta(self):
+        save_pages("t1", _rows(3), page_size=2)
+        result = progress("t1", progress_meta("Parsing PDF file...", None, None, time.time() - 1))
+        self.assertEqual((result["rows_done"], result["pages_done"]), (3, 2))
+        self.assertIsNone(result["rows_total"])
+        self.assertIsNotNone(result["rows_per_second"])
+        self.assertIsNone(result["eta_seconds"])
+
+    def test_stage_only_meta_has_no_progress(self):
+        self.assertEqual(progress("t1", {"status": "Reading Excel file..."}), {})
+
+
+class TaskStatusPayloadTests(TestCase):
+    def test_success_reads_rows_from_pages(self):
+        save_pages("t1", _rows(3), page_size=2)
+        task = SimpleNamespace(id="t1", state="SUCCESS", result={"job_id": 5, "rows_total": 3})
+        payload = task_status_payload(task)
+        self.assertEqual(payload["result"]["rows"], _rows(3))
+        self.assertEqual(payload["result"]["job_id"], 5)
+
+        payload = task_status_payload(task, page=1)
+        self.assertEqual(payload["result"]["rows"], _rows(1, start=2))
+        self.assertEqual(payload["page"], 1)
+
+    def test_processing_serves_partial_page(self):
+        save_page("t1", 0, _rows(2))
+        meta = progress_meta("Matching rows...", 4, 2)
+        task = SimpleNamespace(id="t1", state="PROCESSING", info=meta)
+        payload = task_status_payload(task, page=0)
+        self.assertEqual(payload["status"], "Matching rows...")
+        self.assertEqual(payload["rows_done"], 2)
+        self.assertEqual(payload["rows"], _rows(2))
+
+
+class TaskStatusViewTests(TestCase):
+    @patch("excel_parser.views.AsyncResult")
+    def test_excel_task_status_returns_requested_page(self, mock_result):
+        save_pages("t1", _rows(3), page_size=2)
+        mock_result.return_value = SimpleNamespace(id="t1", state="SUCCESS", result={"job_id": 1})
+        resp = self.client.get("/excel_parser/task_status/t1", {"page": "1"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["result"]["rows"], _rows(1, start=2))
+
+    @patch("pdf_parser.views.AsyncResult")
+    def test_pdf_task_status_rejects_bad_page(self, mock_result):
+        resp = self.client.get("/pdf_parser/task_status/t1", {"page": "-1"})
+        self.assertEqual(resp.status_code, 400)
+        mock_result.assert_not_called()
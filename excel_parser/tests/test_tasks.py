@@ -0,0 +1,68 @@
+import os
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from openpyxl import Workbook
+
+from cost_weight.models import TestJob
+from excel_parser import tasks
+from excel_parser.models import TaskResultPage
+from excel_parser.services.task_results import load_rows
+
+
+def _fake_match(descriptions):
+    return {d: {"status": "found", "match": {"description": d}} for d in descriptions}
+
+
+@patch("excel_parser.tasks.attach_unit_prices", side_effect=lambda rows, *a, **k: rows)
+@patch("excel_parser.services.reader.match_descriptions", side_effect=_fake_match)
+@patch("celery.app.task.Task.update_state")
+class ProcessExcelFileTaskTests(TestCase):
+    def _workbook_path(self, rows):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["No", "Uraian Pekerjaan", "Volume", "Satuan", "Harga Satuan"])
+        for i in range(1, rows + 1):
+            ws.append([i, f"Pekerjaan {i}", 2, "m3", 1000])
+        bio = BytesIO()
+        wb.save(bio)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
+            tmp.write(bio.getvalue())
+        return tmp.name
+
+    @override_settings(EXCEL_TASK_CHUNK_SIZE=4)
+    def test_large_file_fans_out_into_chunk_tasks(self, mock_state, mock_match, _):
+        path = self._workbook_path(10)
+        with patch.object(tasks.match_excel_chunk_task, "run", wraps=tasks.match_excel_chunk_task.run) as chunk_run:
+            result = tasks.process_excel_file_task.apply(args=(path, "big.xlsx")).get()
+
+        self.assertEqual(chunk_run.call_count, 3)
+        self.assertEqual(mock_match.call_count, 3)
+        self.assertNotIn("rows", result)
+        self.assertEqual((result["rows_total"], result["pages_total"]), (10, 3))
+        task_id = TaskResultPage.objects.values_list("task_id", flat=True).first()
+        self.assertEqual(list(TaskResultPage.objects.values_list("page", "row_count")), [(0, 4), (1, 4), (2, 2)])
+        rows = load_rows(task_id)
+        self.assertEqual([r["description"] for r in rows], [f"Pekerjaan {i}" for i in range(1, 11)])
+        self.assertTrue(all(r["job_match_status"] == "found" for r in rows))
+        self.assertEqual(TestJob.objects.get(pk=result["job_id"]).items.count(), 10)
+        self.assertFalse(os.path.exists(path))
+
+        meta = [c.kwargs["meta"] for c in mock_state.call_args_list if "rows_total" in c.kwargs["meta"]]
+        self.assertEqual(len(meta), 1)
+        self.assertEqual(meta[0]["pages_total"], 3)
+        self.assertEqual(meta[0]["rows_total"], 10)
+
+    def test_small_file_is_processed_in_one_task(self, mock_state, mock_match, _):
+        path = self._workbook_path(3)
+        with patch.object(tasks.match_excel_chunk_task, "run") as chunk_run:
+            result = tasks.process_excel_file_task.apply(args=(path, "small.xlsx", "apendo")).get()
+
+        chunk_run.assert_not_called()
+        self.assertEqual(result["rows_total"], 3)
+        self.assertEqual(len(load_rows(TaskResultPage.objects.get().task_id)), 3)
+        self.assertEqual(result["file_type"], "apendo")
+        self.assertEqual(result["status"], "completed")
+        self.assertTrue(TestJob.objects.filter(pk=result["job_id"]).exists())
@@ -13,9 +13,8 @@ class ViewsTests(TestCase):
     # ==== detect_headers ====
     @patch("excel_parser.views.load_workbook")
     @patch("excel_parser.views.validate_excel_file")
-    @patch("excel_parser.views.find_header_row", return_value=0)
     @patch("excel_parser.views.map_headers", return_value=({"no": 0}, [], {"no": "No"}))
-    def test_detect_headers_success(self, mock_map, mock_find, mock_validate, mock_load):
+    def test_detect_headers_success(self, mock_map, mock_validate, mock_load):
         mock_ws = MagicMock()
         mock_ws.title = "Sheet1"
         mock_ws.iter_rows.return_value = [[1, 2, 3]]
@@ -64,6 +63,23 @@ class ViewsTests(TestCase):
         self.assertIn("rows", resp.json())
         self.assertEqual(resp.json()["rows"][0]["volume"], 1)
 
+    @patch("excel_parser.views.preview_file", return_value=[{"row_key": "r1", "volume": 1}])
+    @patch("excel_parser.views.validate_excel_file")
+    def test_preview_rows_applies_stored_overrides(self, mock_validate, mock_preview):
+        import json
+
+        self.client.post(
+            "/api/recompute_total_cost/",
+            json.dumps({"row_key": "r1", "code": "A.1", "volume": "4", "unit_price": "10"}),
+            content_type="application/json",
+        )
+        file = SimpleUploadedFile("file.xlsx", b"ok", content_type="application/vnd.ms-excel")
+        resp = self.client.post("/excel_parser/preview_rows", {"file": file})
+        self.assertEqual(resp.status_code, 200)
+        row = resp.json()["rows"][0]
+        self.assertEqual(row["volume"], "4.00")
+        self.assertEqual(row["price"], "10.00")
+
     @patch("excel_parser.views.preview_file", return_value=[{"row_key": "r1", "volume": 1}])
     @patch("excel_parser.views.validate_excel_file")
     def test_preview_rows_extended_excel_apendo_pdf(self, mock_validate, mock_preview):
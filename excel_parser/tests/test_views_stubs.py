@@ -29,3 +29,19 @@ class PreviewRowsStubTests(TestCase):
 
         # Ensure preview_file was called exactly once
         mock_preview.assert_called_once()
+
+    @patch("excel_parser.views.preview_file")
+    @patch("excel_parser.views.validate_excel_file")
+    def test_preview_rows_standard_path_parses_once(self, mock_validate, mock_preview):
+        mock_preview.return_value = [
+            {"row_key": "abc123", "volume": 2, "price": 100, "description": "Item A", "is_section": False}
+        ]
+
+        file = SimpleUploadedFile("std.xlsx", b"123", content_type="application/vnd.ms-excel")
+        response = self.client.post("/excel_parser/preview_rows", {"excel_standard": file})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["excel_standard"][0]["row_key"], "abc123")
+        self.assertIn("job_id", data)
+        mock_preview.assert_called_once()
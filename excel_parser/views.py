@@ -2,9 +2,9 @@ from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
 from django.core.exceptions import ValidationError
-from decimal import Decimal
 import tempfile
 import os
+from functools import partial
 
 from rest_framework.decorators import api_view, parser_classes
 from rest_framework.parsers import MultiPartParser
@@ -13,11 +13,20 @@ from celery.result import AsyncResult
 
 from openpyxl import load_workbook
 
-from .services.header_mapper import map_headers, find_header_row
-from .services.reader import preview_file
+from .services.header_mapper import map_headers
+from .services.header_probe import PROBE_MAX_ROWS, probe_header_row, record_rows
+from .services.parse_cache import cached_preview
+from .services.preview_pipeline import PreviewPipeline
+from .services.reader import preview_file, remember_header_row
 from .services.validators import validate_excel_file
-from cost_weight.models import TestJob, TestItem
+from cost_weight.services.job_builder import build_job_from_rows
+from automatic_price_matching.override_store import load_overrides
 from .tasks import process_excel_file_task
+from .services.task_results import task_status_payload
+
+# Session key holding {upload name: digest of its last preview}, for diff previews
+PREVIEW_DIGESTS_SESSION_KEY = "preview_digests"
+MAX_PREVIEW_DIGESTS = 20
 
 # Template constant
 EXCEL_UPLOAD_TEMPLATE = 'excel_upload.html'
@@ -48,15 +57,22 @@ def detect_headers(request):
             return Response({"detail": str(ve)}, status=400)
 
         wb = load_workbook(f, data_only=True, read_only=True)
-        ws = wb[wb.sheetnames[0]]
-        rows = [list(r) for r in ws.iter_rows(values_only=True, min_row=1, max_row=200)]
-
-        hdr_idx = find_header_row(rows)
-        if hdr_idx < 0:
+        try:
+            ws = wb[wb.sheetnames[0]]
+            # Stream rows and stop at the first one that maps every required header.
+            probed = []
+            probe = probe_header_row(
+                record_rows(ws.iter_rows(values_only=True, min_row=1, max_row=PROBE_MAX_ROWS), probed),
+                map_headers=map_headers,
+            )
+        finally:
+            wb.close()
+
+        if probe is None:
             return Response({"detail": "header not found"}, status=422)
 
-        header_row = [str(c or '') for c in rows[hdr_idx]]
-        mapping, missing, originals = map_headers(header_row)
+        hdr_idx, _, (mapping, missing, originals) = probe
+        remember_header_row(f, probed)
 
         return Response({
             "sheet": ws.title,
@@ -94,40 +110,29 @@ def preview_rows(request):
         pdf_file = request.FILES.get("pdf_file")
 
         results = {}
-        session_overrides = request.session.get("rab_overrides", {})
 
-        # === Legacy path ===
-        if legacy_file:
-            validate_excel_file(legacy_file)
-            rows = preview_file(legacy_file)
-            _apply_preview_overrides(rows, session_overrides)
-            
-            # Create TestJob from rows
-            job = _create_test_job_from_rows(rows, legacy_file.name)
-            
-            results["rows"] = rows
-            results["job_id"] = job.id
-
-        # === Extended path ===
-        if excel_standard:
-            validate_excel_file(excel_standard)
-            excel_rows = preview_file(excel_standard)
-            _apply_preview_overrides(excel_rows, session_overrides)
-            
-            # Create TestJob from rows
-            job = _create_test_job_from_rows(excel_rows, excel_standard.name)
-            
-            results["excel_standard"] = excel_rows
-            results["job_id"] = job.id
-            excel_rows = preview_file(excel_standard)
-            _apply_preview_overrides(excel_rows, session_overrides)
-            results["excel_standard"] = excel_rows
-
-        if excel_apendo:
-            validate_excel_file(excel_apendo)
-            apendo_rows = preview_file(excel_apendo)
-            _apply_preview_overrides(apendo_rows, session_overrides)
-            results["excel_apendo"] = apendo_rows
+        # Each workbook is parsed exactly once; standard and APENDO run concurrently.
+        # Re-uploads of identical bytes come from the parse cache, and edited
+        # re-uploads of a file previewed in this session only re-match changed rows.
+        digests = dict(request.session.get(PREVIEW_DIGESTS_SESSION_KEY, {}))
+        pipeline = PreviewPipeline(parse=partial(cached_preview, parse=preview_file, previous=digests))
+        for key, upload in (("rows", legacy_file), ("excel_standard", excel_standard), ("excel_apendo", excel_apendo)):
+            if upload:
+                validate_excel_file(upload)
+                pipeline.add(key, upload)
+
+        for key, rows in pipeline.run().items():
+            _apply_preview_overrides(rows, _load_row_overrides(request, rows))
+            results[key] = rows
+        if digests:
+            request.session[PREVIEW_DIGESTS_SESSION_KEY] = dict(list(digests.items())[-MAX_PREVIEW_DIGESTS:])
+
+        # Create TestJob from the same rows returned to the client
+        # (legacy first, so the standard upload's job_id wins when both are sent)
+        for key, upload in (("rows", legacy_file), ("excel_standard", excel_standard)):
+            if key in results:
+                job = build_job_from_rows(results[key], upload.name)
+                results["job_id"] = job.id
 
         if pdf_file:
             validate_pdf_file(pdf_file)
@@ -257,45 +262,27 @@ def preview_rows_async(request):
 @api_view(['GET'])
 def task_status(request, task_id):
     """
-    GET /excel_parser/task_status/<task_id>
-    Check the status of an async task.
+    GET /excel_parser/task_status/<task_id>[?page=N]
+    Check the status of an async task: progress while it runs, and its rows
+    (all of them, or only page N) once stored.
     """
+    page = request.GET.get("page")
+    if page is not None:
+        if not page.isdigit():
+            return Response({"error": "page must be a non-negative integer"}, status=400)
+        page = int(page)
+
     try:
         task = AsyncResult(task_id)
-        
-        if task.state == 'PENDING':
-            response = {
-                'state': task.state,
-                'status': 'Task is waiting to be processed...'
-            }
-        elif task.state == 'PROCESSING':
-            response = {
-                'state': task.state,
-                'status': task.info.get('status', 'Processing...'),
-            }
-        elif task.state == 'SUCCESS':
-            response = {
-                'state': task.state,
-                'result': task.result,
-                'status': 'completed'
-            }
-        elif task.state == 'FAILURE':
-            response = {
-                'state': task.state,
-                'status': str(task.info),
-                'error': str(task.info)
-            }
-        else:
-            response = {
-                'state': task.state,
-                'status': str(task.info)
-            }
-        
-        return Response(response)
-        
+        return Response(task_status_payload(task, page))
+
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
+def _load_row_overrides(request, rows):
+    return load_overrides(request, (row.get("row_key") for row in rows))
+
+
 def _apply_preview_overrides(rows, overrides):
     if not overrides:
         return
@@ -318,54 +305,3 @@ def _apply_preview_overrides(rows, overrides):
         total_price = data.get("total_price")
         if total_price is not None:
             row["total_price"] = total_price
-
-
-def _create_test_job_from_rows(rows, filename="Uploaded File"):
-    """
-    Create TestJob and TestItems from parsed rows
-    Returns the created TestJob instance
-    """
-    # Create job
-    job = TestJob.objects.create(name=f"RAB - {filename}")
-    
-    # Create items from rows (skip section headers)
-    for row in rows:
-        # Skip section/category rows
-        if row.get("is_section") or row.get("job_match_status") == "skipped":
-            continue
-            
-        description = row.get("description", "Unknown Item")
-        if not description or description.strip() == "":
-            continue
-            
-        # Parse quantity and price
-        try:
-            quantity = Decimal(str(row.get("volume", 0)))
-            if quantity <= 0:
-                quantity = Decimal("1")
-        except (ValueError, TypeError, KeyError):
-            quantity = Decimal("1")
-            
-        try:
-            unit_price = Decimal(str(row.get("price", 0)))
-            if unit_price < 0:
-                unit_price = Decimal("0")
-        except (ValueError, TypeError, KeyError):
-            unit_price = Decimal("0")
-
-        # Get AHSP code from analysis_code column
-        ahsp_code = row.get("analysis_code", "").strip() if row.get("analysis_code") else None
-
-        # Create item with ahsp_code
-        TestItem.objects.create(
-            job=job,
-            name=description,
-            quantity=quantity,
-            unit_price=unit_price,
-            ahsp_code=ahsp_code if ahsp_code else None
-        )
-    
-    # Calculate totals and weights
-    job.calculate_totals()
-    
-    return job
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+NumPy-backed view over one page's text fragments.
+
+``FragmentArrays`` keeps the fragments' x and y coordinates in parallel float
+arrays next to the fragment list, so the row parser can filter the page body,
+bucket rows by y and order cells by x with array operations instead of
+per-fragment Python loops. Fragments themselves are only looked up again
+(via :meth:`FragmentArrays.take`) when cell text is needed.
+"""
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from pdf_parser.services.pdfreader import TextFragment
+
+
+class FragmentArrays:
+    """Parallel ``x``/``y`` arrays for a sequence of fragments."""
+
+    __slots__ = ("fragments", "x", "y")
+
+    def __init__(self, fragments: Sequence[TextFragment]):
+        self.fragments = list(fragments)
+        n = len(self.fragments)
+        self.x = np.fromiter((f.x for f in self.fragments), dtype=np.float64, count=n)
+        self.y = np.fromiter((f.y for f in self.fragments), dtype=np.float64, count=n)
+
+    def __len__(self) -> int:
+        return len(self.fragments)
+
+    def take(self, indices) -> List[TextFragment]:
+        fragments = self.fragments
+        return [fragments[i] for i in indices.tolist()]
+
+    def below(self, y: float) -> "FragmentArrays":
+        """The fragments strictly below ``y`` (larger y), in their original order."""
+        subset = FragmentArrays.__new__(FragmentArrays)
+        mask = self.y > y
+        subset.fragments = self.take(np.flatnonzero(mask))
+        subset.x = self.x[mask]
+        subset.y = self.y[mask]
+        return subset
+
+    def group_rows(self, precision: int, tolerance: float) -> List[Tuple[float, np.ndarray]]:
+        """
+        Bucket fragments into visual rows: ``[(mean y, indices sorted by x)]`` by mean y.
+
+        Fragments share a row when they round to the same y bucket and each is
+        within ``tolerance`` of the previous one in y order.
+        """
+        if not len(self):
+            return []
+        keys = np.round(self.y, precision)
+        order = np.lexsort((self.y, keys))
+        sorted_y = self.y[order]
+        breaks = np.flatnonzero((np.diff(keys[order]) != 0) | (np.diff(sorted_y) > tolerance)) + 1
+
+        ys = sorted_y.tolist()
+        bounds = [0, *breaks.tolist(), len(ys)]
+        rows = []
+        for start, stop in zip(bounds, bounds[1:]):
+            indices = order[start:stop]
+            by_x = indices[np.argsort(self.x[indices], kind="stable")]
+            rows.append((sum(ys[start:stop]) / (stop - start), by_x))
+        rows.sort(key=lambda row: row[0])
+        return rows
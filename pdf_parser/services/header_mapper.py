@@ -1,15 +1,15 @@
 
-from dataclasses import dataclass
 import re
 from collections import defaultdict
 
+from excel_parser.services.header_aliases import HeaderAliasTable
+from pdf_parser.services.pdfreader import TextFragment
 
-@dataclass
-class TextFragment:
-    page: int
-    x: float
-    y: float
-    text: str
+
+def _normalize_header(text) -> str:
+    if not text:
+        return ""
+    return re.sub(r"\s+", " ", str(text).strip().lower())
 
 
 class PdfHeaderMapper:
@@ -59,13 +59,14 @@ class PdfHeaderMapper:
         ]
     }
 
+    # Built once; header rows are scanned for every alias of every column.
+    _ALIASES = HeaderAliasTable(EXPECTED_HEADERS, normalize=_normalize_header)
+
     def __init__(self, y_tolerance: float = 0.5):
         self.y_tolerance = y_tolerance
 
     def normalize(self, text: str) -> str:
-        if not text:
-            return ""
-        return re.sub(r"\s+", " ", text.strip().lower())
+        return _normalize_header(text)
 
     def find_header_y(self, fragments):
         """
@@ -84,9 +85,7 @@ class PdfHeaderMapper:
             return None
 
         # First, try to find rows that contain expected header keywords
-        header_keywords = set()
-        for variants in self.EXPECTED_HEADERS.values():
-            header_keywords.update(variants)
+        header_keywords = self._ALIASES.aliases
 
         best_y = None
         best_score = -1
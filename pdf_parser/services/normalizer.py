@@ -1,8 +1,10 @@
 # pdf_parser/services/normalizer.py
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
 from typing import Dict
 import re
 
+from automatic_price_matching.numeric import parse_decimal
+
 # common unit tokens in RAB documents (lowercased, punctuation-free)
 _UNIT_TOKENS = {
     "ls", "m", "m1", "m2", "m3", "mm", "cm", "cm2", "cm3", "kg", "ton",
@@ -40,21 +42,8 @@ def _split_number_from_desc(desc: str) -> tuple[str, str]:
 def _decimal(val) -> Decimal:
     if not val:
         return Decimal("0")
-    try:
-        s = str(val).strip()
-        # normalize 1.000,50 -> 1000.50, 1,000.50 -> 1000.50
-        s = s.replace(" ", "")
-        if "," in s and "." not in s:
-            s = s.replace(".", "").replace(",", ".")
-        elif "," in s and "." in s:
-            if s.rfind(",") > s.rfind("."):
-                s = s.replace(".", "").replace(",", ".")
-            else:
-                s = s.replace(",", "")
-        s = re.sub(r"[^\d\.-]", "", s)
-        return Decimal(s) if s not in {"", "-", "."} else Decimal("0")
-    except (InvalidOperation, AttributeError):
-        return Decimal("0")
+    # normalize 1.000,50 -> 1000.50, 1,000.50 -> 1000.50
+    return parse_decimal(val, reject_expressions=False)
 
 
 def _clean_unit_and_desc(unit_text: str) -> tuple[str, str]:
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from collections import defaultdict
 import re
+import numpy as np
+from pdf_parser.services.fragment_store import FragmentArrays
 from pdf_parser.services.header_mapper import PdfHeaderMapper, TextFragment
 from pdf_parser.services.normalizer import _UNIT_TOKENS   # ✅ import tokens
 
@@ -11,6 +13,60 @@ class ParsedRow:
     y: float
     values: Dict[str, str]   # {"no": "1", "uraian": "Pekerjaan A", "volume": "10", "satuan": "m2"}
 
+class ColumnModel:
+    """
+    Nearest-column lookup for one set of x-boundaries, built once per page.
+
+    Column centers are kept as a sorted NumPy array so a whole page of
+    fragment x positions is assigned with one ``searchsorted`` pass. Ties go
+    to the column listed first in ``boundaries``, as with the ``min()`` scan
+    this replaces.
+    """
+
+    __slots__ = ("keys", "_centers", "_columns")
+
+    def __init__(
+        self,
+        boundaries: Dict[str, Tuple[float, float]],
+        header_map: Optional[Dict[str, TextFragment]] = None,
+    ):
+        self.keys: List[str] = list(boundaries.keys())
+        header_map = header_map or {}
+        first_column_at: Dict[float, int] = {}
+        for index, (key, (xmin, xmax)) in enumerate(boundaries.items()):
+            header_fragment = header_map.get(key)
+            if header_fragment:
+                center = header_fragment.x
+            elif xmin == float("-inf") and xmax == float("inf"):
+                center = 0.0
+            elif xmin == float("-inf"):
+                center = xmax - 50.0
+            elif xmax == float("inf"):
+                center = xmin + 50.0
+            else:
+                center = (xmin + xmax) / 2.0
+            # A column sharing its center with an earlier one can never win.
+            first_column_at.setdefault(center, index)
+        centers = sorted(first_column_at)
+        self._centers = np.array(centers, dtype=np.float64)
+        self._columns = np.array([first_column_at[c] for c in centers], dtype=np.intp)
+
+    def nearest(self, xs) -> np.ndarray:
+        """Index into :attr:`keys` of the nearest column center for each x."""
+        xs = np.asarray(xs, dtype=np.float64)
+        if not len(self._centers):
+            raise ValueError("ColumnModel has no columns")
+        last = len(self._centers) - 1
+        right = np.searchsorted(self._centers, xs)
+        left = np.clip(right - 1, 0, last)
+        right = np.clip(right, 0, last)
+        left_dist = np.abs(xs - self._centers[left])
+        right_dist = np.abs(xs - self._centers[right])
+        left_col = self._columns[left]
+        right_col = self._columns[right]
+        take_right = (right_dist < left_dist) | ((right_dist == left_dist) & (right_col < left_col))
+        return np.where(take_right, right_col, left_col)
+
 class PdfRowParser:
     """
     Parse table-like rows from PDF text fragments:
@@ -32,38 +88,54 @@ class PdfRowParser:
         self.y_tolerance = y_tolerance
         self.header_gap_px = header_gap_px
         self.x_merge_gap = x_merge_gap
+        self.last_boundaries: Dict[str, Tuple[float, float]] = {}
 
     def parse(self, fragments, vlines_by_page=None):
-        parsed_rows = []
-        last_boundaries = {}
-        last_header_y = None
-
         frags_by_page = self._group_fragments_by_page(fragments)
+        pages = ((page, frags_by_page[page]) for page in sorted(frags_by_page.keys()))
+        parsed_rows = list(self.iter_rows(pages, vlines_by_page))
+        return parsed_rows, self.last_boundaries
 
-        for page in sorted(frags_by_page.keys()):
-            page_frags = frags_by_page[page]
+    def iter_rows(
+        self,
+        pages: Iterable[Tuple[int, List[TextFragment]]],
+        vlines_by_page=None,
+    ) -> Iterator[ParsedRow]:
+        """
+        Yield rows from ``(page_number, fragments)`` pairs, one page at a time.
+
+        Header boundaries carry over to pages without their own header, so
+        ``pages`` can be a lazy reader and the first rows are available before
+        later pages are read. ``self.last_boundaries`` holds the boundaries in
+        effect once the generator is exhausted.
+        """
+        self.last_boundaries = {}
+        last_header_y = None
+
+        for page, page_frags in pages:
             vlines = (vlines_by_page or {}).get(page) or []
 
             boundaries, header_y = self._detect_headers_and_boundaries(
-                page_frags, last_boundaries, last_header_y, vlines
+                page_frags, self.last_boundaries, last_header_y, vlines
             )
 
             if boundaries is None:
                 continue
 
             # update state
-            last_boundaries = boundaries
+            self.last_boundaries = boundaries
             last_header_y = header_y
 
             # 3. body fragments
-            body_frags = [f for f in page_frags if f.y > header_y + self.header_gap_px]
+            body_frags = FragmentArrays(page_frags).below(header_y + self.header_gap_px)
 
-            # 4. rows grouped by y
-            grouped_rows = self._group_by_y(body_frags)
+            # 4. nearest column for every body fragment, in one pass per page
+            model = ColumnModel(boundaries)
+            columns = model.nearest(body_frags.x) if len(body_frags) else None
 
-            # 5. assign & merge
-            for y, row_frags in grouped_rows:
-                cells = self._assign_to_columns(row_frags, boundaries)
+            # 5. rows grouped by y (cells come out x-sorted), assign & merge
+            for y, indices in body_frags.group_rows(self.y_bucket_precision, self.y_tolerance):
+                cells = self._fill_cells(body_frags.take(indices), columns[indices].tolist(), model)
                 values = {k: self._merge_cell_text(v) for k, v in cells.items()}
 
                 # heuristic
@@ -72,9 +144,7 @@ class PdfRowParser:
                     values["satuan"] = ""
                     values["volume"] = "0"
 
-                parsed_rows.append(ParsedRow(page=page, y=y, values=values))
-
-        return parsed_rows, last_boundaries
+                yield ParsedRow(page=page, y=y, values=values)
 
 
 
@@ -135,31 +205,13 @@ class PdfRowParser:
             boundaries[key] = (xmin, xmax)
         return boundaries
 
-    def _group_by_y(self, row_frags: List[TextFragment]) -> List[Tuple[float, List[TextFragment]]]:
-        if not row_frags:
-            return []
-        buckets = defaultdict(list)
-        for f in row_frags:
-            buckets[round(f.y, self.y_bucket_precision)].append(f)
-
-        normalized_rows = []
-        for y_key, frags in buckets.items():
-            frags_sorted = sorted(frags, key=lambda f: f.y)
-            current_group = [frags_sorted[0]]
-            groups = []
-            for f in frags_sorted[1:]:
-                if abs(f.y - current_group[-1].y) <= self.y_tolerance:
-                    current_group.append(f)
-                else:
-                    groups.append(current_group)
-                    current_group = [f]
-            groups.append(current_group)
-            for g in groups:
-                avg_y = sum(f.y for f in g) / len(g)
-                normalized_rows.append((avg_y, g))
-        normalized_rows.sort(key=lambda t: t[0])
-        normalized_rows = [(y, sorted(g, key=lambda f: f.x)) for y, g in normalized_rows]
-        return normalized_rows
+    def _group_by_y(self, row_frags) -> List[Tuple[float, List[TextFragment]]]:
+        """Group fragments (a list or a :class:`FragmentArrays`) into rows of x-sorted fragments."""
+        store = row_frags if isinstance(row_frags, FragmentArrays) else FragmentArrays(row_frags)
+        return [
+            (y, store.take(indices))
+            for y, indices in store.group_rows(self.y_bucket_precision, self.y_tolerance)
+        ]
 
     def _assign_to_columns(
             self,
@@ -167,28 +219,26 @@ class PdfRowParser:
             boundaries: Dict[str, Tuple[float, float]],
             header_map: Optional[Dict[str, TextFragment]] = None,
     ) -> Dict[str, List[TextFragment]]:
-        cells: Dict[str, List[TextFragment]] = {k: [] for k in boundaries.keys()}
-
-        header_map = header_map or {}
-        centers: Dict[str, float] = {}
-        for key, (xmin, xmax) in boundaries.items():
-            header_fragment = header_map.get(key)
-            if header_fragment:
-                centers[key] = header_fragment.x
-                continue
+        model = ColumnModel(boundaries, header_map)
+        columns = model.nearest([f.x for f in row_frags]).tolist() if row_frags else []
+        cells = self._fill_cells(row_frags, columns, model)
+        # Callers may pass fragments in any order; parse() never needs this.
+        for key in cells:
+            cells[key].sort(key=lambda f: f.x)
+        return cells
 
-            if xmin == float("-inf") and xmax == float("inf"):
-                centers[key] = 0.0
-            elif xmin == float("-inf"):
-                centers[key] = xmax - 50.0
-            elif xmax == float("inf"):
-                centers[key] = xmin + 50.0
-            else:
-                centers[key] = (xmin + xmax) / 2.0
+    def _fill_cells(
+            self,
+            row_frags: List[TextFragment],
+            columns: List[int],
+            model: ColumnModel,
+    ) -> Dict[str, List[TextFragment]]:
+        """Place fragments into cells given their nearest-column indices; cells keep input order."""
+        keys = model.keys
+        cells: Dict[str, List[TextFragment]] = {k: [] for k in keys}
 
-        for f in row_frags:
-            # pick nearest column center
-            key = min(boundaries.keys(), key=lambda k: abs(f.x - centers[k]))
+        for f, column in zip(row_frags, columns):
+            key = keys[column]
 
             # ✅ Smarter fallback:
             if key == "satuan":
@@ -202,8 +252,6 @@ class PdfRowParser:
 
             cells[key].append(f)
 
-        for key in cells:
-            cells[key].sort(key=lambda f: f.x)
         return cells
 
     def _merge_cell_text(self, frags: List[TextFragment]) -> str:
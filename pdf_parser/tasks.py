@@ -4,63 +4,90 @@ Celery tasks for PDF parsing.
 from celery import shared_task
 from decimal import Decimal
 import os
+import time
 
-from .services.pipeline import parse_pdf_to_dtos
-from cost_weight.models import TestJob, TestItem
+from .services.pipeline import iter_pdf_rows
+from excel_parser.services.parse_cache import cached_parse
+from excel_parser.services.task_results import DEFAULT_PAGE_SIZE, progress_meta, save_page, save_pages
+from cost_weight.services.job_builder import build_job_from_rows
 
 
 @shared_task(bind=True, time_limit=900, soft_time_limit=870)
 def process_pdf_file_task(self, file_path, filename):
     """
     Process a PDF file asynchronously.
+
+    Rows are streamed page by page and stored as TaskResultPage rows as soon
+    as each page fills up, so ``task_status?page=N`` can serve the first rows
+    while later PDF pages are still being parsed.
     
     Args:
         file_path: Temporary file path to the uploaded PDF file
         filename: Original filename
     
     Returns:
-        dict: Contains 'rows', 'job_id', 'filename'
+        dict: Contains 'job_id', 'filename', 'rows_total' and 'pages_total';
+        the rows themselves are stored as TaskResultPage rows.
     """
+    started_at = time.time()
+    pages_total = None
+
+    def stream(path):
+        nonlocal pages_total
+        rows, pages_total = _stream_rows_to_pages(self, path, started_at)
+        return rows
+
     try:
         # Update task state
-        self.update_state(state='PROCESSING', meta={'status': 'Parsing PDF file...'})
+        self.update_state(state='PROCESSING', meta=progress_meta('Parsing PDF file...', None, None, started_at))
         
         # Parse the PDF
-        rows = parse_pdf_to_dtos(file_path)
-        
-        # Update task state
-        self.update_state(state='PROCESSING', meta={'status': 'Creating test job...'})
-        
-        # Create TestJob from rows
-        job = _create_test_job_from_rows(rows, filename)
-        
-        # Convert Decimals to floats for JSON serialization
-        rows = _convert_decimals(rows)
-        
+        rows = cached_parse("pdf", file_path, stream)
+    finally:
         # Cleanup temp file
         if os.path.exists(file_path):
             try:
                 os.unlink(file_path)
             except OSError:
                 pass
-        
-        return {
-            'rows': rows,
-            'job_id': job.id,
-            'filename': filename,
-            'status': 'completed'
-        }
-        
-    except Exception as e:
-        # Cleanup temp file on error
-        if os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-            except OSError:
-                pass
-        
-        # Re-raise the exception so Celery can handle it
-        raise
+
+    if pages_total is None:
+        # Served from the parse cache; nothing has been stored yet.
+        rows = _convert_decimals(rows)
+        self.update_state(state='PROCESSING', meta={'status': 'Storing rows...'})
+        pages_total = save_pages(self.request.id, rows)
+
+    # Update task state
+    self.update_state(state='PROCESSING', meta={'status': 'Creating test job...'})
+
+    # Create TestJob from rows
+    job = build_job_from_rows(rows, filename)
+
+    return {
+        'job_id': job.id,
+        'filename': filename,
+        'rows_total': len(rows),
+        'pages_total': pages_total,
+        'status': 'completed'
+    }
+
+
+def _stream_rows_to_pages(task, file_path, started_at):
+    """Parse ``file_path`` with the streaming pipeline, saving each full result page as it fills."""
+    rows, chunk = [], []
+    page = 0
+    for row in iter_pdf_rows(file_path):
+        row = _convert_decimals(row)
+        rows.append(row)
+        chunk.append(row)
+        if len(chunk) == DEFAULT_PAGE_SIZE:
+            save_page(task.request.id, page, chunk)
+            page, chunk = page + 1, []
+            task.update_state(state='PROCESSING', meta=progress_meta('Parsing PDF file...', None, None, started_at))
+    if chunk:
+        save_page(task.request.id, page, chunk)
+        page += 1
+    return rows, page
 
 
 def _convert_decimals(obj):
@@ -72,50 +99,3 @@ def _convert_decimals(obj):
     if isinstance(obj, dict):
         return {k: _convert_decimals(v) for k, v in obj.items()}
     return obj
-
-
-def _create_test_job_from_rows(rows, filename="Uploaded PDF"):
-    """
-    Create TestJob and TestItems from parsed PDF rows.
-    Returns the created TestJob instance.
-    """
-    # Create job
-    job = TestJob.objects.create(name=f"RAB - {filename}")
-    
-    # Create items from rows (skip section headers)
-    for row in rows:
-        # Skip section/category rows
-        if row.get("is_section") or row.get("job_match_status") == "skipped":
-            continue
-            
-        description = row.get("description", "Unknown Item")
-        if not description or description.strip() == "":
-            continue
-            
-        # Parse quantity and price
-        try:
-            quantity = Decimal(str(row.get("volume", 0)))
-            if quantity <= 0:
-                quantity = Decimal("1")
-        except (ValueError, TypeError, KeyError):
-            quantity = Decimal("1")
-            
-        try:
-            unit_price = Decimal(str(row.get("price", 0)))
-            if unit_price < 0:
-                unit_price = Decimal("0")
-        except (ValueError, TypeError, KeyError):
-            unit_price = Decimal("0")
-        
-        # Create item
-        TestItem.objects.create(
-            job=job,
-            name=description,
-            quantity=quantity,
-            unit_price=unit_price
-        )
-    
-    # Calculate totals and weights
-    job.calculate_totals()
-    
-    return job
@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from pdf_parser.services.fragment_store import FragmentArrays
+from pdf_parser.services.header_mapper import TextFragment as HeaderTextFragment
+from pdf_parser.services.pdfreader import TextFragment
+
+
+def _frag(x, y, text="t"):
+    return TextFragment(page=1, x=x, y=y, text=text)
+
+
+class TextFragmentTests(TestCase):
+    def test_fragments_are_slotted_and_shared(self):
+        self.assertIs(HeaderTextFragment, TextFragment)
+        self.assertFalse(hasattr(_frag(1, 2), "__dict__"))
+
+
+class FragmentArraysTests(TestCase):
+    def test_below_keeps_order_and_coordinates(self):
+        store = FragmentArrays([_frag(5, 100, "h"), _frag(3, 120, "a"), _frag(1, 110, "b")])
+        body = store.below(105)
+        self.assertEqual([f.text for f in body.fragments], ["a", "b"])
+        self.assertEqual(body.x.tolist(), [3, 1])
+        self.assertEqual(body.y.tolist(), [120, 110])
+
+    def test_group_rows_splits_on_bucket_and_tolerance(self):
+        store = FragmentArrays([
+            _frag(50, 200.0, "far"),
+            _frag(30, 150.2, "b"),
+            _frag(10, 150.6, "a"),
+            _frag(20, 152.0, "next"),
+        ])
+        rows = store.group_rows(precision=0, tolerance=0.8)
+
+        self.assertEqual(
+            [[f.text for f in store.take(idx)] for _, idx in rows],
+            [["b"], ["a"], ["next"], ["far"]],
+        )
+        self.assertEqual([y for y, _ in rows], [150.2, 150.6, 152.0, 200.0])
+
+    def test_group_rows_orders_cells_by_x(self):
+        store = FragmentArrays([_frag(300, 10.0, "c"), _frag(100, 10.3, "a"), _frag(200, 10.1, "b")])
+        (y, idx), = store.group_rows(precision=0, tolerance=0.8)
+        self.assertEqual([f.text for f in store.take(idx)], ["a", "b", "c"])
+        self.assertAlmostEqual(y, 10.1333, places=3)
+
+    def test_empty_store_has_no_rows(self):
+        self.assertEqual(FragmentArrays([]).group_rows(precision=1, tolerance=0.8), [])
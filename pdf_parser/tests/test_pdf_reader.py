@@ -1,7 +1,9 @@
 import os
 import pathlib
-from django.test import TestCase
-from pdf_parser.services.pdfreader import PdfReader, TextFragment
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from pdf_parser.services.pdfreader import ParallelPdfReader, PdfReader, TextFragment, split_page_range
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent
 SAMPLE_PDF = BASE_DIR / "data" / "PDFsample.pdf"
@@ -68,3 +70,41 @@ class PdfReaderTests(TestCase):
         finally:
             if os.path.exists(tmp_path):
                 os.remove(tmp_path)
+
+
+RAB_SAMPLE_PDF = BASE_DIR / "data" / "RABSample2.pdf"
+
+
+class SplitPageRangeTests(TestCase):
+    def test_ranges_are_contiguous_and_cover_every_page(self):
+        ranges = split_page_range(38, 4)
+        self.assertEqual(ranges, [(1, 10), (11, 20), (21, 29), (30, 38)])
+
+    def test_never_more_ranges_than_pages(self):
+        self.assertEqual(split_page_range(2, 8), [(1, 1), (2, 2)])
+
+
+class ParallelPdfReaderTests(TestCase):
+    def test_matches_serial_reader_in_page_order(self):
+        serial = PdfReader().extract(str(RAB_SAMPLE_PDF))
+        parallel = ParallelPdfReader(workers=2, min_pages_per_worker=1).extract(str(RAB_SAMPLE_PDF))
+
+        self.assertEqual(parallel, serial)
+        pages = [f.page for f in parallel]
+        self.assertEqual(pages, sorted(pages))
+
+    def test_small_documents_are_read_inline(self):
+        reader = ParallelPdfReader(workers=4)
+        with patch("pdf_parser.services.pdfreader.ProcessPoolExecutor") as pool:
+            fragments = reader.extract(str(SAMPLE_PDF))
+
+        pool.assert_not_called()
+        self.assertEqual(fragments, PdfReader().extract(str(SAMPLE_PDF)))
+
+    @override_settings(PDF_EXTRACT_WORKERS=3)
+    def test_worker_count_defaults_to_setting(self):
+        self.assertEqual(ParallelPdfReader()._worker_count(), 3)
+
+    def test_nonexistent_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            ParallelPdfReader(workers=2).extract("nonexistent.pdf")
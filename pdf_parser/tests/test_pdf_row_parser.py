@@ -1,5 +1,5 @@
 from django.test import TestCase
-from pdf_parser.services.row_parser import PdfRowParser, ParsedRow
+from pdf_parser.services.row_parser import ColumnModel, PdfRowParser, ParsedRow
 from pdf_parser.services.header_mapper import TextFragment
 
 
@@ -172,7 +172,61 @@ class PdfRowParserUnitTests(TestCase):
         self.assertIn((1, "1"), numbers)
         self.assertIn((2, "2"), numbers)
 
+    def test_iter_rows_yields_before_later_pages_are_read(self):
+        def pages():
+            yield 1, self._headers_at(page=1, y=90) + self._row(page=1, y=110, no="1", uraian="P1")
+            raise AssertionError("page 2 read before page 1 rows were consumed")
+
+        first = next(self.parser.iter_rows(pages()))
+        self.assertEqual(first.values["uraian"], "P1")
+
+    def test_iter_rows_carries_boundaries_across_pages(self):
+        pages = [
+            (1, self._headers_at(page=1, y=90) + self._row(page=1, y=110, no="1", uraian="P1")),
+            (2, self._row(page=2, y=35, no="2", uraian="P2", volume="2", satuan="kg")),
+        ]
+        rows = list(self.parser.iter_rows(iter(pages)))
+        self.assertEqual([(r.page, r.values["uraian"]) for r in rows], [(1, "P1"), (2, "P2")])
+        self.assertIn("uraian", self.parser.last_boundaries)
+
     def test_parse_empty_or_no_headers(self):
         rows, bounds = self.parser.parse([])
         self.assertEqual(rows, [])
         self.assertEqual(bounds, {})
+
+
+class ColumnModelTests(TestCase):
+    def setUp(self):
+        self.boundaries = {
+            "no": (float("-inf"), 65.0),
+            "uraian": (65.0, 190.0),
+            "volume": (190.0, 310.0),
+            "satuan": (310.0, float("inf")),
+        }
+
+    def test_nearest_assigns_whole_page_in_one_pass(self):
+        model = ColumnModel(self.boundaries)
+        columns = model.nearest([0, 120, 255, 500, 127.5])
+        self.assertEqual([model.keys[c] for c in columns], ["no", "uraian", "volume", "satuan", "uraian"])
+
+    def test_header_positions_override_boundary_centers(self):
+        headers = {"volume": TextFragment(page=1, x=300, y=100, text="Volume")}
+        model = ColumnModel(self.boundaries, headers)
+        self.assertEqual(model.keys[model.nearest([290])[0]], "volume")
+
+    def test_ties_go_to_the_first_listed_column(self):
+        boundaries = {"satuan": (100.0, 200.0), "uraian": (0.0, 100.0)}
+        model = ColumnModel(boundaries)
+        self.assertEqual(model.keys[model.nearest([100])[0]], "satuan")
+
+        duplicate = ColumnModel({"uraian": (0.0, 100.0), "satuan": (0.0, 100.0)})
+        self.assertEqual(duplicate.keys[duplicate.nearest([10])[0]], "uraian")
+
+    def test_assign_to_columns_sorts_unsorted_input(self):
+        parser = PdfRowParser()
+        row = [
+            TextFragment(page=1, x=150, y=130, text="lanjutan"),
+            TextFragment(page=1, x=100, y=130, text="Pekerjaan"),
+        ]
+        cells = parser._assign_to_columns(row, self.boundaries)
+        self.assertEqual([f.text for f in cells["uraian"]], ["Pekerjaan", "lanjutan"])
@@ -1,6 +1,9 @@
 from decimal import Decimal
+from unittest.mock import patch
+
 from django.test import TestCase
-from pdf_parser.services.pipeline import merge_broken_rows
+from pdf_parser.services.header_mapper import TextFragment
+from pdf_parser.services.pipeline import iter_merged_rows, iter_pdf_rows, merge_broken_rows
 
 
 class PipelineHelperTests(TestCase):
@@ -77,3 +80,51 @@ class PipelineHelperTests(TestCase):
             merged[0]["description"],
             "Lantai 1, dipasang secara lengkap sesuai di uraikan dalam gambar dan spesifikasi teknis.",
         )
+
+
+def _page(page, rows):
+    xs = [10, 120, 260, 360]
+    frags = [
+        TextFragment(page=page, x=x, y=90, text=t)
+        for x, t in zip(xs, ["No", "Uraian Pekerjaan", "Volume", "Satuan"])
+    ]
+    for i, (no, desc) in enumerate(rows):
+        y = 110 + 20 * i
+        frags += [
+            TextFragment(page=page, x=xs[0], y=y, text=no),
+            TextFragment(page=page, x=xs[1], y=y, text=desc),
+            TextFragment(page=page, x=xs[2], y=y, text="2"),
+            TextFragment(page=page, x=xs[3], y=y, text="m2"),
+        ]
+    return page, frags
+
+
+@patch("pdf_parser.services.pipeline.match_description", return_value={"status": "found", "match": {"code": "X"}})
+class StreamingPipelineTests(TestCase):
+    def test_iter_merged_rows_holds_back_only_one_row(self, _):
+        def rows():
+            yield {"number": "1", "description": "Galian", "unit": "m3", "volume": 1}
+            yield {"number": "", "description": "tanah", "unit": "", "volume": 0}
+            yield {"number": "2", "description": "Urugan", "unit": "m3", "volume": 1}
+            raise AssertionError("read past the row that completes the first one")
+
+        first = next(iter_merged_rows(rows()))
+        self.assertEqual(first["description"], "Galian tanah")
+
+    def test_iter_pdf_rows_streams_enriched_rows_across_pages(self, mock_match):
+        pages = [_page(1, [("1", "Pekerjaan A"), ("2", "www.example.com")]), _page(2, [("3", "Pekerjaan B")])]
+
+        rows = list(iter_pdf_rows("unused.pdf", pages=iter(pages)))
+
+        self.assertEqual([r["description"] for r in rows], ["Pekerjaan A", "Pekerjaan B"])
+        self.assertEqual([r["row_key"] for r in rows], ["pdf-1-0", "pdf-3-1"])
+        self.assertEqual(rows[0]["job_match_status"], "found")
+        self.assertEqual(mock_match.call_count, 2)
+
+    def test_first_row_is_yielded_before_later_pages_are_read(self, _):
+        def pages():
+            yield _page(1, [("1", "Pekerjaan A"), ("2", "Pekerjaan B")])
+            raise AssertionError("page 2 read too early")
+
+        first = next(iter_pdf_rows("unused.pdf", pages=pages()))
+        self.assertEqual(first["description"], "Pekerjaan A")
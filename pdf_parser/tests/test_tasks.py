@@ -0,0 +1,56 @@
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from excel_parser.models import TaskResultPage
+from excel_parser.services.task_results import load_rows
+from pdf_parser import tasks
+
+
+def _rows(n):
+    return [{"description": f"Pekerjaan {i}", "volume": 1.0} for i in range(n)]
+
+
+@patch("pdf_parser.tasks.build_job_from_rows", return_value=SimpleNamespace(id=7))
+@patch("pdf_parser.tasks.DEFAULT_PAGE_SIZE", 2)
+@patch("celery.app.task.Task.update_state")
+class ProcessPdfFileTaskTests(TestCase):
+    def _pdf_path(self):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(b"%PDF-1.4")
+        return tmp.name
+
+    def test_pages_are_stored_while_rows_stream(self, mock_state, mock_build):
+        stored_mid_stream = []
+
+        def stream(path):
+            for i, row in enumerate(_rows(5)):
+                if i == 4:
+                    stored_mid_stream.extend(TaskResultPage.objects.values_list("page", flat=True))
+                yield row
+
+        path = self._pdf_path()
+        with patch("pdf_parser.tasks.iter_pdf_rows", side_effect=stream):
+            result = tasks.process_pdf_file_task.apply(args=(path, "rab.pdf")).get()
+
+        self.assertEqual(stored_mid_stream, [0, 1])
+        self.assertEqual((result["rows_total"], result["pages_total"], result["job_id"]), (5, 3, 7))
+        task_id = TaskResultPage.objects.values_list("task_id", flat=True).first()
+        self.assertEqual([r["description"] for r in load_rows(task_id)], [f"Pekerjaan {i}" for i in range(5)])
+        self.assertEqual(len(mock_build.call_args.args[0]), 5)
+        self.assertFalse(os.path.exists(path))
+
+        streaming_meta = [c.kwargs["meta"] for c in mock_state.call_args_list if "rows_total" in c.kwargs["meta"]]
+        self.assertTrue(streaming_meta)
+        self.assertTrue(all(m["rows_total"] is None for m in streaming_meta))
+
+    def test_cached_rows_are_stored_after_parsing(self, mock_state, mock_build):
+        path = self._pdf_path()
+        with patch("pdf_parser.tasks.cached_parse", return_value=_rows(3)):
+            result = tasks.process_pdf_file_task.apply(args=(path, "rab.pdf")).get()
+
+        self.assertEqual((result["rows_total"], result["pages_total"]), (3, 1))
+        self.assertEqual(TaskResultPage.objects.get().row_count, 3)
@@ -5,7 +5,7 @@ import tempfile
 import os
 from decimal import Decimal
 from .services.pipeline import parse_pdf_to_dtos
-from cost_weight.models import TestJob, TestItem
+from cost_weight.services.job_builder import build_job_from_rows
 import cProfile, pstats, io
 
 from rest_framework.decorators import api_view, parser_classes
@@ -13,6 +13,8 @@ from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from celery.result import AsyncResult
 from .tasks import process_pdf_file_task
+from excel_parser.services.parse_cache import cached_parse
+from excel_parser.services.task_results import task_status_payload
 
 # Template constants
 RAB_CONVERTED_TEMPLATE = "rab_converted.html"
@@ -42,17 +44,17 @@ class PdfUploadHandler:
             if enable_profiling:
                 profiler = cProfile.Profile()
                 profiler.enable()
-                rows = parser_fn(tmp_path)
+                rows = cached_parse("pdf", tmp_path, parser_fn)
                 profiler.disable()
 
                 s = io.StringIO()
                 pstats.Stats(profiler, stream=s).sort_stats(pstats.SortKey.TIME).print_stats(15)
                 print(s.getvalue())
             else:
-                rows = parser_fn(tmp_path)
+                rows = cached_parse("pdf", tmp_path, parser_fn)
 
             # Create TestJob from parsed rows
-            job = _create_test_job_from_rows(rows, file.name)
+            job = build_job_from_rows(rows, file.name)
 
             rows = _convert_decimals(rows)
             return JsonResponse({"rows": rows, "job_id": job.id}, status=200)
@@ -96,57 +98,6 @@ def _convert_decimals(obj):
     return obj
 
 
-def _create_test_job_from_rows(rows, filename="Uploaded PDF"):
-    """
-    Create TestJob and TestItems from parsed PDF rows
-    Returns the created TestJob instance
-    """
-    # Create job
-    job = TestJob.objects.create(name=f"RAB - {filename}")
-
-    # Create items from rows (skip section headers)
-    for row in rows:
-        # Skip section/category rows
-        if row.get("is_section") or row.get("job_match_status") == "skipped":
-            continue
-
-        description = row.get("description", "Unknown Item")
-        if not description or description.strip() == "":
-            continue
-
-        # Parse quantity and price
-        try:
-            quantity = Decimal(str(row.get("volume", 0)))
-            if quantity <= 0:
-                quantity = Decimal("1")
-        except (ValueError, TypeError, KeyError):
-            quantity = Decimal("1")
-
-        try:
-            unit_price = Decimal(str(row.get("price", 0)))
-            if unit_price < 0:
-                unit_price = Decimal("0")
-        except (ValueError, TypeError, KeyError):
-            unit_price = Decimal("0")
-
-        # Get AHSP code from analysis_code column
-        ahsp_code = row.get("analysis_code", "").strip() if row.get("analysis_code") else None
-
-        # Create item with ahsp_code
-        TestItem.objects.create(
-            job=job,
-            name=description,
-            quantity=quantity,
-            unit_price=unit_price,
-            ahsp_code=ahsp_code if ahsp_code else None
-        )
-
-    # Calculate totals and weights
-    job.calculate_totals()
-
-    return job
-
-
 @csrf_exempt  # CSRF exempt: API endpoint for file upload from authenticated frontend
 def rab_converted_pdf(request):
     if request.method == "GET":
@@ -229,41 +180,19 @@ def parse_pdf_async(request):
 @api_view(['GET'])
 def task_status(request, task_id):
     """
-    GET /pdf_parser/task_status/<task_id>
-    Check the status of an async task.
+    GET /pdf_parser/task_status/<task_id>[?page=N]
+    Check the status of an async task: progress while it runs, and its rows
+    (all of them, or only page N) once stored.
     """
+    page = request.GET.get("page")
+    if page is not None:
+        if not page.isdigit():
+            return Response({"error": "page must be a non-negative integer"}, status=400)
+        page = int(page)
+
     try:
         task = AsyncResult(task_id)
-
-        if task.state == 'PENDING':
-            response = {
-                'state': task.state,
-                'status': 'Task is waiting to be processed...'
-            }
-        elif task.state == 'PROCESSING':
-            response = {
-                'state': task.state,
-                'status': task.info.get('status', 'Processing...'),
-            }
-        elif task.state == 'SUCCESS':
-            response = {
-                'state': task.state,
-                'result': task.result,
-                'status': 'completed'
-            }
-        elif task.state == 'FAILURE':
-            response = {
-                'state': task.state,
-                'status': str(task.info),
-                'error': str(task.info)
-            }
-        else:
-            response = {
-                'state': task.state,
-                'status': str(task.info)
-            }
-
-        return Response(response)
+        return Response(task_status_payload(task, page))
 
     except Exception as e:
-        return Response({"error": str(e)}, status=500)
\ No newline at end of file
+        return Response({"error": str(e)}, status=500)
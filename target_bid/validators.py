@@ -9,10 +9,11 @@ from typing import Any, Dict, Iterable, Optional
 
 from django.core.exceptions import ValidationError
 
+from automatic_price_matching.numeric import normalise_separators
 
-# Thousand/decimal separator patterns reused from other validators in the project.
-_THOUSAND_DOT_DECIMAL_COMMA = re.compile(r"^\d{1,3}(\.\d{3})+,\d+$")
-_THOUSAND_COMMA_DECIMAL_DOT = re.compile(r"^\d{1,3}(,\d{3})+\.\d+$")
+
+_CURRENCY_PREFIX = re.compile(r"(?i)rp|idr")
+_NON_NUMERIC = re.compile(r"[^0-9.,+-]")
 
 _ERR_NUMERIC_REQUIRED = "Target budget must be a numeric value."
 
@@ -51,18 +52,7 @@ class NumericNormaliser:
 
     @staticmethod
     def normalise(candidate: str) -> str:
-        if _THOUSAND_DOT_DECIMAL_COMMA.match(candidate):
-            return candidate.replace(".", "").replace(",", ".")
-        if _THOUSAND_COMMA_DECIMAL_DOT.match(candidate):
-            return candidate.replace(",", "")
-
-        if "," in candidate and "." not in candidate:
-            return candidate.replace(",", ".")
-        if "," in candidate and "." in candidate:
-            if candidate.rfind(",") > candidate.rfind("."):
-                return candidate.replace(".", "").replace(",", ".")
-            return candidate.replace(",", "")
-        return candidate
+        return normalise_separators(candidate)
 
 
 class NumericParser:
@@ -92,10 +82,10 @@ class NumericParser:
                 )
                 return None
 
-            text = re.sub(r"(?i)rp|idr", "", text)
+            text = _CURRENCY_PREFIX.sub("", text)
             text = text.replace(" ", "").replace("_", "")
 
-            cleaned = re.sub(r"[^0-9.,+-]", "", text)
+            cleaned = _NON_NUMERIC.sub("", text)
             if not any(ch.isdigit() for ch in cleaned):
                 self._errors.add(self._field, _ERR_NUMERIC_REQUIRED)
                 return None